@@ -0,0 +1,36 @@
+"""Packet encoder benchmark executable"""
+
+import argparse
+import json
+import sys
+
+from PiCN.ProgramLibs.EncoderBenchmark import EncoderBenchmark
+
+
+def main(args):
+    benchmark = EncoderBenchmark(encoders=args.encoders, depths=args.depths, payload_sizes=args.payloads,
+                                 min_time=args.min_time, queue_packets=args.queue_packets)
+    results = benchmark.run()
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='PiCN Packet Encoder Benchmark')
+    parser.add_argument('-e', '--encoders', nargs='+', choices=['ndntlv', 'simple', 'compact', 'extended'],
+                        default=['ndntlv', 'simple', 'compact', 'extended'], help='Encoders to measure (default: all)')
+    parser.add_argument('-d', '--depths', nargs='+', type=int, default=[2, 5, 10, 20],
+                        help='Name depths in components (default: 2 5 10 20)')
+    parser.add_argument('-s', '--payloads', nargs='+', type=int, default=[0, 64, 1024, 8192, 65536],
+                        help='Payload sizes of data packets in bytes (default: 0 64 1024 8192 65536)')
+    parser.add_argument('-t', '--min-time', type=float, default=0.2,
+                        help='Minimum duration of a throughput measurement in seconds (default: 0.2)')
+    parser.add_argument('-q', '--queue-packets', type=int, default=200,
+                        help='Packets per case sent through the layer process, 0 to skip (default: 200)')
+    parser.add_argument('-o', '--output', type=str, default=None, help='JSON output file (default: stdout)')
+    args = parser.parse_args()
+    main(args)
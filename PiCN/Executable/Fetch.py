@@ -5,9 +5,10 @@ Fetch Content with resolved chunking
 import argparse
 
 from PiCN.Packets import Name
-from PiCN.ProgramLibs.Fetch import Fetch
+from PiCN.ProgramLibs.Fetch import Fetch, FetchNackError
 from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder
 from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder
+from PiCN.Layers.PacketEncodingLayer.Encoder import CompactEncoder
 from PiCN.Layers.NFNLayer.Parser import DefaultNFNParser
 from PiCN.Layers.NFNLayer.NFNOptimizer import BaseNFNOptimizer
 
@@ -23,14 +24,26 @@ def main(args):
         else:
             name = Name(args.name)
             name = unescape_name(name)
-    name.format = args.format
     log_level = 255
 
-    encoder = NdnTlvEncoder() if args.format == 'ndntlv' else SimpleStringEncoder()
+    if args.format == 'ndntlv':
+        encoder = NdnTlvEncoder()
+    elif args.format == 'compact':
+        encoder = CompactEncoder()
+    else:
+        encoder = SimpleStringEncoder()
     fetchTool = Fetch(ip=args.ip, port=args.port, log_level=log_level, encoder=encoder, autoconfig=args.autoconfig)
 
-    content = fetchTool.fetch_data(name, timeout=10)
-    print(content)
+    if args.output is not None:
+        try:
+            with open(args.output, 'wb') as output_file:
+                for part in fetchTool.fetch_stream(name, timeout=10):
+                    output_file.write(part)
+        except FetchNackError as e:
+            print(e)
+    else:
+        content = fetchTool.fetch_data(name, timeout=10)
+        print(content)
 
     fetchTool.stop_fetch()
 
@@ -85,9 +98,11 @@ def parse_nfn_str(name: str) -> Name:
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='ICN Fetch Tool')
-    parser.add_argument('--format', choices=['ndntlv', 'simple'], type=str,
+    parser.add_argument('--format', choices=['ndntlv', 'simple', 'compact'], type=str,
                         default='ndntlv', help='default is: "ndntlv"')
     parser.add_argument('-a', '--autoconfig', action='store_true')
+    parser.add_argument('-o', '--output', type=str, default=None,
+                        help="stream the content to this file instead of printing it")
     parser.add_argument('ip', type=str,
                         help="IP addr of forwarder")
     parser.add_argument('port', type=int,
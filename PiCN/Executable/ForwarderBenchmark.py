@@ -0,0 +1,42 @@
+"""Forwarder throughput benchmark executable"""
+
+import argparse
+import json
+import sys
+
+from PiCN.ProgramLibs.ForwarderBenchmark import ForwarderBenchmark
+
+
+def main(args):
+    benchmark = ForwarderBenchmark(shards=args.shards, modes=args.modes, names=args.names, window=args.window,
+                                   min_time=args.min_time, payload_size=args.payload, batch_size=args.batch_size,
+                                   indexed_tables=args.indexed_tables)
+    results = benchmark.run()
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='PiCN Forwarder Throughput Benchmark')
+    parser.add_argument('-s', '--shards', nargs='+', type=int, default=[1, 2, 4],
+                        help='Numbers of ICN layer shards (default: 1 2 4)')
+    parser.add_argument('-m', '--modes', nargs='+', choices=['cs', 'forward'], default=['cs', 'forward'],
+                        help='Content store hits and/or forwarding to a producer (default: both)')
+    parser.add_argument('-n', '--names', type=int, default=1000,
+                        help='Number of names in the content store in cs mode (default: 1000)')
+    parser.add_argument('-w', '--window', type=int, default=64, help='Outstanding interests (default: 64)')
+    parser.add_argument('-t', '--min-time', type=float, default=5.0,
+                        help='Duration of a throughput measurement in seconds (default: 5.0)')
+    parser.add_argument('-p', '--payload', type=int, default=64,
+                        help='Payload size of data packets in bytes (default: 64)')
+    parser.add_argument('-b', '--batch-size', type=int, default=1,
+                        help='Queue items handled at once by the layers (default: 1)')
+    parser.add_argument('-i', '--indexed-tables', action='store_true',
+                        help='Use the bounded CS, the trie FIB and the hashed PIT')
+    parser.add_argument('-o', '--output', type=str, default=None, help='JSON output file (default: stdout)')
+    args = parser.parse_args()
+    main(args)
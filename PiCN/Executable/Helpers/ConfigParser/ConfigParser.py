@@ -40,8 +40,8 @@ class ConfigParser(object):
                 raise MalformedConfigurationError("Logging must one of the strings 'error', 'warning', 'info', 'debug' or unspecified")
 
         if "format" in self.__conf:
-            if not isinstance(self.__conf["format"], str) or self.__conf["format"] not in ["ndntlv", "simple"]:
-                raise MalformedConfigurationError("Format must one of the strings 'ndntlv', 'simple' or unspecified")
+            if not isinstance(self.__conf["format"], str) or self.__conf["format"] not in ["ndntlv", "simple", "compact"]:
+                raise MalformedConfigurationError("Format must one of the strings 'ndntlv', 'simple', 'compact' or unspecified")
 
         if "udp_port" in self.__conf:
             if not isinstance(self.__conf["udp_port"], int) or not (0 < self.__conf["udp_port"] <= 65535):
@@ -123,7 +123,7 @@ class ConfigParser(object):
     @property
     def format(self) -> str:
         """ Get packet format
-        :return: Packet format as string ('ndntlv', 'simple') or None (if unspecified)
+        :return: Packet format as string ('ndntlv', 'simple', 'compact') or None (if unspecified)
         """
         return self.__format
 
@@ -7,6 +7,7 @@ from PiCN.ProgramLibs.ICNDataRepository import ICNDataRepository
 from PiCN.Packets import Name
 from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder
 from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder
+from PiCN.Layers.PacketEncodingLayer.Encoder import CompactEncoder
 
 
 def main(args):
@@ -17,6 +18,8 @@ def main(args):
 
     if args.format == "ndntlv":
         encoder = NdnTlvEncoder()
+    elif args.format == "compact":
+        encoder = CompactEncoder(log_level=log_level)
     else:
         encoder = SimpleStringEncoder(log_level=log_level)
     repo = ICNDataRepository(args.datapath, prefix,
@@ -29,7 +32,7 @@ def main(args):
 if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description='ICN Data Repository')
-    parser.add_argument('--format', default='ndntlv', type=str)
+    parser.add_argument('--format', choices=['ndntlv', 'simple', 'compact'], default='ndntlv', type=str)
     parser.add_argument('-a', '--autoconfig', action='store_true')
     parser.add_argument('datapath', type=str,
                         help='filesystem path where the repo stores its data')
@@ -7,12 +7,14 @@ import PiCN.ProgramLibs.ICNForwarder
 from PiCN.Executable.Helpers.ConfigParser import ConfigParser
 from PiCN.Executable.Helpers.ConfigParser.ConfigParser import CouldNotOpenConfigError, CouldNotParseError, MalformedConfigurationError
 from PiCN.Logger import Logger
-from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder, NdnTlvEncoder
+from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder, NdnTlvEncoder, CompactEncoder
 
 # default arguments
 default_port = 9000
 default_format = "ndntlv"
 default_logging = "info"
+default_shards = 1
+default_mtu = 0
 
 def main(args):
     logger = Logger("ICNForwarder", logging.DEBUG) # note: set later according to cli/config arguments
@@ -68,12 +70,23 @@ def main(args):
     logger.info("UDP Port:       " + str(args.port))
     logger.info("Log Level:      " + args.logging)
     logger.info("Packet Format:  " + args.format)
+    logger.info("ICN Shards:     " + str(args.shards))
+    logger.info("Link MTU:       " + (str(args.mtu) if args.mtu > 0 else "no fragmentation"))
+    logger.info("Tables:         " + ("indexed" if args.indexed_tables else "default"))
 
     # Packet encoder
-    encoder = NdnTlvEncoder(log_level) if args.format == 'ndntlv' else SimpleStringEncoder(log_level)
+    if args.format == 'ndntlv':
+        encoder = NdnTlvEncoder(log_level)
+    elif args.format == 'compact':
+        encoder = CompactEncoder(log_level)
+    else:
+        encoder = SimpleStringEncoder(log_level)
 
     # Start
-    forwarder = PiCN.ProgramLibs.ICNForwarder.ICNForwarder(args.port, log_level, encoder, autoconfig=args.autoconfig)
+    forwarder = PiCN.ProgramLibs.ICNForwarder.ICNForwarder(args.port, log_level, encoder, autoconfig=args.autoconfig,
+                                                         shards=args.shards, link_mtu=args.mtu,
+                                                         indexed_tables=args.indexed_tables,
+                                                         rcvbuf_size=args.rcvbuf, sndbuf_size=args.sndbuf)
     forwarder.start_forwarder()
     forwarder.linklayer.process.join()
 
@@ -81,9 +94,14 @@ def main(args):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='PiCN Forwarder')
     parser.add_argument('-p', '--port', type=int, default=None, help=f'UDP port (default: {default_port})')
-    parser.add_argument('-f', '--format', choices=['ndntlv', 'simple'], type=str, default=None, help=f'Packet Format (default: {default_format})')
+    parser.add_argument('-f', '--format', choices=['ndntlv', 'simple', 'compact'], type=str, default=None, help=f'Packet Format (default: {default_format})')
     parser.add_argument('-c', '--config', type=str, default="none", help="Path to configuration file")
     parser.add_argument('-a', '--autoconfig', action='store_true', help='Enable autoconfig server')
+    parser.add_argument('-s', '--shards', type=int, default=default_shards, help=f'Number of ICN worker processes, CS and PIT are partitioned by name (default: {default_shards})')
+    parser.add_argument('-m', '--mtu', type=int, default=default_mtu, help=f'Link MTU, larger packets are fragmented (NDNLPv2), 0 to disable (default: {default_mtu})')
+    parser.add_argument('-i', '--indexed-tables', action='store_true', help='Use the bounded CS, the trie FIB and the hashed PIT')
+    parser.add_argument('--rcvbuf', type=int, default=None, help='Size of the kernel receive buffer of the UDP socket in bytes (default: system default)')
+    parser.add_argument('--sndbuf', type=int, default=None, help='Size of the kernel send buffer of the UDP socket in bytes (default: system default)')
     parser.add_argument('-l', '--logging', choices=['debug', 'info', 'warning', 'error', 'none'], type=str, default=None, help=f'Logging Level (default: {default_logging})')
     args = parser.parse_args()
     main(args)
@@ -7,7 +7,7 @@ import PiCN.ProgramLibs.ICNPushRepository
 from PiCN.Executable.Helpers.ConfigParser import ConfigParser
 from PiCN.Executable.Helpers.ConfigParser.ConfigParser import CouldNotOpenConfigError, CouldNotParseError, MalformedConfigurationError
 from PiCN.Logger import Logger
-from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder, NdnTlvEncoder
+from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder, NdnTlvEncoder, CompactEncoder
 
 # default arguments
 default_port = 9100
@@ -73,7 +73,12 @@ def main(args):
     logger.info("Flush DB:       " + str(args.flush_database))
 
     # Packet encoder
-    encoder = NdnTlvEncoder(log_level) if args.format == 'ndntlv' else SimpleStringEncoder(log_level)
+    if args.format == 'ndntlv':
+        encoder = NdnTlvEncoder(log_level)
+    elif args.format == 'compact':
+        encoder = CompactEncoder(log_level)
+    else:
+        encoder = SimpleStringEncoder(log_level)
 
     # Start
     forwarder = PiCN.ProgramLibs.ICNPushRepository.ICNPushRepository(args.database_path, args.port, log_level, encoder, args.flush_database)
@@ -84,7 +89,7 @@ def main(args):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='PiCN Push Repository')
     parser.add_argument('-p', '--port', type=int, default=None, help=f'UDP port (default: {default_port})')
-    parser.add_argument('-f', '--format', choices=['ndntlv', 'simple'], type=str, default=None,
+    parser.add_argument('-f', '--format', choices=['ndntlv', 'simple', 'compact'], type=str, default=None,
                         help=f'Packet Format (default: {default_format})')
     parser.add_argument('-c', '--config', type=str, default="none", help="Path to configuration file")
     parser.add_argument('-l', '--logging', choices=['debug', 'info', 'warning', 'error', 'none'], type=str,
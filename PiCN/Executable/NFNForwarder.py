@@ -7,7 +7,7 @@ import argparse
 import PiCN.ProgramLibs.NFNForwarder
 from PiCN.Logger import Logger
 from PiCN.Layers.NFNLayer.NFNOptimizer import EdgeComputingOptimizer, MapReduceOptimizer, EagerOptimizer
-from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder, NdnTlvEncoder
+from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder, NdnTlvEncoder, CompactEncoder
 
 def main(argv):
 
@@ -31,7 +31,12 @@ def main(argv):
     logger.info("Packet Format:  " + args.format)
 
     # Packet encoder
-    encoder = NdnTlvEncoder(log_level) if args.format == 'ndntlv' else SimpleStringEncoder(log_level)
+    if args.format == 'ndntlv':
+        encoder = NdnTlvEncoder(log_level)
+    elif args.format == 'compact':
+        encoder = CompactEncoder(log_level)
+    else:
+        encoder = SimpleStringEncoder(log_level)
 
 
     if args.optimizer == "Edge":
@@ -66,7 +71,7 @@ def main(argv):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='PiCN Forwarder')
     parser.add_argument('-p', '--port', type=int, default=9000, help="UDP port (default: 9000)")
-    parser.add_argument('-f', '--format', choices=['ndntlv','simple'], type=str, default='ndntlv', help='Packet Format (default: ndntlv)')
+    parser.add_argument('-f', '--format', choices=['ndntlv', 'simple', 'compact'], type=str, default='ndntlv', help='Packet Format (default: ndntlv)')
     parser.add_argument('-l', '--logging', choices=['debug','info', 'warning', 'error', 'none'], type=str, default='info', help='Logging Level (default: info)')
     parser.add_argument('-e', '--optimizer', choices=['ToDataFirst', 'Edge', 'Eager', 'MapReduce', 'Thunks'], type=str, default="ToDataFirst", help="Choose the NFN Optimizer")
     args = parser.parse_args()
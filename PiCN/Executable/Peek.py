@@ -5,6 +5,7 @@ import socket
 import sys
 
 from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder
+from PiCN.Layers.PacketEncodingLayer.Encoder import CompactEncoder
 from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder
 from PiCN.Layers.PacketEncodingLayer.Printer.NdnTlvPrinter import NdnTlvPrinter
 from PiCN.Packets import Interest, Content
@@ -13,7 +14,12 @@ from PiCN.Packets import Interest, Content
 def main(args):
 
     # Packet encoder
-    encoder = NdnTlvEncoder() if args.format == 'ndntlv' else SimpleStringEncoder()
+    if args.format == 'ndntlv':
+        encoder = NdnTlvEncoder()
+    elif args.format == 'compact':
+        encoder = CompactEncoder()
+    else:
+        encoder = SimpleStringEncoder()
 
     # Generate interest packet
     interest: Interest = Interest(args.name)
@@ -54,7 +60,7 @@ if __name__ == "__main__":
     parser.add_argument('-i', '--ip', type=str, default='127.0.0.1', help="IP address or hostname of forwarder (default: 127.0.0.1)")
     parser.add_argument('-p', '--port', type=int, default=9000, help="UDP port (default: 9000)")
     parser.add_argument('-t', '--timeout', type=int, default=5, help="Timeout (default: 5)")
-    parser.add_argument('-f', '--format', choices=['ndntlv','simple'], type=str, default='ndntlv', help='Packet Format (default: ndntlv)')
+    parser.add_argument('-f', '--format', choices=['ndntlv', 'simple', 'compact'], type=str, default='ndntlv', help='Packet Format (default: ndntlv)')
     parser.add_argument('--plain', help="plain output (writes payload to stdout or returns -2 for NACK)", action="store_true")
     parser.add_argument('name', type=str, help="CCN name of the content object to fetch")
     args = parser.parse_args()
@@ -1,9 +1,11 @@
 """Data Structure for managing LayerProcesses and their queues"""
 
+import asyncio
 import multiprocessing
+import threading
 from typing import List
 
-from PiCN.Processes import LayerProcess
+from PiCN.Processes import LayerProcess, LocalQueue, SharedMemoryQueue
 
 
 class LayerStack(object):
@@ -11,17 +13,32 @@ class LayerStack(object):
     Data structure for managing LayerProcesses and their queues
     """
 
-    def __init__(self, layers: List[LayerProcess]):
+    def __init__(self, layers: List[LayerProcess], use_asyncio: bool=False, batch_size: int=1,
+                 shared_memory: bool=False):
         """
         Create a layer stack from a list of layers, where the topmost layer is the first element in the list.
         :param layers: List of layers to stack onto each other.
+        :param use_asyncio: If true, all layers run as coroutines in a single asyncio event loop (in a thread of the
+                            calling process) and hand over packets through in-memory LocalQueues instead of
+                            multiprocessing.Queues.
+        :param batch_size: If larger than 1, all layers drain up to batch_size items when a queue is readable and
+                           hand the output of a burst to the neighbouring layers as a single QueueBatch.
+        :param shared_memory: If true, the queues between the layers are SharedMemoryQueues (ring buffers in shared
+                              memory) instead of multiprocessing.Queues. Cannot be combined with use_asyncio.
         """
+        if use_asyncio and shared_memory:
+            raise ValueError('Shared memory queues are not needed in the asyncio execution mode')
         self.layers: List[LayerProcess] = []
         self.queues: List[multiprocessing.Queue] = []
-        self._queue_to_higher = multiprocessing.Queue()
-        self._queue_from_higher = multiprocessing.Queue()
-        self._queue_to_lower = multiprocessing.Queue()
-        self._queue_from_lower = multiprocessing.Queue()
+        self._use_asyncio: bool = use_asyncio
+        self._batch_size: int = batch_size
+        self._shared_memory: bool = shared_memory
+        self._event_loop: asyncio.AbstractEventLoop = None
+        self._loop_thread: threading.Thread = None
+        self._queue_to_higher = self.__create_queue()
+        self._queue_from_higher = self.__create_queue()
+        self._queue_to_lower = self.__create_queue()
+        self._queue_from_lower = self.__create_queue()
         self.__started = False
         if len(layers) == 0:
             raise ValueError('Can\'t have an empty LayerStack')
@@ -30,8 +47,8 @@ class LayerStack(object):
             upper = layers[i]
             lower = layers[i + 1]
             # Create two queues for communication
-            q_to_upper = multiprocessing.Queue()
-            q_to_lower = multiprocessing.Queue()
+            q_to_upper = self.__create_queue(between_layers=True)
+            q_to_lower = self.__create_queue(between_layers=True)
             upper.queue_to_lower = q_to_lower
             upper.queue_from_lower = q_to_upper
             lower.queue_to_higher = q_to_upper
@@ -97,13 +114,45 @@ class LayerStack(object):
         Utility function to start all LayerProcesses managed by the LayerStack.
         """
         self.__started = True
+        if self._use_asyncio:
+            self._event_loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=self._event_loop.run_forever, daemon=True)
+            self._loop_thread.start()
+            for l in self.layers:
+                l.event_loop = self._event_loop
+        if self._batch_size > 1:
+            for i, l in enumerate(self.layers):
+                l.batch_size = self._batch_size
+                # only coalesce towards layers of the stack, the outer queues may be read by other components
+                l.coalesce_to_higher = i > 0
+                l.coalesce_to_lower = i < len(self.layers) - 1
         [l.start_process() for l in self.layers]
 
     def stop_all(self):
         """
         Utility function to stop all LayerProcesses managed by the LayerStack.
         """
+        if self._event_loop is not None:
+            asyncio.run_coroutine_threadsafe(self.__cancel_layer_tasks(), self._event_loop).result()
         [l.stop_process() for l in self.layers]
+        if self._event_loop is not None:
+            self._event_loop.call_soon_threadsafe(self._event_loop.stop)
+            self._loop_thread.join()
+            self._event_loop.close()
+            self._event_loop = None
+            self._loop_thread = None
+
+    @property
+    def use_asyncio(self) -> bool:
+        return self._use_asyncio
+
+    @property
+    def batch_size(self) -> int:
+        return self._batch_size
+
+    @property
+    def shared_memory(self) -> bool:
+        return self._shared_memory
 
     @property
     def queue_to_higher(self):
@@ -149,6 +198,19 @@ class LayerStack(object):
         self.queue_from_lower = queue
         self.layers[len(self.layers)-1].queue_from_lower = queue
 
+    def __create_queue(self, between_layers: bool=False):
+        if self._use_asyncio:
+            return LocalQueue()
+        if self._shared_memory and between_layers:
+            return SharedMemoryQueue()
+        return multiprocessing.Queue()
+
+    async def __cancel_layer_tasks(self):
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
     def __insert(self, layer: LayerProcess, at: int):
         # Get the layers between which to insert the new layer
         layer_above = self.layers[at - 1] if at > 0 else None
@@ -160,7 +222,7 @@ class LayerStack(object):
             queues.append(layer_above.queue_from_lower)
         # Create two new queues needed for connecting the new layer to the stack.
         for x in range(2):
-            q = multiprocessing.Queue()
+            q = self.__create_queue(between_layers=True)
             self.queues.append(q)
             queues.append(q)
         # Set up queues to the layer above
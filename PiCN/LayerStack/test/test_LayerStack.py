@@ -3,7 +3,19 @@ import unittest
 
 from PiCN.LayerStack import LayerStack
 from PiCN.Layers.PacketEncodingLayer import BasicPacketEncodingLayer
-from PiCN.Processes import LayerProcess
+from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder
+from PiCN.Packets import Interest
+from PiCN.Processes import LayerProcess, LocalQueue, SharedMemoryQueue
+
+
+class LayerMock(LayerProcess):
+    """ Mock implementation of a LayerProcess, forwarding all data """
+
+    def data_from_lower(self, to_lower, to_higher, data):
+        to_higher.put(data)
+
+    def data_from_higher(self, to_lower, to_higher, data):
+        to_lower.put(data)
 
 
 class test_LayerStack(unittest.TestCase):
@@ -82,6 +94,83 @@ class test_LayerStack(unittest.TestCase):
         self.assertNotEqual(toplayer.queue_to_lower, bottomlayer.queue_from_higher)
         self.assertNotEqual(toplayer.queue_from_lower, bottomlayer.queue_to_higher)
 
+    def test_create_asyncio(self):
+        toplayer: LayerProcess = BasicPacketEncodingLayer()
+        bottomlayer: LayerProcess = BasicPacketEncodingLayer()
+        lstack: LayerStack = LayerStack([toplayer, bottomlayer], use_asyncio=True)
+        newlayer: LayerProcess = BasicPacketEncodingLayer()
+        lstack.insert(newlayer, on_top_of=bottomlayer)
+        self.assertTrue(lstack.use_asyncio)
+        self.assertEqual(4, len(lstack.queues))
+        for q in lstack.queues:
+            self.assertIsInstance(q, LocalQueue)
+        self.assertIsInstance(lstack.queue_to_higher, LocalQueue)
+        self.assertIsInstance(lstack.queue_from_lower, LocalQueue)
+
+    def test_asyncio_packet_through_stack(self):
+        encoder = SimpleStringEncoder()
+        toplayer: LayerProcess = LayerMock()
+        bottomlayer: LayerProcess = BasicPacketEncodingLayer(encoder)
+        lstack: LayerStack = LayerStack([toplayer, bottomlayer], use_asyncio=True)
+        lstack.start_all()
+        try:
+            interest = Interest("/test/data")
+            lstack.queue_from_higher.put([1, interest])
+            fid, wire = lstack.queue_to_lower.get(timeout=2.0)
+            self.assertEqual(1, fid)
+            self.assertEqual(encoder.encode(interest), wire)
+            lstack.queue_from_lower.put([2, wire])
+            fid, packet = lstack.queue_to_higher.get(timeout=2.0)
+            self.assertEqual(2, fid)
+            self.assertEqual(interest, packet)
+        finally:
+            lstack.stop_all()
+
+    def test_batched_packets_through_stack(self):
+        toplayer: LayerProcess = LayerMock()
+        middlelayer: LayerProcess = LayerMock()
+        bottomlayer: LayerProcess = LayerMock()
+        lstack: LayerStack = LayerStack([toplayer, middlelayer, bottomlayer], batch_size=4)
+        lstack.start_all()
+        try:
+            self.assertEqual(4, middlelayer.batch_size)
+            self.assertFalse(toplayer.coalesce_to_higher)
+            self.assertTrue(toplayer.coalesce_to_lower)
+            self.assertFalse(bottomlayer.coalesce_to_lower)
+            for i in range(10):
+                lstack.queue_from_higher.put([i, "data"])
+            for i in range(10):
+                self.assertEqual([i, "data"], lstack.queue_to_lower.get(timeout=2.0))
+            for i in range(10):
+                lstack.queue_from_lower.put([i, "data"])
+            for i in range(10):
+                self.assertEqual([i, "data"], lstack.queue_to_higher.get(timeout=2.0))
+        finally:
+            lstack.stop_all()
+
+    def test_shared_memory_packet_through_stack(self):
+        encoder = SimpleStringEncoder()
+        toplayer: LayerProcess = LayerMock()
+        bottomlayer: LayerProcess = BasicPacketEncodingLayer(encoder)
+        lstack: LayerStack = LayerStack([toplayer, bottomlayer], shared_memory=True)
+        self.assertIsInstance(toplayer.queue_to_lower, SharedMemoryQueue)
+        self.assertNotIsInstance(lstack.queue_to_lower, SharedMemoryQueue)
+        lstack.start_all()
+        try:
+            interest = Interest("/test/data")
+            lstack.queue_from_higher.put([1, interest])
+            fid, wire = lstack.queue_to_lower.get(timeout=2.0)
+            self.assertEqual(1, fid)
+            self.assertEqual(encoder.encode(interest), wire)
+            lstack.queue_from_lower.put([2, wire])
+            fid, packet = lstack.queue_to_higher.get(timeout=2.0)
+            self.assertEqual(2, fid)
+            self.assertEqual(interest, packet)
+        finally:
+            lstack.stop_all()
+        with self.assertRaises(ValueError):
+            LayerStack([LayerMock()], use_asyncio=True, shared_memory=True)
+
 
 if __name__ == '__main__':
     unittest.main()
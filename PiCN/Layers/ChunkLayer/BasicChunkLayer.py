@@ -1,11 +1,14 @@
 """"Basic Chunking Layer for PICN"""
 
 import multiprocessing
+import threading
 import time
-from typing import Dict, List
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Set, Tuple
 
 from PiCN.Layers.ChunkLayer.Chunkifyer import BaseChunkifyer, SimpleContentChunkifyer
-from PiCN.Packets import Content, Interest, Name, Nack
+from PiCN.Layers.PacketEncodingLayer.Encoder import BasicEncoder
+from PiCN.Packets import Content, Interest, Name, Nack, NackReason
 from PiCN.Processes import LayerProcess
 
 
@@ -14,30 +17,86 @@ class RequestTableEntry(object):
 
     def __init__(self, name: Name):
         self.name: Name = name
-        self.requested_chunks = []
-        self.chunks =[]
-        self.requested_md = []
+        self.requested_chunks: Set[Name] = set()
+        self.requested_md: Set[Name] = set()
         self.chunked = False
-        self.lastchunk:Name
+        self.lastchunk: Name = None
+        self.content_size: int = None
+        self.buffer: bytearray = None #reassembly buffer, chunks are written to their offset as they arrive
+        self.streaming = False #deliver the content in order as soon as chunks are contiguous
+        self.next_chunk = 0 #index of the next chunk to be delivered when streaming
+        self.stream_segments: Dict[int, bytes] = {} #received chunks which are not contiguous yet
+        self.faceid: int = None
+        self.pending_chunks: Deque[Name] = deque() #announced by metadata, not requested yet, in chunk order
+        self.chunks_per_md: int = None #number of chunk names in a metadata object
+        self.chunk_length: int = None #length of the first chunk, all chunks but the last one have this length
+        self.next_md = 1 #index of the next metadata object to be requested
+        self.announced_md = 0 #highest index of a metadata object announced by a received metadata object
+        self.last_md: int = None #index of the last metadata object, known when it is received
+        self.send_times: Dict[Name, float] = {} #send time of the outstanding chunk and metadata interests
+        self.retransmissions: Dict[Name, int] = {}
+        self.window: float = None #congestion window, maximum number of outstanding chunk interests
+        self.ssthresh: float = None
+        self.last_decrease: float = 0.0
 
     def __eq__(self, other):
         return self.name == other.name
 
 class BasicChunkLayer(LayerProcess):
-    """"Basic Chunking Layer for PICN"""
+    """"Basic Chunking Layer for PICN
+    Chunks announced by metadata are fetched through a sliding window per request: at most window chunk interests are
+    outstanding, the window grows by slow start and additive increase for each received chunk and is halved on a
+    timeout or a congestion Nack (at most once per retransmission timeout). Metadata objects are prefetched by their
+    predictable names as long as fewer chunk names than the window are pending, the number of metadata objects is
+    derived from the content size and the length of the first chunk. Outstanding interests are retransmitted after a
+    timeout estimated from the RTT of the received chunks (RFC 6298), a request fails with a Nack to higher after
+    max_retransmissions.
+    Received chunks are written to their offset in a reassembly buffer preallocated with the content size of the
+    metadata, in any order, and the buffer is handed to higher as payload of the reassembled content.
+    A request can opt in to streaming by an interest from higher with a third element True ([faceid, interest, True]).
+    Its content is then delivered as a sequence of [faceid, content, last] with consecutive parts of the payload as soon
+    as they are contiguous, the last part has last set to True. Only chunks within the window after the next chunk to be
+    delivered are requested, so streamed chunks are not buffered beyond the window. They are not kept in the chunk
+    table.
+    The request table and the chunk table are local to the layer process. Outstanding chunk and metadata names are
+    indexed to their request, the chunk table evicts entries which were not used for chunk_table_ttl seconds and the
+    least recently used entries if it holds more than max_chunk_table_entries.
+    :param encoder: if set, metadata and chunks are encoded (and signed) once when they are created, so the packet
+                    encoding layer serves them as they are
+    :param initial_window: initial number of outstanding chunk interests per request
+    :param max_window: maximum number of outstanding chunk interests per request
+    :param initial_rto: retransmission timeout in seconds until the first RTT was measured
+    :param max_retransmissions: maximum number of retransmissions of a chunk or metadata interest
+    :param chunk_table_ttl: time in seconds a chunk or metadata object is kept in the chunk table after its last use
+    :param max_chunk_table_entries: maximum number of chunks and metadata objects in the chunk table
+    """
 
-    def __init__(self, chunkifyer: BaseChunkifyer=None, chunk_size: int=4096, manager: multiprocessing.Manager=None,
-                 log_level=255):
+    MIN_RTO = 0.2
+    MAX_RTO = 8.0
+    TIMER_INTERVAL = 0.1
+
+    def __init__(self, chunkifyer: BaseChunkifyer=None, chunk_size: int=4096, log_level=255,
+                 encoder: BasicEncoder=None, initial_window: int=8, max_window: int=64, initial_rto: float=1.0,
+                 max_retransmissions: int=3, chunk_table_ttl: float=600.0, max_chunk_table_entries: int=65536):
         super().__init__("ChunkLayer", log_level=log_level)
         self.chunk_size = chunk_size
+        self._encoder: BasicEncoder = encoder
+        self.initial_window = initial_window
+        self.max_window = max_window
+        self.max_retransmissions = max_retransmissions
+        self._rto: float = initial_rto
+        self._srtt: float = None
+        self._rttvar: float = None
+        self._timer_running = False
         if chunkifyer == None:
             self.chunkifyer = SimpleContentChunkifyer(chunk_size)
         else:
             self.chunkifyer: BaseChunkifyer = chunkifyer
-        if manager is None:
-            manager = multiprocessing.Manager()
-        self._chunk_table: Dict[Name, (Content, float)] = manager.dict()
-        self._request_table: List[RequestTableEntry] = manager.list()
+        self.chunk_table_ttl = chunk_table_ttl
+        self.max_chunk_table_entries = max_chunk_table_entries
+        self._chunk_table: Dict[Name, Tuple[Content, float]] = OrderedDict() #least recently used first
+        self._request_table: Dict[Name, RequestTableEntry] = {}
+        self._outstanding_names: Dict[Name, RequestTableEntry] = {} #requested chunk and metadata names
 
     def data_from_higher(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
         self.logger.info("Got Data from higher")
@@ -47,7 +106,9 @@ class BasicChunkLayer(LayerProcess):
             self.logger.info("Packet is Interest " + str(packet.name))
             requestentry = self.get_request_table_entry(packet.name)
             if requestentry is None:
-                self._request_table.append(RequestTableEntry(packet.name))
+                requestentry = RequestTableEntry(packet.name)
+                requestentry.streaming = len(data) > 2 and data[2] is True
+                self.add_request_table_entry(requestentry)
             to_lower.put([faceid, packet])
             return
         if isinstance(packet, Content):
@@ -55,21 +116,27 @@ class BasicChunkLayer(LayerProcess):
                                       (str(packet.name), len(packet.content)))
             if len(packet.content) < self.chunk_size:
                 to_lower.put([faceid, packet])
+                return
+            cached_metadata = self.get_from_chunk_table(packet.name)
+            if cached_metadata is not None: # already chunked (and signed) for a concurrent request
+                to_lower.put([faceid, cached_metadata])
             else:
                 self.logger.info("Chunking Packet")
                 metadata, chunks = self.chunkifyer.chunk_data(packet) #create metadata and chunks
+                if self._encoder is not None:
+                    self.presign(metadata + chunks)
                 self.logger.info("Metadata: " + metadata[0].content)
                 to_lower.put([faceid, metadata[0]]) #return first name TODO HANDLE THE CASE, WHERE CHUNKS CAN TIMEOUT AND MUST BE REPRODUCED
                 for md in metadata: #add metadata to chunktable
                     if md.name not in self._chunk_table:
-                        self._chunk_table[md.name] = (md, time.time())
+                        self.add_to_chunk_table(md)
                 for c in chunks: #add chunks to chunktable
                     if c.name not in self._chunk_table:
-                        self._chunk_table[c.name] = (c, time.time())
+                        self.add_to_chunk_table(c)
         if isinstance(packet, Nack):
             requestentry = self.get_request_table_entry(packet.name)
             if requestentry is not None:
-                self._request_table.remove(requestentry)
+                self.remove_request_table_entry(requestentry)
             to_lower.put([faceid, packet])
 
     def data_from_lower(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
@@ -78,8 +145,8 @@ class BasicChunkLayer(LayerProcess):
         packet = data[1]
         if isinstance(packet, Interest):
             self.logger.info("Packet is Interest")
-            if packet.name in self._chunk_table: #Check if Interest is in chunktable
-                matching_content = self._chunk_table.get(packet.name)[0]
+            matching_content = self.get_from_chunk_table(packet.name) #Check if Interest is in chunktable
+            if matching_content is not None:
                 to_lower.put([faceid, matching_content])
             else:
                 to_higher.put([faceid, packet])
@@ -89,67 +156,296 @@ class BasicChunkLayer(LayerProcess):
             request_table_entry = self.get_request_table_entry(packet.name)
             if request_table_entry is None:
                 return
-            self._request_table.remove(request_table_entry)
             if request_table_entry.chunked is False: #not chunked content
                 if not packet.get_bytes().startswith(b'mdo:'):
-                    to_higher.put([faceid, packet])
+                    self.remove_request_table_entry(request_table_entry)
+                    if request_table_entry.streaming:
+                        to_higher.put([faceid, packet, True])
+                    else:
+                        to_higher.put([faceid, packet])
                     return
                 else: # Received metadata data --> chunked content
                     request_table_entry.chunked = True
-            if packet.get_bytes().startswith(b'mdo:'): # request all frames from metadata
-                request_table_entry = self.handle_received_meta_data(faceid, packet, request_table_entry, to_lower)
+            elif packet.name == request_table_entry.name: # duplicate of the first metadata
+                return
+            if packet.get_bytes().startswith(b'mdo:'): # request chunks from metadata
+                self.handle_received_meta_data(faceid, packet, request_table_entry, to_lower)
             else:
-                request_table_entry = self.handle_received_chunk_data(faceid, packet, request_table_entry, to_higher)
-                if request_table_entry is None:
-                    return #deletes entry if data was completed
-            self._request_table.append(request_table_entry)
+                self.handle_received_chunk_data(faceid, packet, request_table_entry, to_higher, to_lower)
         if isinstance(packet, Nack):
             requestentry = self.get_request_table_entry(packet.name)
             if requestentry is not None:
-                self._request_table.remove(requestentry)
+                if packet.reason == NackReason.CONGESTION and packet.name in requestentry.send_times:
+                    self.logger.info("Congestion Nack for " + str(packet.name) + ", retransmitting after timeout")
+                    self.decrease_window(requestentry)
+                    return
+                self.remove_request_table_entry(requestentry)
             to_higher.put([faceid, packet])
 
+    def data_from_control(self, data):
+        if data == "timeout":
+            self.check_timeouts(self.queue_to_lower, self.queue_to_higher)
+            self.expire_chunk_table()
+
+    def start_process(self):
+        """Start the layer process and the timer checking for retransmission timeouts"""
+        if self.queue_control is None:
+            self.queue_control = multiprocessing.Queue()
+        super().start_process()
+        self._timer_running = True
+        self._schedule_timeout_check()
+
+    def stop_process(self):
+        self._timer_running = False
+        super().stop_process()
+
+    def _schedule_timeout_check(self):
+        t = threading.Timer(self.TIMER_INTERVAL, self._timeout_check)
+        t.daemon = True
+        t.start()
+
+    def _timeout_check(self):
+        """triggers check_timeouts in the layer process by a control command"""
+        if not self._timer_running:
+            return
+        try:
+            self.queue_control.put("timeout")
+        except Exception:
+            return
+        self._schedule_timeout_check()
+
+    def check_timeouts(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
+        """retransmit outstanding chunk and metadata interests whose retransmission timeout expired"""
+        now = time.time()
+        timed_out = False
+        for request_table_entry in list(self._request_table.values()):
+            expired = [name for name, sent in request_table_entry.send_times.items() if now - sent > self._rto]
+            if len(expired) == 0:
+                continue
+            timed_out = True
+            failed = False
+            for name in expired:
+                retransmissions = request_table_entry.retransmissions.get(name, 0) + 1
+                if retransmissions > self.max_retransmissions:
+                    failed = True
+                    break
+                request_table_entry.retransmissions[name] = retransmissions
+                self.logger.info("Retransmitting " + str(name))
+                self.send_interest(request_table_entry, name, to_lower)
+            if failed:
+                self.logger.info("Giving up request " + str(request_table_entry.name))
+                self.remove_request_table_entry(request_table_entry)
+                to_higher.put([request_table_entry.faceid, Nack(request_table_entry.name, NackReason.PIT_TIMEOUT,
+                                                                Interest(request_table_entry.name))])
+                continue
+            self.decrease_window(request_table_entry, now)
+        if timed_out:
+            self._rto = min(self._rto * 2, self.MAX_RTO)
+
+    def send_interest(self, request_table_entry: RequestTableEntry, name: Name, to_lower: multiprocessing.Queue):
+        """send an interest for a chunk or metadata object of a request and start its retransmission timer"""
+        request_table_entry.send_times[name] = time.time()
+        to_lower.put([request_table_entry.faceid, Interest(name)])
+
+    def fill_window(self, request_table_entry: RequestTableEntry, to_lower: multiprocessing.Queue):
+        """prefetch metadata objects while fewer chunk names than the window are pending and request pending chunks
+        until the window is full"""
+        if request_table_entry.window is None:
+            request_table_entry.window = float(self.initial_window)
+            request_table_entry.ssthresh = float(self.max_window)
+        window = int(request_table_entry.window)
+        chunks_per_md = request_table_entry.chunks_per_md or 1
+        last_md = self.last_metadata_index(request_table_entry)
+        while request_table_entry.next_md <= last_md and len(request_table_entry.pending_chunks) + \
+                len(request_table_entry.requested_md) * chunks_per_md < window:
+            md = self.chunkifyer.metadata_name(request_table_entry.name, request_table_entry.next_md)
+            request_table_entry.next_md += 1
+            request_table_entry.requested_md.add(md)
+            self._outstanding_names[md] = request_table_entry
+            self.send_interest(request_table_entry, md, to_lower)
+        while len(request_table_entry.pending_chunks) > 0 and len(request_table_entry.requested_chunks) < window:
+            if request_table_entry.streaming and self.chunkifyer.chunk_index(request_table_entry.pending_chunks[0]) \
+                    >= request_table_entry.next_chunk + window:
+                break
+            chunk = request_table_entry.pending_chunks.popleft()
+            request_table_entry.requested_chunks.add(chunk)
+            self._outstanding_names[chunk] = request_table_entry
+            self.send_interest(request_table_entry, chunk, to_lower)
+
+    def last_metadata_index(self, request_table_entry: RequestTableEntry) -> int:
+        """index of the last metadata object of a request: known once it was received, computed from the content size
+        once the length of the first chunk is known, otherwise the highest announced index"""
+        if request_table_entry.last_md is not None:
+            return request_table_entry.last_md
+        if request_table_entry.chunk_length is None or request_table_entry.chunks_per_md is None \
+                or request_table_entry.content_size is None:
+            return request_table_entry.announced_md
+        num_chunks = -(-request_table_entry.content_size // request_table_entry.chunk_length)
+        return max((num_chunks - 1) // request_table_entry.chunks_per_md, request_table_entry.announced_md)
+
+    def increase_window(self, request_table_entry: RequestTableEntry):
+        """slow start below ssthresh, additive increase above"""
+        if request_table_entry.window is None:
+            return
+        if request_table_entry.window < request_table_entry.ssthresh:
+            request_table_entry.window += 1.0
+        else:
+            request_table_entry.window += 1.0 / request_table_entry.window
+        request_table_entry.window = min(request_table_entry.window, float(self.max_window))
+
+    def decrease_window(self, request_table_entry: RequestTableEntry, now: float=None):
+        """multiplicative decrease, at most once per retransmission timeout"""
+        if request_table_entry.window is None:
+            return
+        now = now if now is not None else time.time()
+        if now - request_table_entry.last_decrease < self._rto:
+            return
+        request_table_entry.ssthresh = max(request_table_entry.window / 2.0, 1.0)
+        request_table_entry.window = request_table_entry.ssthresh
+        request_table_entry.last_decrease = now
+
+    def sample_rtt(self, request_table_entry: RequestTableEntry, name: Name):
+        """stop the retransmission timer of a received chunk or metadata object and update the RTT estimation,
+        retransmitted interests are not sampled (Karn's algorithm)"""
+        sent = request_table_entry.send_times.pop(name, None)
+        if sent is None or request_table_entry.retransmissions.get(name, 0) > 0:
+            return
+        rtt = time.time() - sent
+        if self._srtt is None:
+            self._srtt = rtt
+            self._rttvar = rtt / 2.0
+        else:
+            self._rttvar = 0.75 * self._rttvar + 0.25 * abs(self._srtt - rtt)
+            self._srtt = 0.875 * self._srtt + 0.125 * rtt
+        self._rto = min(max(self._srtt + 4.0 * self._rttvar, self.MIN_RTO), self.MAX_RTO)
+
+    def presign(self, packets: List[Content]):
+        """encode packets as a burst and keep the wire format in the packets"""
+        for packet, wire_format in zip(packets, self._encoder.encode_all(packets)):
+            packet.wire_format = wire_format
+
     def handle_received_meta_data(self, faceid: int, packet: Content, request_table_entry: RequestTableEntry,
                                   to_lower: multiprocessing.Queue) -> RequestTableEntry:
         """Handle the case, where metadata are received from the network"""
-        md_entry = self.metadata_name_in_request_table(packet.name)
-        if md_entry is None:
+        if packet.name != request_table_entry.name and packet.name not in request_table_entry.requested_md:
             return request_table_entry
         request_table_entry = self.remove_metadata_name_from_request_table(request_table_entry, packet.name)
+        self.sample_rtt(request_table_entry, packet.name)
+        request_table_entry.faceid = faceid
         md, chunks, size = self.chunkifyer.parse_meta_data(packet.content)
-        if md is not None:  # there is another md file
-            request_table_entry.requested_md.append(md)
-            to_lower.put([faceid, Interest(md)])
+        if request_table_entry.content_size is None:
+            request_table_entry.content_size = int(size)
+        if packet.name == request_table_entry.name:
+            request_table_entry.chunks_per_md = len(chunks)
+        if md is not None:  # there is another md file, it is requested by fill_window
+            request_table_entry.announced_md = max(request_table_entry.announced_md,
+                                                   self.chunkifyer.metadata_index(request_table_entry.name, md))
         else:
             request_table_entry.lastchunk = chunks[-1]
-        for chunk in chunks:  # request all chunks from the metadata file
-            request_table_entry.requested_chunks.append(chunk)
-            to_lower.put([faceid, Interest(chunk)])
-        self._chunk_table[packet.name] = (packet, time.time())
+            request_table_entry.last_md = self.chunkifyer.metadata_index(request_table_entry.name, packet.name)
+        pending = request_table_entry.pending_chunks
+        if len(pending) > 0 and self.chunkifyer.chunk_index(chunks[0]) < self.chunkifyer.chunk_index(pending[-1]):
+            # prefetched metadata arrived out of order, keep the pending chunks in order
+            request_table_entry.pending_chunks = deque(sorted(list(pending) + chunks, key=self.chunkifyer.chunk_index))
+        else:
+            pending.extend(chunks)
+        self.fill_window(request_table_entry, to_lower)
+        self.add_to_chunk_table(packet)
         return request_table_entry
 
     def handle_received_chunk_data(self, faceid: int, packet: Content, request_table_entry: RequestTableEntry,
-                                   to_higher: multiprocessing.Queue) -> RequestTableEntry:
+                                   to_higher: multiprocessing.Queue, to_lower: multiprocessing.Queue=None) \
+            -> RequestTableEntry:
         """Handle the case wehere chunk data are received """
-        chunk_entry = self.chunk_name_in_request_table(packet.name)
-        if chunk_entry is None:
+        if packet.name not in request_table_entry.requested_chunks:
+            return request_table_entry
+        index = self.chunkifyer.chunk_index(packet.name)
+        if request_table_entry.streaming:
+            request_table_entry.stream_segments[index] = packet.get_bytes()
+        elif not self.write_chunk(request_table_entry, packet):
             return request_table_entry
-        request_table_entry.chunks.append(packet)
+        if index == 0:
+            request_table_entry.chunk_length = len(packet.payload_view())
         request_table_entry = self.remove_chunk_name_from_request_table_entry(request_table_entry, packet.name)
-        self._chunk_table[packet.name] = (packet, time.time())
-        if request_table_entry.chunked and len(request_table_entry.requested_chunks) == 0 \
-                and len(request_table_entry.requested_md) == 0:  # all chunks are available
-            data = request_table_entry.chunks
-            #data = sorted(data, key=lambda content: content.name.to_string()) #broken with more than 10 chunks
-            data = sorted(data,
-                          key=lambda content: int(''.join(filter(str.isdigit, content.name.string_components[-1]))))
-            cont = self.chunkifyer.reassamble_data(request_table_entry.name, data)
+        self.sample_rtt(request_table_entry, packet.name)
+        self.increase_window(request_table_entry)
+        self.fill_window(request_table_entry, to_lower if to_lower is not None else self.queue_to_lower)
+        completed = request_table_entry.chunked and len(request_table_entry.requested_chunks) == 0 \
+                    and len(request_table_entry.requested_md) == 0 \
+                    and len(request_table_entry.pending_chunks) == 0  # all chunks are available
+        if request_table_entry.streaming:
+            self.deliver_stream(faceid, request_table_entry, to_higher, completed)
+            if completed:
+                self.remove_request_table_entry(request_table_entry)
+                return None
+            self.fill_window(request_table_entry, to_lower if to_lower is not None else self.queue_to_lower)
+            return request_table_entry
+        self.add_to_chunk_table(packet)
+        if completed:
+            cont = Content(request_table_entry.name, request_table_entry.buffer)
+            self.remove_request_table_entry(request_table_entry)
             to_higher.put([faceid, cont])
             return None
         else:
             return request_table_entry
 
-    def get_chunk_list_from_chunk_table(self, data_names: Name) -> List[Content]:
+    def deliver_stream(self, faceid: int, request_table_entry: RequestTableEntry, to_higher: multiprocessing.Queue,
+                       last: bool):
+        """deliver the received chunks which continue the streamed content as one part to higher"""
+        segments = []
+        while request_table_entry.next_chunk in request_table_entry.stream_segments:
+            segments.append(request_table_entry.stream_segments.pop(request_table_entry.next_chunk))
+            request_table_entry.next_chunk += 1
+        if len(segments) > 0 or last:
+            to_higher.put([faceid, Content(request_table_entry.name, b"".join(segments)), last])
+
+    def write_chunk(self, request_table_entry: RequestTableEntry, packet: Content) -> bool:
+        """write the payload of a chunk to its offset in the reassembly buffer of the request, the buffer is allocated
+        with the content size of the metadata on the first chunk
+        :return: False if the chunk does not fit into the content
+        """
+        if request_table_entry.buffer is None:
+            request_table_entry.buffer = bytearray(request_table_entry.content_size or 0)
+        payload = packet.payload_view()
+        offset = self.chunkifyer.chunk_offset(packet.name, len(payload), len(request_table_entry.buffer),
+                                              request_table_entry.lastchunk)
+        if offset < 0 or offset + len(payload) > len(request_table_entry.buffer):
+            self.logger.error("Chunk " + str(packet.name) + " does not fit into the content of " +
+                              str(request_table_entry.name))
+            return False
+        request_table_entry.buffer[offset:offset + len(payload)] = payload
+        return True
+
+    def add_to_chunk_table(self, content: Content):
+        """add a chunk or metadata object to the chunk table, evicting the least recently used entries if the table is
+        full"""
+        self._chunk_table[content.name] = (content, time.time())
+        self._chunk_table.move_to_end(content.name)
+        while len(self._chunk_table) > self.max_chunk_table_entries:
+            self._chunk_table.popitem(last=False)
+
+    def get_from_chunk_table(self, name: Name) -> Content:
+        """get a chunk or metadata object from the chunk table and refresh its timestamp, None if not available"""
+        entry = self._chunk_table.get(name)
+        if entry is None:
+            return None
+        if time.time() - entry[1] > self.chunk_table_ttl:
+            del self._chunk_table[name]
+            return None
+        self._chunk_table[name] = (entry[0], time.time())
+        self._chunk_table.move_to_end(name)
+        return entry[0]
+
+    def expire_chunk_table(self):
+        """remove entries from the chunk table which were not used for chunk_table_ttl seconds"""
+        deadline = time.time() - self.chunk_table_ttl
+        while len(self._chunk_table) > 0:
+            name, (content, timestamp) = next(iter(self._chunk_table.items()))
+            if timestamp > deadline:
+                break
+            del self._chunk_table[name]
+
+    def get_chunk_list_from_chunk_table(self, data_names: List[Name]) -> List[Content]:
         """get a list of content objects from a list of names"""
         res = []
         for name in data_names:
@@ -157,20 +453,33 @@ class BasicChunkLayer(LayerProcess):
                 res.append(self._chunk_table[name][0])
         return res
 
-    def get_request_table_entry(self, name: Name) -> RequestTableEntry:
-        """check if a name is in the chunktable"""
-        for entry in self._request_table:
-            if entry.name == name or name in entry.requested_chunks or name in entry.requested_md:
-                return entry
+    def add_request_table_entry(self, request_table_entry: RequestTableEntry):
+        """add a request to the request table and index its requested chunks and metadata"""
+        self._request_table[request_table_entry.name] = request_table_entry
+        for name in request_table_entry.requested_chunks:
+            self._outstanding_names[name] = request_table_entry
+        for name in request_table_entry.requested_md:
+            self._outstanding_names[name] = request_table_entry
 
-        return None
+    def remove_request_table_entry(self, request_table_entry: RequestTableEntry):
+        """remove a request and the index of its requested chunks and metadata from the request table"""
+        self._request_table.pop(request_table_entry.name, None)
+        for name in request_table_entry.requested_chunks:
+            self._outstanding_names.pop(name, None)
+        for name in request_table_entry.requested_md:
+            self._outstanding_names.pop(name, None)
+
+    def get_request_table_entry(self, name: Name) -> RequestTableEntry:
+        """get the request of a name or of a requested chunk or metadata name"""
+        entry = self._request_table.get(name)
+        if entry is None:
+            entry = self._outstanding_names.get(name)
+        return entry
 
     def chunk_name_in_request_table(self, name):
         """check if a received chunk is expected by the requesttable"""
-        for entry in self._request_table:
-            if name in entry.requested_chunks:
-                return True
-        return False
+        entry = self._outstanding_names.get(name)
+        return entry is not None and name in entry.requested_chunks
 
     def remove_chunk_name_from_request_table_entry(self, request_table_entry: RequestTableEntry, name: Name)\
             -> RequestTableEntry:
@@ -178,15 +487,14 @@ class BasicChunkLayer(LayerProcess):
         if name not in request_table_entry.requested_chunks:
             return request_table_entry
         request_table_entry.requested_chunks.remove(name)
+        if self._outstanding_names.get(name) is request_table_entry:
+            del self._outstanding_names[name]
         return request_table_entry
 
     def metadata_name_in_request_table(self, name):
         """check if a received metadata is expected by the chunktable"""
-
-        for entry in self._request_table:
-            if name in entry.requested_md:
-                return True
-        return False
+        entry = self._outstanding_names.get(name)
+        return entry is not None and name in entry.requested_md
 
     def remove_metadata_name_from_request_table(self, request_table_entry: RequestTableEntry, name: Name) \
             -> RequestTableEntry:
@@ -194,4 +502,6 @@ class BasicChunkLayer(LayerProcess):
         if name not in request_table_entry.requested_md:
             return request_table_entry
         request_table_entry.requested_md.remove(name)
+        if self._outstanding_names.get(name) is request_table_entry:
+            del self._outstanding_names[name]
         return request_table_entry
@@ -15,8 +15,8 @@ class SimpleContentChunkifyer(BaseChunkifyer):
     def chunk_data(self, packet: Content) -> (List[Content], List[Content]):
         """Split content to chunks and generate metadata"""
         name = packet.name
-        data = packet.content
-        content_size = len(packet.content)
+        data = packet.get_bytes()
+        content_size = len(data)
         chunks = [data[i:i + self._chunksize] for i in range(0, len(data), self._chunksize)]
         num_of_chunks = len(chunks)
         meta_data = []
@@ -37,11 +37,30 @@ class SimpleContentChunkifyer(BaseChunkifyer):
 
 
     def reassamble_data(self, name: Name, chunks: List[Content]) -> Content:
-        data = ""
-        for d in chunks:
-            data = data + d.content
-        return Content(name, data)
+        return Content(name, b"".join(d.get_bytes() for d in chunks))
 
+    def chunk_index(self, name: Name) -> int:
+        """index of a chunk, given by the last name component c<index>"""
+        return int(name.string_components[-1][1:])
+
+    def chunk_offset(self, name: Name, chunk_length: int, content_size: int, last_chunk: Name=None) -> int:
+        """offset of a chunk in the reassembled content. All chunks but the last one have the full chunk size, so
+        the offset does not depend on the chunk size of the producer."""
+        if name == last_chunk:
+            return content_size - chunk_length
+        return self.chunk_index(name) * chunk_length
+
+    def metadata_name(self, name: Name, index: int) -> Name:
+        """name of the metadata object with the given index, the first metadata object has the name of the content"""
+        if index == 0:
+            return name
+        return Name(name.to_string() + "/m" + str(index))
+
+    def metadata_index(self, name: Name, md_name: Name) -> int:
+        """index of a metadata object of the content name, given by the last name component m<index>"""
+        if md_name == name:
+            return 0
+        return int(md_name.string_components[-1][1:])
 
     def generate_meta_data(self, startindex: int, endindex: int, md_num: int, next: int, name: Name, content_size: int)\
             -> Content:
@@ -3,12 +3,14 @@
 
 # (c) 2018-01-19 <christian.tschudin@unibas.ch>
 
-import binascii
-import copy
+import collections
 import hashlib
+from   concurrent.futures                                  import ThreadPoolExecutor
+from   typing                                              import List
 from   PiCN.Packets                                        import Name, Content
 from   PiCN.Layers.PacketEncodingLayer.Encoder             import NdnTlvEncoder
-from   PiCN.Layers.PacketEncodingLayer.Encoder.NdnTlvEncoder import TlvEncoder, TlvDecoder
+from   PiCNExternal.pyndn.encoding.tlv.tlv.tlv_encoder     import TlvEncoder
+from   PiCNExternal.pyndn.encoding.tlv.tlv.tlv_decoder     import TlvDecoder
 
 NDN_TYPE_MANIFEST             = 0x990
 NDN_TYPE_MANIFEST_INDEXTABLE  = 0x991
@@ -17,11 +19,24 @@ NDN_TYPE_MANIFEST_MANIFESTPTR = 0x993
 
 # ----------------------------------------------------------------------
 
+def _sha256(chunk: bytes) -> bytes:
+    return hashlib.sha256(chunk).digest()
+
+def _blobTlv(type: int, value: bytes) -> bytes:
+    e = TlvEncoder()
+    e.writeBlobTlv(type, value)
+    return e.getOutput().tobytes()
+
+# ----------------------------------------------------------------------
+
 class MkFlic():
+    # hash_threads: if larger than 1, the hash pointers of the data chunks
+    #   are computed by a pool of this many threads (hashlib releases the GIL)
 
-    def __init__(self, icn, MTU=4000):
+    def __init__(self, icn, MTU=4000, hash_threads: int=0):
         self.icn = icn
         self.MTU = MTU
+        self.hash_threads = hash_threads
 
     def _mkContentChunk(self, name: Name, data: bytes):
         # input: name, payload bytes
@@ -29,72 +44,61 @@ class MkFlic():
         c = Content(name, data)
         return NdnTlvEncoder().encode(c) # and sign
 
+    def _hashAll(self, chunks: List[bytes]) -> List[bytes]:
+        if self.hash_threads > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=self.hash_threads) as pool:
+                return list(pool.map(_sha256, chunks))
+        return [_sha256(c) for c in chunks]
+
     def bytesToManifest(self, name: Name, data: bytes) -> (Name, bytes):
         # input: byte array
         # output: (nameOfRootManifest, rootManifestChunk)
         # name already has an additional component (that will be dropped for
         # the non-root manifest or data nodes)
 
-        subname = copy.deepcopy(name)
-        subname._components.pop()
+        subname = Name(name.components[:-1])
 
-        # cut content in pieces
-        raw = []
-        while len(data) > 0:
-            raw.append(data[:self.MTU])
-            data = data[self.MTU:]
+        # cut content in pieces, without copying the remaining data
+        view = memoryview(data)
+        chunks = [self._mkContentChunk(subname, view[i:i + self.MTU].tobytes())
+                  for i in range(0, len(data), self.MTU)]
 
         # persist pieces and learn their hash pointers
-        ptrs = []
-        for r in raw:
-            chunk = self._mkContentChunk(subname, r)
-            # print(name)
+        for chunk in chunks:
             self.icn.writeChunk(subname, chunk)
-            h = hashlib.sha256()
-            h.update(chunk)
-            ptrs.append(h.digest())
-            # n = copy.copy(name)
-            # n.__add__([h.digest])
-            # ptrs.append(n.as_bytes())
+        ptrs = self._hashAll(chunks)
 
         # create list of index tables, the M pointers will be added later
         # -> DDDDDDM -> DDDDDM -> ...
         tables = []
-        while len(ptrs) > 0:
-            tbl = b'' # index table
-            while len(ptrs) > 0:
-                # add an entry to the index table
-                e = TlvEncoder()
-                e.writeBlobTlv(NDN_TYPE_MANIFEST_DATAPTR, ptrs[0])
-                e = e.getOutput().tobytes()
-                # collect pointers as long as the manifest fits in a chunk
-                if len(tbl) + len(e) + 100 > self.MTU:
-                    break
-                tbl += e
-                ptrs = ptrs[1:]
+        tbl = [] # entries of the current index table
+        tbl_len = 0
+        for ptr in ptrs:
+            e = _blobTlv(NDN_TYPE_MANIFEST_DATAPTR, ptr)
+            # collect pointers as long as the manifest fits in a chunk
+            if len(tbl) > 0 and tbl_len + len(e) + 100 > self.MTU:
+                tables.append(tbl)
+                tbl = []
+                tbl_len = 0
+            tbl.append(e)
+            tbl_len += len(e)
+        if len(tbl) > 0 or len(tables) == 0:
             tables.append(tbl)
 
         # persist the manifests, start at the end, add the M pointers
         tailPtr = None
-        while len(tables) > 0:
-            tbl = tables[-1]
+        for i in range(len(tables) - 1, -1, -1):
+            tbl = tables[i]
             if tailPtr:
-                e = TlvEncoder()
-                e.writeBlobTlv(self.MANIFEST_MANIFESTPTR, tailPtr)
-                tbl += e.getOutput()
+                tbl.append(_blobTlv(NDN_TYPE_MANIFEST_MANIFESTPTR, tailPtr))
             m = TlvEncoder()
-            m.writeBlobTlv(NDN_TYPE_MANIFEST_INDEXTABLE, tbl)
+            m.writeBlobTlv(NDN_TYPE_MANIFEST_INDEXTABLE, b''.join(tbl))
             m.writeTypeAndLength(NDN_TYPE_MANIFEST, len(m))
-            if len(tables) == 1:
-                subname = name #copy.copy(name)
-                # name.__add__([b'_'])
-            c = Content(subname, m.getOutput())
+            manifest_name = name if i == 0 else subname
+            c = Content(manifest_name, m.getOutput().tobytes())
             chunk = NdnTlvEncoder().encode(c) # and sign
-            self.icn.writeChunk(name, chunk)
-            h = hashlib.sha256()
-            h.update(chunk)
-            tailPtr = h.digest()
-            tables = tables[:-1]
+            self.icn.writeChunk(manifest_name, chunk)
+            tailPtr = _sha256(chunk)
 
         return (name, chunk)
 
@@ -102,58 +106,82 @@ class MkFlic():
 # ----------------------------------------------------------------------
 
 class DeFlic():
+    # window: number of data chunks fetched in parallel
+
+    def __init__(self, icn, decoder=None, window: int=8):
+        self.icn = icn
+        self.decoder = decoder if decoder is not None else NdnTlvEncoder()
+        self.window = window
+
+    def bytesFromManifestName(self, name: Name) -> bytes:
+        return b''.join(self.iterFromName(name))
 
-    def __init__(self, icn, decoder=None):
+    def iterFromName(self, name: Name) -> 'DeFlicIter':
+        return DeFlicIter(self.icn, name, self.decoder, self.window)
+
+# ----------------------------------------------------------------------
+
+class DeFlicIter():
+    # iterates over the re-assembled e2e bytes of a manifest tree, chunk
+    # by chunk: up to window data chunks are read in parallel ahead of
+    # the chunk to be returned next
+
+    def __init__(self, icn, name: Name, decoder=None, window: int=8):
         self.icn = icn
-        self.decoder = decoder
-
-    def _indexTable2data(self, pfx: Name, decoder, end: int):
-        # traverse the manifest tree
-        # input: decoder with index table
-        # output: reassembled data
-        data = b''
-        while decoder._offset < end:
-            if decoder.peekType(NDN_TYPE_MANIFEST_DATAPTR, end):
+        self.name = name
+        self.decoder = decoder if decoder is not None else NdnTlvEncoder()
+        self.window = max(window, 1)
+        self._pfx = Name(name.components[:-1]) # drop the last component (e.g. '_')
+        self._ptrs = self._dataNames()
+        self._pending = collections.deque()
+        self._pool = ThreadPoolExecutor(max_workers=self.window)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        while len(self._pending) < self.window and self._ptrs is not None:
+            try:
+                name = next(self._ptrs)
+            except StopIteration:
+                self._ptrs = None
+                break
+            self._pending.append(self._pool.submit(self.icn.readChunk, name))
+        if len(self._pending) == 0:
+            self.close()
+            raise StopIteration
+        chunk = self._pending.popleft().result()
+        return bytes(self.decoder.decode(chunk).get_bytes())
+
+    def close(self):
+        self._ptrs = None
+        for f in self._pending:
+            f.cancel()
+        self._pending.clear()
+        self._pool.shutdown(wait=False)
+
+    def _manifest(self, chunk: bytes) -> (TlvDecoder, int):
+        content = self.decoder.decode(chunk)
+        decoder = TlvDecoder(content.get_bytes())
+        end = decoder.readNestedTlvsStart(NDN_TYPE_MANIFEST)
+        decoder.readNestedTlvsStart(NDN_TYPE_MANIFEST_INDEXTABLE)
+        return decoder, end
+
+    def _dataNames(self):
+        # traverse the manifest tree (without recursion), yield the names
+        # of the data chunks in order
+        stack = [self._manifest(self.icn.readChunk(self.name))]
+        while len(stack) > 0:
+            decoder, end = stack[-1]
+            if decoder.getOffset() >= end:
+                stack.pop()
+            elif decoder.peekType(NDN_TYPE_MANIFEST_DATAPTR, end):
                 ptr = decoder.readBlobTlv(NDN_TYPE_MANIFEST_DATAPTR)
-                # print("data ptr %s" % binascii.hexlify(ptr))
-                name = copy.copy(pfx).setDigest(ptr)
-                # print(name.to_json())
-                chunk = self.icn.readChunk(name)
-                data += NdnTlvEncoder().decode(chunk).get_bytes()
+                yield Name(self._pfx.components).setDigest(bytes(ptr))
             elif decoder.peekType(NDN_TYPE_MANIFEST_MANIFESTPTR, end):
                 ptr = decoder.readBlobTlv(NDN_TYPE_MANIFEST_MANIFESTPTR)
-                # print("manifest ptr %s" % binascii.hexlify(ptr))
-                name = copy.copy(pfx).setDigest(ptr)
-                chunk = self.icn.readChunk(name)
-                content = NdnTlvEncoder().decode(chunk)
-                data += self._manifestToBytes(content.get_bytes())
+                name = Name(self._pfx.components).setDigest(bytes(ptr))
+                stack.append(self._manifest(self.icn.readChunk(name)))
             else:
                 print("invalid index table entry")
-                return data
-        return data
-
-    def _manifestToBytes(self, pfx: Name, manifest: bytes):
-        # input: manifest (only the payload of the chunk)
-        # output: re-assembled raw e2e bytes
-        decoder = TlvDecoder(manifest)
-        # print("manifestToBytes: %d bytes" % len(decoder._input))
-        end = decoder.readNestedTlvsStart(NDN_TYPE_MANIFEST)
-        decoder.readNestedTlvsStart(NDN_TYPE_MANIFEST_INDEXTABLE)
-        data = self._indexTable2data(pfx, decoder, end)
-        decoder.finishNestedTlvs(end)
-        return data
-
-    def bytesFromManifestName(self, name: Name):
-        chunk = self.icn.readChunk(name)
-        content = NdnTlvEncoder().decode(chunk)
-        name._components.pop() # drop the last component (e.g. '_')
-        return self._manifestToBytes(name, content.get_bytes())
-
-    # TODO:
-    # def iterFromName(self, name):
-    #    return DeFLIC_ITER(...)
-
-# class DeFLIC_ITER():
-#
-#     def __init__(self):
-#         pass
+                stack.pop()
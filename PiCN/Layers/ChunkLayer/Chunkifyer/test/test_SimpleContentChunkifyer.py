@@ -125,6 +125,21 @@ class test_SimpleContentChunkifyer(unittest.TestCase):
         reassembled_content = self.chunkifyer.reassamble_data(md[0].name, chunked_content)
         self.assertEqual(content, reassembled_content)
 
+    def test_chunk_binary_data_offsets(self):
+        """Test chunking binary data and the offsets of the chunks in the reassembled data"""
+        name = Name("/test/data")
+        data = bytes(range(256)) * 40
+        md, chunked_content = self.chunkifyer.chunk_data(Content(name, data))
+
+        self.assertTrue(md[0].content.startswith("mdo:10240:"))
+        self.assertEqual(3, len(chunked_content))
+        self.assertEqual(data, self.chunkifyer.reassamble_data(name, chunked_content).get_bytes())
+        for i, chunk in enumerate(chunked_content):
+            self.assertEqual(i, self.chunkifyer.chunk_index(chunk.name))
+            offset = self.chunkifyer.chunk_offset(chunk.name, len(chunk.get_bytes()), len(data),
+                                                  chunked_content[-1].name)
+            self.assertEqual(data[offset:offset + len(chunk.get_bytes())], chunk.get_bytes())
+
 
     def test_parse_metadata_next(self):
         """Test parse metadata with next metadata"""
@@ -0,0 +1,58 @@
+"""Test for the FLIC producer and consumer"""
+
+import hashlib
+import unittest
+
+from PiCN.Layers.ChunkLayer.Chunkifyer.flic import MkFlic, DeFlic
+from PiCN.Packets import Name
+
+
+class ChunkStore(object):
+    """in-memory chunk store, chunks are found by the digest of a name or by the name of a root manifest"""
+
+    def __init__(self):
+        self.by_digest = {}
+        self.by_name = {}
+
+    def writeChunk(self, name: Name, chunk: bytes):
+        self.by_digest[hashlib.sha256(chunk).digest()] = chunk
+        self.by_name[name.to_string()] = chunk
+
+    def readChunk(self, name: Name) -> bytes:
+        if name.digest is not None:
+            return self.by_digest[name.digest]
+        return self.by_name[name.to_string()]
+
+
+class test_flic(unittest.TestCase):
+
+    def setUp(self):
+        self.icn = ChunkStore()
+        self.name = Name("/test/data/_")
+        self.data = bytes(range(256)) * 100
+
+    def test_manifest_round_trip(self):
+        """Test creating a manifest tree with several manifests and reassembling the data"""
+        root_name, root = MkFlic(self.icn, MTU=400).bytesToManifest(self.name, self.data)
+        self.assertEqual(self.name, root_name)
+        self.assertEqual(self.data, DeFlic(self.icn).bytesFromManifestName(Name("/test/data/_")))
+
+    def test_hash_threads(self):
+        """Test that hashing in a thread pool creates the same manifest"""
+        _, root1 = MkFlic(ChunkStore(), MTU=400).bytesToManifest(self.name, self.data)
+        _, root2 = MkFlic(self.icn, MTU=400, hash_threads=4).bytesToManifest(self.name, self.data)
+        self.assertEqual(root1, root2)
+
+    def test_iterator_yields_chunks_in_order(self):
+        """Test that the iterator yields the data chunk by chunk in order, for different windows"""
+        MkFlic(self.icn, MTU=400).bytesToManifest(self.name, self.data)
+        for window in [1, 4, 64]:
+            parts = list(DeFlic(self.icn, window=window).iterFromName(self.name))
+            self.assertEqual(len(parts), (len(self.data) + 399) // 400)
+            self.assertTrue(all(len(p) == 400 for p in parts[:-1]))
+            self.assertEqual(self.data, b"".join(parts))
+
+    def test_empty_data(self):
+        """Test a manifest of empty data"""
+        MkFlic(self.icn).bytesToManifest(self.name, b"")
+        self.assertEqual([], list(DeFlic(self.icn).iterFromName(self.name)))
@@ -10,6 +10,7 @@ from PiCN.Layers.ChunkLayer import BasicChunkLayer
 from PiCN.Layers.ChunkLayer import RequestTableEntry
 
 from PiCN.Layers.ChunkLayer.Chunkifyer import SimpleContentChunkifyer
+from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder
 from PiCN.Packets import Content, Interest, Name, Nack, NackReason
 
 
@@ -38,12 +39,10 @@ class test_BasicChunkLayer(unittest.TestCase):
 
     def test_name_in_chunktable(self):
         """Test if the helper to find a name in the chunktable works"""
-        self.chunkLayer.start_process()
-
         n1 = Name("/test/data")
         n2 = Name("/data/test")
-        self.chunkLayer._request_table.append(RequestTableEntry(n1))
-        self.chunkLayer._request_table.append(RequestTableEntry(n2))
+        self.chunkLayer.add_request_table_entry(RequestTableEntry(n1))
+        self.chunkLayer.add_request_table_entry(RequestTableEntry(n2))
 
         result2 = self.chunkLayer.get_request_table_entry(n2)
         result1 = self.chunkLayer.get_request_table_entry(n1)
@@ -53,18 +52,8 @@ class test_BasicChunkLayer(unittest.TestCase):
 
     def test_get_chunkname_list_from_chunk_table(self):
         """Test if the helper to get a list of chunknames works"""
-        self.chunkLayer.start_process()
-
-        n1 = Name("/test/data")
-        n2 = Name("/data/test")
-        rte1 = RequestTableEntry(n1)
-        rte2 = RequestTableEntry(n2)
-
-        rte1.requested_chunks = [Name("/test/data/c0"), Name("/test/data/c1"), Name("/test/data/c2")]
-        rte2.requested_chunks = [Name("/data/test/c0"), Name("/data/test/c1"), Name("/data/test/c2")]
-
-        self.chunkLayer._request_table.append(rte1)
-        self.chunkLayer._request_table.append(rte2)
+        names1 = [Name("/test/data/c0"), Name("/test/data/c1"), Name("/test/data/c2")]
+        names2 = [Name("/data/test/c0"), Name("/data/test/c1"), Name("/data/test/c2")]
 
         c1 = Content("/test/data/c0", "tdc0")
         c2 = Content("/test/data/c1", "tdc1")
@@ -75,17 +64,11 @@ class test_BasicChunkLayer(unittest.TestCase):
         c6 = Content("/data/test/c2", "dtc2")
 
 
-        self.chunkLayer._chunk_table[c1.name] = (c1, time.time())
-        self.chunkLayer._chunk_table[c2.name] = (c2, time.time())
-        self.chunkLayer._chunk_table[c3.name] = (c3, time.time())
-
-        self.chunkLayer._chunk_table[c4.name] = (c4, time.time())
-        self.chunkLayer._chunk_table[c5.name] = (c5, time.time())
-        self.chunkLayer._chunk_table[c6.name] = (c6, time.time())
-
+        for c in [c1, c2, c3, c4, c5, c6]:
+            self.chunkLayer.add_to_chunk_table(c)
 
-        chunks1 = self.chunkLayer.get_chunk_list_from_chunk_table(rte1.requested_chunks)
-        chunks2 = self.chunkLayer.get_chunk_list_from_chunk_table(rte2.requested_chunks)
+        chunks1 = self.chunkLayer.get_chunk_list_from_chunk_table(names1)
+        chunks2 = self.chunkLayer.get_chunk_list_from_chunk_table(names2)
 
         compdata1 = [c1, c2, c3]
         compdata2 = [c4, c5, c6]
@@ -96,19 +79,17 @@ class test_BasicChunkLayer(unittest.TestCase):
 
     def test_chunk_name_in_chunk_table(self):
         """Test the chunk requeted and remove"""
-        self.chunkLayer.start_process()
-
         n1 = Name("/test/data")
         n2 = Name("/data/test")
 
         rte1 = RequestTableEntry(n1)
         rte2 = RequestTableEntry(n2)
 
-        rte1.requested_chunks = [Name("/test/data/c0"), Name("/test/data/c1"), Name("/test/data/c2")]
-        rte2.requested_chunks = [Name("/data/test/c0"), Name("/data/test/c1"), Name("/data/test/c2")]
+        rte1.requested_chunks = {Name("/test/data/c0"), Name("/test/data/c1"), Name("/test/data/c2")}
+        rte2.requested_chunks = {Name("/data/test/c0"), Name("/data/test/c1"), Name("/data/test/c2")}
 
-        self.chunkLayer._request_table.append(rte1)
-        self.chunkLayer._request_table.append(rte2)
+        self.chunkLayer.add_request_table_entry(rte1)
+        self.chunkLayer.add_request_table_entry(rte2)
 
         entry1 = self.chunkLayer.chunk_name_in_request_table(Name("/test/data/c1"))
         entry2 = self.chunkLayer.chunk_name_in_request_table(Name("/test/data/c4"))
@@ -118,29 +99,27 @@ class test_BasicChunkLayer(unittest.TestCase):
         self.assertFalse(entry2)
         self.assertTrue(entry3)
         rt_entry = self.chunkLayer.get_request_table_entry(Name("/test/data/c1"))
-        self.chunkLayer._request_table.remove(rt_entry)
-        rt_entry = self.chunkLayer.remove_chunk_name_from_request_table_entry(rt_entry, Name("/test/data/c1"))
-        self.chunkLayer._request_table.append(rt_entry)
+        self.assertIs(rt_entry, rte1)
+        self.chunkLayer.remove_chunk_name_from_request_table_entry(rt_entry, Name("/test/data/c1"))
 
         entry4 = self.chunkLayer.chunk_name_in_request_table(Name("/test/data/c1"))
         self.assertFalse(entry4)
+        self.assertIsNone(self.chunkLayer.get_request_table_entry(Name("/test/data/c1")))
 
     def test_metadata_name_in_chunk_table(self):
         """Test the metadata requeted and remove"""
         """Test the chunk requeted and remove"""
-        self.chunkLayer.start_process()
-
         n1 = Name("/test/data")
         n2 = Name("/data/test")
 
         rte1 = RequestTableEntry(n1)
         rte2 = RequestTableEntry(n2)
 
-        rte1.requested_md = [Name("/test/data/m0"), Name("/test/data/m1"), Name("/test/data/m2")]
-        rte2.requested_md = [Name("/data/test/m0"), Name("/data/test/m1"), Name("/data/test/m2")]
+        rte1.requested_md = {Name("/test/data/m0"), Name("/test/data/m1"), Name("/test/data/m2")}
+        rte2.requested_md = {Name("/data/test/m0"), Name("/data/test/m1"), Name("/data/test/m2")}
 
-        self.chunkLayer._request_table.append(rte1)
-        self.chunkLayer._request_table.append(rte2)
+        self.chunkLayer.add_request_table_entry(rte1)
+        self.chunkLayer.add_request_table_entry(rte2)
 
         entry1 = self.chunkLayer.metadata_name_in_request_table(Name("/test/data/m1"))
         entry2 = self.chunkLayer.metadata_name_in_request_table(Name("/test/data/m4"))
@@ -151,16 +130,14 @@ class test_BasicChunkLayer(unittest.TestCase):
         self.assertTrue(entry3)
 
         rt_entry = self.chunkLayer.get_request_table_entry(Name("/test/data/m1"))
-        self.chunkLayer._request_table.remove(rt_entry)
-        rt_entry = self.chunkLayer.remove_metadata_name_from_request_table(rt_entry, Name("/test/data/m1"))
-        self.chunkLayer._request_table.append(rt_entry)
+        self.assertIs(rt_entry, rte1)
+        self.chunkLayer.remove_metadata_name_from_request_table(rt_entry, Name("/test/data/m1"))
 
         entry4 = self.chunkLayer.metadata_name_in_request_table(Name("/test/data/m1"))
         self.assertFalse(entry4)
 
     def test_handle_received_meta_data(self):
         """test if received meta data are handled correctly"""
-        self.chunkLayer.start_process()
         md1_n = Name("/test/data")
         md1 = Content(md1_n, "mdo:300:/test/data/c0;/test/data/c1;/test/data/c2;/test/data/c3:/test/data/m1")
         md2_n = Name("/test/data/m1")
@@ -170,10 +147,10 @@ class test_BasicChunkLayer(unittest.TestCase):
 
         request_table_entry = self.chunkLayer.handle_received_meta_data(0, md1, request_table_entry, self.q1_to_lower)
 
-        self.assertEqual(request_table_entry.requested_md[0], Name("/test/data/m1"))
+        self.assertEqual(request_table_entry.requested_md, {Name("/test/data/m1")})
         chunknames =  [Name("/test/data/c0"), Name("/test/data/c1"), Name("/test/data/c2"), Name("/test/data/c3"),
                        Name("/test/data/c4")]
-        self.assertEqual(request_table_entry.requested_chunks, chunknames[:4])
+        self.assertEqual(request_table_entry.requested_chunks, set(chunknames[:4]))
 
         d1 = self.q1_to_lower.get()[1]
         self.assertEqual(d1.name, Name("/test/data/m1"))
@@ -185,7 +162,7 @@ class test_BasicChunkLayer(unittest.TestCase):
         request_table_entry = self.chunkLayer.handle_received_meta_data(0, md2, request_table_entry, self.q1_to_lower)
         self.assertEqual(len(request_table_entry.requested_md), 0)
         self.assertEqual(len(request_table_entry.requested_chunks), 5)
-        self.assertEqual(request_table_entry.requested_chunks, chunknames)
+        self.assertEqual(request_table_entry.requested_chunks, set(chunknames))
         try:
             d3 = self.q1_to_lower.get(timeout=2.0)[1]
         except:
@@ -195,23 +172,23 @@ class test_BasicChunkLayer(unittest.TestCase):
 
     def test_handle_received_chunk_data(self):
         """test if received chunk data are handled correctly"""
-        self.chunkLayer.start_process()
-
         n1 = Name("/test/data")
         chunk1_n = Name("/test/data/c0")
         chunk2_n = Name("/test/data/c1")
 
         request_table_entry = RequestTableEntry(n1)
         request_table_entry.chunked = True
+        request_table_entry.content_size = 12
 
-        request_table_entry.requested_chunks.append(chunk1_n)
-        request_table_entry.requested_chunks.append(chunk2_n)
+        request_table_entry.requested_chunks.add(chunk1_n)
+        request_table_entry.requested_chunks.add(chunk2_n)
+        self.chunkLayer.add_request_table_entry(request_table_entry)
 
         chunk1 = Content(chunk1_n, "chunk1")
         chunk2 = Content(chunk2_n, "chunk2")
 
         request_table_entry = self.chunkLayer.handle_received_chunk_data(0, chunk1, request_table_entry, self.q1_to_higher)
-        self.assertEqual(request_table_entry.requested_chunks, [chunk2_n])
+        self.assertEqual(request_table_entry.requested_chunks, {chunk2_n})
 
         request_table_entry = self.chunkLayer.handle_received_chunk_data(0, chunk2, request_table_entry, self.q1_to_higher)
         self.assertEqual(request_table_entry, None)
@@ -224,6 +201,129 @@ class test_BasicChunkLayer(unittest.TestCase):
         self.assertEqual(len(self.chunkLayer._request_table), 0)
 
 
+    def test_window_limits_outstanding_chunks(self):
+        """test that only window chunk interests are outstanding and the window grows with received chunks"""
+        self.chunkLayer.initial_window = 2
+        md1_n = Name("/test/data")
+        md1 = Content(md1_n, "mdo:300:/test/data/c0;/test/data/c1;/test/data/c2;/test/data/c3:/test/data/m1")
+        chunknames = [Name("/test/data/c" + str(i)) for i in range(4)]
+
+        request_table_entry = self.chunkLayer.handle_received_meta_data(0, md1, RequestTableEntry(md1_n),
+                                                                        self.q1_to_lower)
+        self.assertEqual(chunknames[:2], [self.q1_to_lower.get(timeout=2.0)[1].name for i in range(2)])
+        self.assertEqual(request_table_entry.requested_chunks, set(chunknames[:2]))
+        self.assertEqual(list(request_table_entry.pending_chunks), chunknames[2:])
+        self.assertTrue(self.q1_to_lower.empty()) #enough chunk names pending to fill the window, no metadata prefetch
+
+        request_table_entry = self.chunkLayer.handle_received_chunk_data(0, Content(chunknames[0], "chunk0"),
+                                                                         request_table_entry, self.q1_to_higher,
+                                                                         self.q1_to_lower)
+        self.assertEqual(request_table_entry.window, 3.0)
+        self.assertEqual([Name("/test/data/m1")] + chunknames[2:],
+                         [self.q1_to_lower.get(timeout=2.0)[1].name for i in range(3)])
+        self.assertEqual(request_table_entry.requested_chunks, set(chunknames[1:]))
+        self.assertEqual(list(request_table_entry.pending_chunks), [])
+        self.assertTrue(self.q1_to_higher.empty())
+
+    def test_prefetch_metadata(self):
+        """test that metadata objects are prefetched by their names until enough chunk names are pending to fill the
+        window, and not beyond the last metadata object"""
+        self.chunkLayer.initial_window = 16
+        name = Name("/test/data")
+        data = b"A" * 4096 * 40
+        md, chunks = self.chunkifyer.chunk_data(Content(name, data))
+        self.chunkLayer.add_request_table_entry(RequestTableEntry(name))
+        to_lower = Queue()
+
+        self.chunkLayer.data_from_lower(to_lower, self.q1_to_higher, [0, md[0]])
+        self.assertEqual([md[1].name] + [c.name for c in chunks[:4]],
+                         [to_lower.get(timeout=2.0)[1].name for i in range(5)])
+        self.assertTrue(to_lower.empty())
+
+        self.chunkLayer.data_from_lower(to_lower, self.q1_to_higher, [0, chunks[0]]) #content has 10 md objects
+        self.assertEqual([m.name for m in md[2:6]], [to_lower.get(timeout=2.0)[1].name for i in range(4)])
+        self.assertTrue(to_lower.empty())
+
+        objects = {p.name: p for p in md + chunks}
+        outstanding = [m.name for m in md[1:6]] + [c.name for c in chunks[1:4]]
+        requested = []
+        while len(outstanding) > 0: #answer the interests in the order they were sent
+            self.chunkLayer.data_from_lower(to_lower, self.q1_to_higher, [0, objects[outstanding.pop(0)]])
+            while not to_lower.empty():
+                outstanding.append(to_lower.get()[1].name)
+                requested.append(outstanding[-1])
+        self.assertEqual(data, self.q1_to_higher.get(timeout=2.0)[1].get_bytes())
+        self.assertIsNone(self.chunkLayer.get_request_table_entry(name))
+        self.assertEqual([m.name for m in md[6:]], [n for n in requested if n in set(m.name for m in md)])
+
+    def test_pending_chunks_in_order(self):
+        """test that chunks of metadata objects received out of order are pending in chunk order"""
+        name = Name("/test/data")
+        md, chunks = self.chunkifyer.chunk_data(Content(name, b"A" * 4096 * 12))
+        request_table_entry = RequestTableEntry(name)
+        request_table_entry.chunked = True
+        request_table_entry.window = 1.0
+        request_table_entry.ssthresh = 1.0
+        request_table_entry.requested_chunks = {chunks[0].name}
+        request_table_entry.requested_md = {md[1].name, md[2].name}
+        request_table_entry.next_md = 3
+        self.chunkLayer.add_request_table_entry(request_table_entry)
+
+        self.chunkLayer.handle_received_meta_data(0, md[2], request_table_entry, self.q1_to_lower)
+        self.chunkLayer.handle_received_meta_data(0, md[1], request_table_entry, self.q1_to_lower)
+        self.assertEqual([c.name for c in chunks[4:]], list(request_table_entry.pending_chunks))
+        self.assertTrue(self.q1_to_lower.empty())
+
+    def test_streaming_limits_buffered_chunks(self):
+        """test that a streaming request only requests chunks within the window after the next chunk to deliver"""
+        self.chunkLayer.initial_window = 4
+        name = Name("/test/data")
+        data = b"A" * 4096 * 12
+        md, chunks = self.chunkifyer.chunk_data(Content(name, data))
+        self.chunkLayer.data_from_higher(self.q1_to_lower, self.q1_to_higher, [0, Interest(name), True])
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, md[0]])
+        for c in chunks[1:4]:
+            self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, c])
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, md[1]])
+        request_table_entry = self.chunkLayer.get_request_table_entry(name)
+        self.assertEqual(7.0, request_table_entry.window)
+        self.assertEqual({c.name for c in [chunks[0]] + chunks[4:7]}, request_table_entry.requested_chunks)
+        self.assertEqual(3, len(request_table_entry.stream_segments)) #head of line chunk is missing
+
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, chunks[0]])
+        self.assertEqual([0, Content(name, data[:4096 * 4]), False], self.q1_to_higher.get(timeout=2.0))
+        self.assertEqual({c.name for c in chunks[4:8]}, request_table_entry.requested_chunks)
+
+    def test_retransmission_timeout(self):
+        """test that timed out chunk interests are retransmitted, the window is halved and the request fails after
+        max_retransmissions"""
+        self.chunkLayer = BasicChunkLayer(self.chunkifyer, initial_window=4, initial_rto=0.1, max_retransmissions=1)
+        n1 = Name("/test/data")
+        chunk_n = Name("/test/data/c0")
+        request_table_entry = RequestTableEntry(n1)
+        request_table_entry.chunked = True
+        request_table_entry.faceid = 3
+        request_table_entry.pending_chunks.append(chunk_n)
+        self.chunkLayer.add_request_table_entry(request_table_entry)
+        self.chunkLayer.fill_window(request_table_entry, self.q1_to_lower)
+        self.assertEqual([3, Interest(chunk_n)], self.q1_to_lower.get(timeout=2.0))
+
+        self.chunkLayer.check_timeouts(self.q1_to_lower, self.q1_to_higher)
+        self.assertTrue(self.q1_to_lower.empty())
+        time.sleep(0.15)
+        self.chunkLayer.check_timeouts(self.q1_to_lower, self.q1_to_higher)
+        self.assertEqual([3, Interest(chunk_n)], self.q1_to_lower.get(timeout=2.0))
+        request_table_entry = self.chunkLayer.get_request_table_entry(n1)
+        self.assertEqual(request_table_entry.window, 2.0)
+        self.assertEqual(request_table_entry.retransmissions[chunk_n], 1)
+
+        time.sleep(0.25)
+        self.chunkLayer.check_timeouts(self.q1_to_lower, self.q1_to_higher)
+        faceid, nack = self.q1_to_higher.get(timeout=2.0)
+        self.assertEqual(3, faceid)
+        self.assertEqual(Nack(n1, NackReason.PIT_TIMEOUT, Interest(n1)), nack)
+        self.assertIsNone(self.chunkLayer.get_request_table_entry(n1))
+
     def test_interest_from_lower_no_match(self):
         """Test handling interest from lower with no chunk entry"""
         self.chunkLayer.start_process()
@@ -237,12 +337,11 @@ class test_BasicChunkLayer(unittest.TestCase):
 
     def test_interest_from_lower_match(self):
         """Test handling interest from lower with chunk entry"""
-        self.chunkLayer.start_process()
         n = Name("/test/data/c0")
         i = Interest(n)
         c = Content(n, "dataobject")
-        self.chunkLayer._chunk_table[c.name] = (c, time.time())
-        self.chunkLayer.queue_from_lower.put([0, i])
+        self.chunkLayer.add_to_chunk_table(c)
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, i])
         try:
             data = self.chunkLayer.queue_to_lower.get(timeout=2.0)
         except:
@@ -251,27 +350,26 @@ class test_BasicChunkLayer(unittest.TestCase):
 
     def test_interest_from_higher_no_entry(self):
         """Test handling interest from higher with no request entry"""
-        self.chunkLayer.start_process()
         i = Interest("/test/data")
-        self.chunkLayer.queue_from_higher.put([0, i])
+        self.chunkLayer.data_from_higher(self.q1_to_lower, self.q1_to_higher, [0, i])
         try:
             data = self.chunkLayer.queue_to_lower.get(timeout=2.0)
         except:
             self.fail()
         self.assertEqual(i, data[1])
-        self.assertEqual(self.chunkLayer._request_table[0], RequestTableEntry(i.name))
+        self.assertEqual(self.chunkLayer.get_request_table_entry(i.name), RequestTableEntry(i.name))
 
     def test_interest_from_higher_entry(self):
         """Test handling interest from higher with request entry"""
-        self.chunkLayer.start_process()
         i = Interest("/test/data")
-        self.chunkLayer._request_table.append(RequestTableEntry(i.name))
-        self.chunkLayer.queue_from_higher.put([0, i])
-        time.sleep(1)
-        res = self.chunkLayer.queue_to_lower.get()
+        request_table_entry = RequestTableEntry(i.name)
+        self.chunkLayer.add_request_table_entry(request_table_entry)
+        self.chunkLayer.data_from_higher(self.q1_to_lower, self.q1_to_higher, [0, i])
+        res = self.chunkLayer.queue_to_lower.get(timeout=2.0)
         self.assertEqual(res[1], i)
         self.assertTrue(self.chunkLayer.queue_to_lower.empty())
-        self.assertEqual(self.chunkLayer._request_table[0], RequestTableEntry(i.name))
+        self.assertEqual(len(self.chunkLayer._request_table), 1)
+        self.assertIs(self.chunkLayer.get_request_table_entry(i.name), request_table_entry)
 
     def test_content_from_higher_no_chunk(self):
         """Test handling content from higher"""
@@ -297,6 +395,21 @@ class test_BasicChunkLayer(unittest.TestCase):
         md = Content("/test/data", "mdo:4296:/test/data/c0;/test/data/c1:")
         self.assertEqual(data[1], md)
 
+    def test_content_from_higher_presigned_once(self):
+        """Test that content requested again while its chunks are in the chunk table is not chunked and signed again"""
+        self.chunkLayer._encoder = NdnTlvEncoder()
+        signed = []
+        presign = self.chunkLayer.presign
+        self.chunkLayer.presign = lambda packets: signed.append(packets) or presign(packets)
+        c = Content("/test/data", "A" * 4096 + "B" * 200)
+        for i in range(2):
+            self.chunkLayer.data_from_higher(self.q1_to_lower, self.q1_to_higher, [i, c])
+        md1 = self.q1_to_lower.get(timeout=2.0)[1]
+        md2 = self.q1_to_lower.get(timeout=2.0)[1]
+        self.assertEqual(md1, md2)
+        self.assertEqual(md1.wire_format, md2.wire_format)
+        self.assertEqual(1, len(signed))
+
     def test_content_from_lower_no_request_table_entry(self):
         """Test handling content from lower when there is no request table entry"""
         self.chunkLayer.start_process()
@@ -306,47 +419,51 @@ class test_BasicChunkLayer(unittest.TestCase):
 
     def test_content_from_lower_layer(self):
         """Test handling content from lower"""
-        self.chunkLayer.start_process()
         n1 = Name("/test/data")
-        self.chunkLayer._request_table.append(RequestTableEntry(n1))
+        self.chunkLayer.add_request_table_entry(RequestTableEntry(n1))
         c1 = Content(n1, "data")
-        self.chunkLayer.queue_from_lower.put([0, c1])
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, c1])
         try:
-            data = self.chunkLayer.queue_to_higher.get()
+            data = self.chunkLayer.queue_to_higher.get(timeout=2.0)
         except:
             self.fail()
         self.assertEqual(data[1], c1)
+        self.assertIsNone(self.chunkLayer.get_request_table_entry(n1))
 
 
     def test_metadata_from_lower_layer(self):
         """test receiving metadata from lower layer"""
-        self.chunkLayer.start_process()
         md1_n = Name("/test/data")
         md1 = Content(md1_n, "mdo:300:/test/data/c0;/test/data/c1;/test/data/c2;/test/data/c3:/test/data/m1")
         md2_n = Name("/test/data/m1")
         md2 = Content(md2_n, "mdo:300:/test/data/c4:")
 
-        self.chunkLayer._request_table.append(RequestTableEntry(md1_n))
+        self.chunkLayer.add_request_table_entry(RequestTableEntry(md1_n))
 
-        self.chunkLayer.queue_from_lower.put([0, md1])
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, md1])
 
-        data = self.chunkLayer.queue_to_lower.get()
+        data = self.chunkLayer.queue_to_lower.get(timeout=2.0)
         self.assertEqual(Interest(md2_n), data[1])
 
         chunknames = [Name("/test/data/c0"), Name("/test/data/c1"), Name("/test/data/c2"), Name("/test/data/c3"),
                       Name("/test/data/c4")]
 
         for i in range(0,4):
-            data = self.chunkLayer.queue_to_lower.get()
+            data = self.chunkLayer.queue_to_lower.get(timeout=2.0)
             self.assertEqual(Interest(chunknames[i]), data[1])
 
         self.assertTrue(self.chunkLayer.queue_to_lower.empty())
 
         request: RequestTableEntry = self.chunkLayer.get_request_table_entry(md1_n)
-        self.assertEqual(request.requested_chunks, chunknames[:4])
-        self.assertEqual(request.requested_md[0], md2_n)
+        self.assertEqual(request.requested_chunks, set(chunknames[:4]))
+        self.assertEqual(request.requested_md, {md2_n})
+        self.assertIs(self.chunkLayer.get_request_table_entry(md2_n), request)
+        self.assertIs(self.chunkLayer.get_request_table_entry(chunknames[2]), request)
 
-        self.chunkLayer.queue_from_lower.put([0, md2])
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, md1]) #duplicate is ignored
+        self.assertTrue(self.chunkLayer.queue_to_lower.empty())
+
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, md2])
         try:
             data = self.chunkLayer.queue_to_lower.get(timeout=2.0)
         except:
@@ -354,21 +471,19 @@ class test_BasicChunkLayer(unittest.TestCase):
         self.assertEqual(data[1], Interest(chunknames[4]))
         self.assertTrue(self.chunkLayer.queue_to_lower.empty())
 
-        time.sleep(1)
-
         request: RequestTableEntry = self.chunkLayer.get_request_table_entry(md1_n)
 
         self.assertEqual(len(request.requested_md), 0)
         self.assertEqual(len(request.requested_chunks), 5)
-        self.assertEqual(request.requested_chunks, chunknames)
+        self.assertEqual(request.requested_chunks, set(chunknames))
+        self.assertIsNone(self.chunkLayer.get_request_table_entry(md2_n))
 
     def test_chunk_from_lower_layer(self):
         """test receiving metadata from lower layer"""
-        self.chunkLayer.start_process()
-
         n1 = Name("/test/data")
         re1 = RequestTableEntry(n1)
         re1.chunked = True
+        re1.content_size = 12
 
         chunk1_n = Name("/test/data/c0")
         chunk2_n = Name("/test/data/c1")
@@ -376,16 +491,16 @@ class test_BasicChunkLayer(unittest.TestCase):
         chunk1 = Content(chunk1_n, "chunk1")
         chunk2 = Content(chunk2_n, "chunk2")
 
-        re1.requested_chunks.append(chunk1_n)
-        re1.requested_chunks.append(chunk2_n)
+        re1.requested_chunks.add(chunk1_n)
+        re1.requested_chunks.add(chunk2_n)
 
-        self.chunkLayer._request_table.append(re1)
+        self.chunkLayer.add_request_table_entry(re1)
 
-        self.chunkLayer.queue_from_lower.put([0, chunk2])
-        time.sleep(1)
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, chunk2])
         self.assertTrue(self.chunkLayer.queue_to_higher.empty())
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, chunk2]) #duplicate is ignored
 
-        self.chunkLayer.queue_from_lower.put([0, chunk1])
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, chunk1])
 
         try:
             data = self.chunkLayer.queue_to_higher.get(timeout=2.0)
@@ -393,6 +508,65 @@ class test_BasicChunkLayer(unittest.TestCase):
             self.fail()
 
         self.assertEqual(data[1].content, "chunk1chunk2")
+        self.assertEqual(len(self.chunkLayer._request_table), 0)
+        self.assertEqual(len(self.chunkLayer._outstanding_names), 0)
+
+    def test_reassemble_binary_chunks_out_of_order(self):
+        """test that binary chunks are written to their offsets in any order"""
+        name = Name("/test/data")
+        data = bytes(range(256)) * 64
+        md, chunks = self.chunkifyer.chunk_data(Content(name, data))
+        self.chunkLayer.add_request_table_entry(RequestTableEntry(name))
+
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, md[0]])
+        for m in md[1:]:
+            self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, m])
+        for c in reversed(chunks):
+            self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, c])
+
+        content = self.q1_to_higher.get(timeout=2.0)[1]
+        self.assertEqual(name, content.name)
+        self.assertEqual(data, content.get_bytes())
+        self.assertIsNone(self.chunkLayer.get_request_table_entry(name))
+
+    def test_streaming_delivers_contiguous_chunks(self):
+        """test that a streaming request delivers chunks in order as soon as they are contiguous"""
+        name = Name("/test/data")
+        data = b"A" * 4096 + b"B" * 4096 + b"C" * 4096 + b"D" * 100
+        md, chunks = self.chunkifyer.chunk_data(Content(name, data))
+        self.chunkLayer.data_from_higher(self.q1_to_lower, self.q1_to_higher, [0, Interest(name), True])
+        self.assertTrue(self.chunkLayer.get_request_table_entry(name).streaming)
+
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, md[0]])
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, chunks[1]])
+        self.assertTrue(self.q1_to_higher.empty())
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, chunks[0]])
+        self.assertEqual([0, Content(name, data[:8192]), False], self.q1_to_higher.get(timeout=2.0))
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, chunks[3]])
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, chunks[2]])
+        self.assertEqual([0, Content(name, data[8192:]), True], self.q1_to_higher.get(timeout=2.0))
+        self.assertIsNone(self.chunkLayer.get_request_table_entry(name))
+        self.assertIsNone(self.chunkLayer.get_from_chunk_table(chunks[0].name))
+
+    def test_chunk_table_eviction(self):
+        """test that the chunk table evicts the least recently used entries and entries older than the ttl"""
+        self.chunkLayer.max_chunk_table_entries = 2
+        self.chunkLayer.chunk_table_ttl = 0.2
+        c = [Content("/test/data/c" + str(i), "chunk" + str(i)) for i in range(3)]
+        self.chunkLayer.add_to_chunk_table(c[0])
+        self.chunkLayer.add_to_chunk_table(c[1])
+        self.assertEqual(c[0], self.chunkLayer.get_from_chunk_table(c[0].name))
+        self.chunkLayer.add_to_chunk_table(c[2])
+        self.assertIsNone(self.chunkLayer.get_from_chunk_table(c[1].name))
+        self.assertEqual(c[0], self.chunkLayer.get_from_chunk_table(c[0].name))
+
+        time.sleep(0.1)
+        self.assertEqual(c[2], self.chunkLayer.get_from_chunk_table(c[2].name))
+        time.sleep(0.15)
+        self.chunkLayer.expire_chunk_table()
+        self.assertEqual([c[2].name], list(self.chunkLayer._chunk_table.keys()))
+        time.sleep(0.1)
+        self.assertIsNone(self.chunkLayer.get_from_chunk_table(c[2].name))
 
     def test_nack_from_higher(self):
         """Test nack from higher"""
@@ -0,0 +1,162 @@
+"""NDNLPv2 fragmentation and reassembly of packets exceeding the link MTU"""
+
+import multiprocessing
+import os
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from PiCN.Layers.LinkLayer.Interfaces import BaseInterface
+from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvCodec
+from PiCN.Processes import LayerProcess
+
+
+class NdnLpReassemblyEntry(object):
+    """Fragments of a packet received so far"""
+
+    __slots__ = ('deadline', 'frag_count', 'fragments', 'received', 'size')
+
+    def __init__(self, deadline: float, frag_count: int):
+        self.deadline = deadline
+        self.frag_count = frag_count
+        self.fragments: List[Optional[bytes]] = [None] * frag_count
+        self.received = 0
+        self.size = 0
+
+
+class NdnLpFragmentationLayer(LayerProcess):
+    """
+    NDNLPv2 fragmentation and reassembly of packets exceeding the link MTU, placed between the packet encoding layer and
+    the link layer. Queue elements are [faceid, wire format] in both directions.
+    Packets larger than the MTU are split into LpPackets with consecutive sequence numbers, FragIndex and FragCount.
+    Smaller packets are passed through unchanged, so the layer is transparent for peers that do not fragment. Fragments
+    are reassembled per face in a buffer bounded by the number of incomplete packets and their size; incomplete packets
+    are dropped after the reassembly timeout or when the buffer is full (oldest first).
+    The fragment payload is opaque, so any packet encoder can be used above this layer.
+    :param mtu: maximum size of a packet handed to the link layer in bytes
+    :param reassembly_timeout: time in seconds after which an incomplete packet is dropped
+    :param max_pending: maximum number of incomplete packets
+    :param max_buffer_size: maximum number of bytes of all incomplete packets
+    :param interfaces: interfaces of the link layer below, the MTU must not exceed the size of a packet they receive
+    :raises ValueError if the MTU exceeds the maximum receive size of an interface
+    """
+
+    def __init__(self, mtu: int=1400, reassembly_timeout: float=2.0, max_pending: int=256,
+                 max_buffer_size: int=16 * 1024 * 1024, log_level=255, interfaces: List[BaseInterface]=None):
+        super().__init__(logger_name="NdnLpFragLayer", log_level=log_level)
+        for interface in interfaces or []:
+            if interface.max_receive_size is not None and mtu > interface.max_receive_size:
+                raise ValueError("MTU of " + str(mtu) + " bytes exceeds the receive buffer of " +
+                                 str(interface.max_receive_size) + " bytes of an interface")
+        self.mtu = mtu
+        self.reassembly_timeout = reassembly_timeout
+        self.max_pending = max_pending
+        self.max_buffer_size = max_buffer_size
+        self._sequence = int.from_bytes(os.urandom(NdnTlvCodec.LP_SEQUENCE_SIZE), 'big')
+        self._reassembly: OrderedDict = OrderedDict()
+        self._buffer_size = 0
+
+    def data_from_higher(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
+        face_id, packet = data
+        if not isinstance(packet, (bytes, bytearray)) or len(packet) <= self.mtu:
+            to_lower.put(data)
+            return
+        fragments = self.fragment(packet)
+        self.logger.info("Packet of " + str(len(packet)) + " bytes to face " + str(face_id) + " split into " +
+                         str(len(fragments)) + " fragments")
+        for fragment in fragments:
+            to_lower.put([face_id, fragment])
+
+    def data_from_lower(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
+        face_id, packet = data
+        if not isinstance(packet, (bytes, bytearray)) or len(packet) == 0 or \
+                packet[0] != NdnTlvCodec.TLV_LP_PACKET:
+            to_higher.put(data)
+            return
+        try:
+            sequence, frag_index, frag_count, offset, length, other_headers = NdnTlvCodec.decode_lp_packet(packet)
+        except (ValueError, IndexError):
+            to_higher.put(data) # not a valid LpPacket, left to the packet encoder
+            return
+        if other_headers:
+            to_higher.put(data) # e.g. a Nack, handled by the packet encoder
+            return
+        if length == 0:
+            return # IDLE packet
+        if frag_count is None or frag_count == 1:
+            to_higher.put([face_id, packet[offset:offset + length]])
+            return
+        if sequence is None or frag_index is None or frag_index >= frag_count:
+            self.logger.info("Dropping malformed fragment from face " + str(face_id))
+            return
+        reassembled = self.reassemble(face_id, sequence, frag_index, frag_count, packet[offset:offset + length])
+        if reassembled is not None:
+            to_higher.put([face_id, reassembled])
+
+    def fragment(self, packet) -> List[bytes]:
+        """split a packet into LpPackets that do not exceed the MTU
+        :raises ValueError if the MTU is too small to carry a fragment
+        """
+        frag_count = 1
+        while True:
+            payload_size = self.mtu - (NdnTlvCodec.lp_fragment_size(self.mtu, frag_count - 1, frag_count) - self.mtu)
+            if payload_size <= 0:
+                raise ValueError("MTU of " + str(self.mtu) + " bytes too small for fragmentation")
+            needed = -(-len(packet) // payload_size)
+            if needed <= frag_count:
+                break
+            frag_count = needed
+        sequence = self._sequence
+        self._sequence = (self._sequence + frag_count) & 0xFFFFFFFFFFFFFFFF
+        with memoryview(packet) as view:
+            return [NdnTlvCodec.encode_lp_fragment(sequence + i, i, frag_count,
+                                                   view[i * payload_size:(i + 1) * payload_size])
+                    for i in range(frag_count)]
+
+    def reassemble(self, face_id: int, sequence: int, frag_index: int, frag_count: int,
+                   fragment: bytes) -> Optional[bytes]:
+        """add a fragment to the reassembly buffer
+        :return: the reassembled packet if this was the last missing fragment, else None
+        """
+        now = time.time()
+        self._expire(now)
+        key = (face_id, (sequence - frag_index) & 0xFFFFFFFFFFFFFFFF)
+        entry: NdnLpReassemblyEntry = self._reassembly.get(key)
+        if entry is None:
+            entry = NdnLpReassemblyEntry(now + self.reassembly_timeout, frag_count)
+            self._reassembly[key] = entry
+        elif entry.frag_count != frag_count:
+            self.logger.info("Dropping packet from face " + str(face_id) + ", inconsistent fragment count")
+            self._remove(key)
+            return None
+        if entry.fragments[frag_index] is not None:
+            return None # duplicate
+        entry.fragments[frag_index] = fragment
+        entry.received += 1
+        entry.size += len(fragment)
+        self._buffer_size += len(fragment)
+        if entry.received == entry.frag_count:
+            self._remove(key)
+            return b''.join(entry.fragments)
+        while len(self._reassembly) > self.max_pending or self._buffer_size > self.max_buffer_size:
+            oldest = next(iter(self._reassembly))
+            self.logger.info("Reassembly buffer full, dropping incomplete packet from face " + str(oldest[0]))
+            self._remove(oldest)
+        return None
+
+    def pending(self) -> int:
+        """number of incomplete packets in the reassembly buffer"""
+        return len(self._reassembly)
+
+    def _expire(self, now: float):
+        """drop incomplete packets whose timeout expired, entries are ordered by their deadline"""
+        while len(self._reassembly) > 0:
+            key, entry = next(iter(self._reassembly.items()))
+            if entry.deadline > now:
+                return
+            self.logger.info("Reassembly timeout, dropping incomplete packet from face " + str(key[0]))
+            self._remove(key)
+
+    def _remove(self, key):
+        entry = self._reassembly.pop(key)
+        self._buffer_size -= entry.size
@@ -0,0 +1,6 @@
+"""Link fragmentation layer. Placed between the packet encoding layer and the link layer, it splits packets exceeding the
+link MTU and reassembles them on reception:
+    * The layer expects to receive and writes lists [faceid: int, wire format] in both directions
+    """
+
+from .NdnLpFragmentationLayer import NdnLpFragmentationLayer
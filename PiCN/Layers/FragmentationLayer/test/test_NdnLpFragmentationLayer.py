@@ -0,0 +1,156 @@
+"""Test the NdnLpFragmentationLayer"""
+
+import random
+import time
+import unittest
+
+from PiCN.LayerStack import LayerStack
+from PiCN.Layers.FragmentationLayer import NdnLpFragmentationLayer
+from PiCN.Layers.LinkLayer import BasicLinkLayer
+from PiCN.Layers.LinkLayer.FaceIDTable import FaceIDDict
+from PiCN.Layers.LinkLayer.Interfaces import UDP4Interface, AddressInfo
+from PiCN.Layers.PacketEncodingLayer import BasicPacketEncodingLayer
+from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder, NdnTlvCodec
+from PiCN.Packets import Content, Interest, Nack, NackReason, Name
+from PiCN.Processes import LocalQueue, PiCNSyncDataStructFactory
+
+
+class test_NdnLpFragmentationLayer(unittest.TestCase):
+    """Test the NdnLpFragmentationLayer"""
+
+    def setUp(self):
+        self.encoder = NdnTlvEncoder()
+        self.layer = NdnLpFragmentationLayer(mtu=1400)
+        self.to_lower = LocalQueue()
+        self.to_higher = LocalQueue()
+
+    def tearDown(self):
+        pass
+
+    def send(self, face_id: int, wire_format: bytes):
+        """pass a packet from higher and return the packets put to lower"""
+        self.layer.data_from_higher(self.to_lower, self.to_higher, [face_id, wire_format])
+        packets = []
+        while not self.to_lower.empty():
+            packets.append(self.to_lower.get())
+        return packets
+
+    def receive(self, packets):
+        """pass packets from lower and return the packets put to higher"""
+        for packet in packets:
+            self.layer.data_from_lower(self.to_lower, self.to_higher, packet)
+        received = []
+        while not self.to_higher.empty():
+            received.append(self.to_higher.get())
+        return received
+
+    def test_small_packets_pass_through(self):
+        """Test that packets not exceeding the MTU are not changed"""
+        wire_format = self.encoder.encode(Content("/test/data", "Hello World"))
+        self.assertEqual([[1, wire_format]], self.send(1, wire_format))
+        self.assertEqual([[1, wire_format]], self.receive([[1, wire_format]]))
+        nack = self.encoder.encode(Nack(Name("/test"), NackReason.NO_ROUTE, interest=Interest("/test")))
+        self.assertEqual([[2, nack]], self.receive([[2, nack]]))
+
+    def test_fragmentation(self):
+        """Test that large packets are split into LpPackets within the MTU and with consecutive sequence numbers"""
+        wire_format = self.encoder.encode(Content("/test/data", bytes(random.getrandbits(8) for _ in range(65536))))
+        fragments = self.send(3, wire_format)
+        self.assertEqual(48, len(fragments))
+        sequences = []
+        payload = b''
+        for i, (face_id, fragment) in enumerate(fragments):
+            self.assertEqual(3, face_id)
+            self.assertLessEqual(len(fragment), 1400)
+            sequence, frag_index, frag_count, offset, length, other_headers = NdnTlvCodec.decode_lp_packet(fragment)
+            self.assertEqual((i, len(fragments), False), (frag_index, frag_count, other_headers))
+            sequences.append(sequence)
+            payload += fragment[offset:offset + length]
+        self.assertEqual(list(range(sequences[0], sequences[0] + len(fragments))), sequences)
+        self.assertEqual(wire_format, payload)
+        self.assertLessEqual(len(fragments[0][1]), 1400)
+        self.assertGreater(len(fragments[0][1]), 1350)
+        with self.assertRaises(ValueError):
+            NdnLpFragmentationLayer(mtu=20).fragment(wire_format)
+
+    def test_reassembly(self):
+        """Test reassembling interleaved fragments of several packets received out of order on several faces"""
+        packets = {}
+        fragments = []
+        for face_id in [1, 2]:
+            for i in range(3):
+                content = Content("/test/data/" + str(i), bytes([i]) * (5000 + i * 3000))
+                wire_format = self.encoder.encode(content)
+                packets[(face_id, wire_format)] = content
+                fragments += [[face_id, f] for _, f in self.send(face_id, wire_format)]
+        random.shuffle(fragments)
+        fragments.insert(1, fragments[0]) # duplicate
+        received = self.receive(fragments)
+        self.assertEqual(6, len(received))
+        for face_id, wire_format in received:
+            self.assertEqual(packets[(face_id, wire_format)], self.encoder.decode(wire_format))
+        self.assertEqual(0, self.layer.pending())
+
+    def test_unfragmented_lp_packet(self):
+        """Test that a LpPacket carrying a complete packet is unwrapped"""
+        wire_format = self.encoder.encode(Interest("/test/data"))
+        lp_packet = NdnTlvCodec.encode_lp_fragment(7, 0, 1, wire_format)
+        self.assertEqual([[1, wire_format]], self.receive([[1, lp_packet]]))
+
+    def test_reassembly_timeout(self):
+        """Test that incomplete packets are dropped after the timeout"""
+        self.layer.reassembly_timeout = 0.1
+        fragments = self.send(1, self.encoder.encode(Content("/test/data", bytes(5000))))
+        self.assertEqual([], self.receive(fragments[:-1]))
+        self.assertEqual(1, self.layer.pending())
+        time.sleep(0.2)
+        self.assertEqual([], self.receive(fragments[-1:]))
+        self.assertEqual(1, self.layer.pending()) # only the last fragment
+
+    def test_reassembly_buffer_bounded(self):
+        """Test that the oldest incomplete packets are dropped if the buffer is full"""
+        self.layer.max_pending = 3
+        incomplete = [self.send(1, self.encoder.encode(Content("/test/" + str(i), bytes(5000))))[:-1]
+                      for i in range(5)]
+        for fragments in incomplete:
+            self.receive(fragments)
+        self.assertEqual(3, self.layer.pending())
+        self.layer.max_buffer_size = 5000
+        self.receive(self.send(1, self.encoder.encode(Content("/test/5", bytes(5000))))[:-1])
+        self.assertEqual(1, self.layer.pending())
+        self.assertLessEqual(self.layer._buffer_size, 5000)
+
+    def test_mtu_exceeding_receive_buffer(self):
+        """Test that the MTU cannot exceed the receive buffer of an interface"""
+        interface = UDP4Interface(0)
+        try:
+            with self.assertRaises(ValueError):
+                NdnLpFragmentationLayer(mtu=9000, interfaces=[interface])
+            self.assertEqual(8192, NdnLpFragmentationLayer(mtu=8192, interfaces=[interface]).mtu)
+        finally:
+            interface.close()
+
+    def test_large_content_over_udp(self):
+        """Test transferring a 64 KB content object in one packet between two stacks over UDP"""
+        stacks = []
+        interfaces = [UDP4Interface(0), UDP4Interface(0)]
+        for interface in interfaces:
+            factory = PiCNSyncDataStructFactory()
+            factory.register("faceidtable", FaceIDDict)
+            factory.create_manager()
+            linklayer = BasicLinkLayer([interface], factory.manager.faceidtable())
+            stacks.append(LayerStack([BasicPacketEncodingLayer(NdnTlvEncoder()), NdnLpFragmentationLayer(mtu=1400),
+                                      linklayer]))
+        try:
+            for stack in stacks:
+                stack.start_all()
+            linklayer = stacks[0].layers[-1]
+            fid = linklayer.faceidtable.get_or_create_faceid(AddressInfo(("127.0.0.1", interfaces[1].get_port()), 0))
+            content = Content("/test/large", bytes(random.getrandbits(8) for _ in range(65536)))
+            stacks[0].queue_from_higher.put([fid, content])
+            face_id, received = stacks[1].queue_to_higher.get(timeout=5.0)
+            self.assertEqual(content, received)
+        finally:
+            for stack in stacks:
+                stack.stop_all()
+                stack.close_all()
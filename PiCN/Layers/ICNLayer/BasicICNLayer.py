@@ -9,17 +9,20 @@ from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore, ContentStoreEntr
 from PiCN.Layers.ICNLayer.ForwardingInformationBase import BaseForwardingInformationBase, ForwardingInformationBaseEntry
 from PiCN.Layers.RoutingLayer.RoutingInformationBase import BaseRoutingInformationBase
 from PiCN.Layers.ICNLayer.PendingInterestTable import BasePendingInterestTable, PendingInterestTableEntry
+from PiCN.Layers.PacketEncodingLayer.Encoder import BasicEncoder
 from PiCN.Packets import Name, Content, Interest, Packet, Nack, NackReason
-from PiCN.Processes import LayerProcess
+from PiCN.Processes import LayerProcess, DataStructChannel
 
 
 class BasicICNLayer(LayerProcess):
     """ICN Forwarding Plane. Maintains data structures for ICN Forwarding
+    :param encoder: if set, content found in the CS is encoded once, kept in the CS and sent to lower as wire format.
+                    Must be the encoder of the packet encoding layer below.
     """
 
     def __init__(self, cs: BaseContentStore=None, pit: BasePendingInterestTable=None,
             fib: BaseForwardingInformationBase=None, rib: BaseRoutingInformationBase = None, log_level=255,
-                 ageing_interval: int=3):
+                 ageing_interval: int=3, encoder: BasicEncoder=None):
         super().__init__(logger_name="ICNLayer", log_level=log_level)
         self.cs = cs
         self.pit = pit
@@ -27,6 +30,29 @@ class BasicICNLayer(LayerProcess):
         self.rib = rib
         self._ageing_interval: int = ageing_interval
         self._interest_to_app: bool = False
+        self._data_struct_channel: DataStructChannel = None
+        self._encoder: BasicEncoder = encoder
+
+    def create_data_struct_channel(self) -> DataStructChannel:
+        """Take ownership of the CS, PIT and FIB: the data structs stay local to the ICN layer process and other
+        processes (Mgmt, routing, autoconfig) access them through proxies of the returned channel ("cs", "pit", "fib").
+        Must be called after the data structs are set and before the layer is started. Ageing is executed inside the
+        layer process.
+        :return: the channel to create proxies from
+        """
+        channel = DataStructChannel()
+        channel.register("cs", self.cs)
+        channel.register("pit", self.pit)
+        channel.register("fib", self.fib)
+        self._data_struct_channel = channel
+        self.queue_control = channel.command_queue
+        return channel
+
+    def data_from_control(self, data):
+        if data == "ageing":
+            self.ageing_data_structs()
+        elif self._data_struct_channel is not None:
+            self._data_struct_channel.handle_command(data)
 
     def data_from_higher(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
         high_level_id = data[0]
@@ -98,8 +124,8 @@ class BasicICNLayer(LayerProcess):
         cs_entry = self.cs.find_content_object(interest.name)
         if cs_entry is not None:
             self.logger.info("Found in content store")
-            to_lower.put([face_id, cs_entry.content])
             self.cs.update_timestamp(cs_entry)
+            to_lower.put([face_id, self.encoded_content(cs_entry)])
             return
         pit_entry = self.pit.find_pit_entry(interest.name)
         if pit_entry is not None:
@@ -128,9 +154,23 @@ class BasicICNLayer(LayerProcess):
         else:
             to_lower.put([face_id, nack])
 
+    def encoded_content(self, cs_entry: ContentStoreEntry):
+        """wire format of a CS entry, encoded on first use and kept in the CS
+        :return: the wire format, or the content object if no encoder is set
+        """
+        if self._encoder is None:
+            return cs_entry.content
+        wire_format = cs_entry.wire_format
+        if wire_format is None:
+            wire_format = self._encoder.encode(cs_entry.content)
+            if wire_format is None:
+                return cs_entry.content
+            self.cs.set_wire_format(cs_entry.name, wire_format)
+        return wire_format
+
     def handle_content(self, face_id: int, content: Content, to_lower: multiprocessing.Queue,
                        to_higher: multiprocessing.Queue, from_local: bool = False):
-        self.logger.info("Handling Content " + str(content.name) + " " + str(content.content))
+        self.logger.info("Handling Content " + str(content.name))
         pit_entry = self.pit.find_pit_entry(content.name)
         if pit_entry is None:
             self.logger.info("No PIT entry for content object available, dropping")
@@ -197,7 +237,22 @@ class BasicICNLayer(LayerProcess):
                         to_lower.put([fid, pit_entry.interest])
 
     def ageing(self):
-        """Ageing the data structs"""
+        """Ageing the data structs, periodically. If the data structs are owned by the layer process, the ageing is
+        triggered by a control command"""
+        try:
+            if self._data_struct_channel is not None:
+                self.queue_control.put("ageing")
+            else:
+                self.ageing_data_structs()
+        except Exception as e:
+            self.logger.warning("Exception during ageing: " + str(e))
+        finally:
+            t = threading.Timer(self._ageing_interval, self.ageing)
+            t.setDaemon(True)
+            t.start()
+
+    def ageing_data_structs(self):
+        """Ageing the data structs once"""
         try:
             self.logger.debug("Ageing")
             #PIT ageing
@@ -220,7 +275,3 @@ class BasicICNLayer(LayerProcess):
         except Exception as e:
             self.logger.warning("Exception during ageing: " + str(e))
             pass
-        finally:
-            t = threading.Timer(self._ageing_interval, self.ageing)
-            t.setDaemon(True)
-            t.start()
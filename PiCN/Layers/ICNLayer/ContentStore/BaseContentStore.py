@@ -9,10 +9,14 @@ from PiCN.Layers.ICNLayer import BaseICNDataStruct
 
 class ContentStoreEntry(object):
     """Entry of the content store"""
+
+    __slots__ = ('_content', '_static', '_timestamp', '_wire_format')
+
     def __init__(self, content: Content, static: bool=False):
         self._content: Content = content
         self._static: bool = static #if true: do not remove this content object from CS by ageing
         self._timestamp = time.time()
+        self._wire_format = content.wire_format if content is not None else None #encoded content, set on first use
 
     @property
     def content(self):
@@ -25,6 +29,16 @@ class ContentStoreEntry(object):
     @content.setter
     def content(self, content):
         self._content = content
+        self._wire_format = content.wire_format if content is not None else None
+
+    @property
+    def wire_format(self):
+        """encoded content object, None if it was not encoded yet"""
+        return self._wire_format
+
+    @wire_format.setter
+    def wire_format(self, wire_format):
+        self._wire_format = wire_format
 
     @property
     def static(self):
@@ -42,6 +56,12 @@ class ContentStoreEntry(object):
     def timestamp(self, timestamp):
         self._timestamp = timestamp
 
+    def __reduce__(self):
+        return ContentStoreEntry, (self._content, self._static), (self._timestamp, self._wire_format)
+
+    def __setstate__(self, state):
+        self._timestamp, self._wire_format = state
+
     def __eq__(self, other):
         return self._content == other._content
 
@@ -89,6 +109,17 @@ class BaseContentStore(BaseICNDataStruct):
         """
         """Update Timestamp of a ContentStoreEntry"""
 
+    def set_wire_format(self, name: Name, wire_format: bytes):
+        """
+        Keep the encoded representation of a content object next to its entry, so it is encoded only once
+        :param name: Name (exact)
+        :param wire_format: encoded content object
+        :return: None
+        """
+        cs_entry = self.find_content_object(name)
+        if cs_entry is not None and cs_entry.name == name:
+            cs_entry.wire_format = wire_format
+
     @abc.abstractmethod
     def ageing(self):
         """
@@ -0,0 +1,148 @@
+""" A bounded in-memory content store with exact matching and pluggable replacement policies"""
+
+import time
+from typing import Dict, List
+
+from PiCN.Packets import Content, LazyContent, Name
+from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore, ContentStoreEntry
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy import BaseReplacementPolicy, LRUReplacementPolicy
+from PiCN.Layers.ICNLayer.TimerWheel import TimerWheel
+
+
+class ContentStoreMemoryBounded(BaseContentStore):
+    """ A bounded in memory Content Store using exact matching on a hash index. Lookup, insertion and removal are O(1).
+    If the number of entries or the size of the stored content exceeds the limit, entries selected by the replacement
+    policy are evicted. Static entries are pinned: they are never evicted, but count towards the limits.
+    Ageing uses a timer wheel and only touches entries whose timeout expired.
+    :param cs_timeout: Time interval in which a CS entry will be cached
+    :param max_entries: maximum number of entries, unbounded if None
+    :param max_bytes: maximum size of the stored content in bytes (payload and wire format, including the wire format
+                      cached by set_wire_format), unbounded if None
+    :param replacement_policy: policy selecting the entries to evict, LRU if None
+    """
+
+    def __init__(self, cs_timeout: int=10, max_entries: int=10000, max_bytes: int=64 * 1024 * 1024,
+                 replacement_policy: BaseReplacementPolicy=None):
+        BaseContentStore.__init__(self, cs_timeout=cs_timeout)
+        self._entries: Dict[Name, ContentStoreEntry] = {}
+        self._timers: TimerWheel = TimerWheel()
+        self._policy: BaseReplacementPolicy = replacement_policy if replacement_policy is not None \
+            else LRUReplacementPolicy()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._size_bytes = 0
+
+    @property
+    def container(self) -> List[ContentStoreEntry]:
+        return list(self._entries.values())
+
+    @container.setter
+    def container(self, container):
+        for name in list(self._entries.keys()):
+            self._remove(name)
+        for entry in container or []:
+            self.add_content_object(entry.content, static=entry.static)
+
+    def get_container_size(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """size of the stored content in bytes"""
+        return self._size_bytes
+
+    def find_content_object(self, name: Name) -> ContentStoreEntry:
+        self._policy.record(name)
+        entry = self._entries.get(name)
+        if entry is not None and not entry.static:
+            self._policy.on_access(name)
+        return entry
+
+    def add_content_object(self, content: Content, static: bool=False):
+        name = content.name
+        entry = self._entries.get(name)
+        if entry is not None:
+            if entry.content == content:
+                if static and not entry.static:
+                    self._policy.on_remove(name)
+                    self._timers.cancel(name)
+                    entry.static = True
+                return
+            static = static or entry.static
+            self._remove(name)
+        entry = ContentStoreEntry(content, static=static)
+        size = self._entry_size(entry)
+        if not static and not self._make_room(name, size):
+            return
+        self._entries[name] = entry
+        self._size_bytes += size
+        if not static:
+            self._policy.on_insert(name)
+            self._timers.schedule(name, entry.timestamp + self._cs_timeout)
+
+    def remove_content_object(self, name: Name):
+        self._remove(name)
+
+    def set_wire_format(self, name: Name, wire_format: bytes):
+        entry = self._entries.get(name)
+        if entry is None or entry.wire_format is not None:
+            return
+        size = len(wire_format)
+        if self._max_bytes is not None and not entry.static:
+            if self._size_bytes + size > self._max_bytes: # do not evict other entries for a cache of this one
+                return
+        entry.wire_format = wire_format
+        self._size_bytes += size
+
+    def update_timestamp(self, cs_entry: ContentStoreEntry):
+        cs_entry.timestamp = time.time()
+        if not cs_entry.static and cs_entry.name in self._timers:
+            self._timers.schedule(cs_entry.name, cs_entry.timestamp + self._cs_timeout)
+
+    def ageing(self):
+        cur_time = time.time()
+        for name in self._timers.advance(cur_time):
+            cs_entry = self._entries.get(name)
+            if cs_entry is None or cs_entry.static:
+                continue
+            if cs_entry.timestamp + self._cs_timeout < cur_time:
+                self._remove(name)
+            else: # timeout was increased after the timer was scheduled
+                self._timers.schedule(name, cs_entry.timestamp + self._cs_timeout)
+
+    def _make_room(self, name: Name, size: int) -> bool:
+        """evict entries until an entry of the given size fits into the content store
+        :return: False if the entry cannot be stored
+        """
+        if self._max_bytes is not None and size > self._max_bytes:
+            return False
+        while (self._max_entries is not None and len(self._entries) + 1 > self._max_entries) or \
+                (self._max_bytes is not None and self._size_bytes + size > self._max_bytes):
+            victim = self._policy.victim()
+            if victim is None: # only static entries left
+                return False
+            if not self._policy.admit(name, victim):
+                return False
+            self._remove(victim)
+        return True
+
+    def _remove(self, name: Name):
+        entry = self._entries.pop(name, None)
+        if entry is None:
+            return
+        self._size_bytes -= self._entry_size(entry)
+        if not entry.static:
+            self._policy.on_remove(name)
+            self._timers.cancel(name)
+
+    def _entry_size(self, entry: ContentStoreEntry) -> int:
+        content = entry.content
+        if isinstance(content, LazyContent): # the payload is a slice of the wire format
+            size = len(content.wire_format)
+        else:
+            size = content.content_length
+            if content.wire_format is not None:
+                size += len(content.wire_format)
+        if entry.wire_format is not None and entry.wire_format is not content.wire_format:
+            size += len(entry.wire_format)
+        return size
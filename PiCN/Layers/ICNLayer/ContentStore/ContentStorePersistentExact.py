@@ -6,19 +6,23 @@ import random
 import string
 
 from PiCN.Packets import Content, Name
+from PiCN.Layers.PacketEncodingLayer.Encoder import BasicEncoder
 from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore, ContentStoreEntry
 
 
 class ContentStorePersistentExact(BaseContentStore):
-    """ A persistent content store with exact matching"""
+    """ A persistent content store with exact matching
+    :param encoder: if set, content objects are stored pre-encoded (and signed), so they are served as they are
+    """
 
-    def __init__(self, cs_timeout: int = 10, db_path: str = None):
+    def __init__(self, cs_timeout: int = 10, db_path: str = None, encoder: BasicEncoder = None):
         if db_path is None:
             self.db_path = "/tmp/" + ''.join(random.choice(string.ascii_lowercase) for x in range(9)) + ".db"
         else:
             self.db_path = db_path
         self._container = shelve.open(self.db_path)
         self._cs_timeout = cs_timeout
+        self._encoder = encoder
 
 
     def close_cs(self):
@@ -37,6 +41,8 @@ class ContentStorePersistentExact(BaseContentStore):
             return None
 
     def add_content_object(self, content: Content, static: bool = False):
+        if self._encoder is not None and content.wire_format is None:
+            content.wire_format = self._encoder.encode(content)
         self._container[content.name.to_string()] = ContentStoreEntry(content, static=static)
 
     def remove_content_object(self, name: Name):
@@ -0,0 +1,154 @@
+"""Replacement Policies for bounded Content Stores"""
+
+import abc
+import collections
+import hashlib
+from typing import Dict, List
+
+from PiCN.Packets import Name
+
+
+class BaseReplacementPolicy(object):
+    """Abstract Replacement Policy. The policy tracks the names of all evictable (non static) entries of a content
+    store and selects the victim if the content store is full. All operations must be O(1)."""
+
+    @abc.abstractmethod
+    def on_insert(self, name: Name):
+        """A new entry was inserted"""
+
+    @abc.abstractmethod
+    def on_access(self, name: Name):
+        """An existing entry was requested"""
+
+    @abc.abstractmethod
+    def on_remove(self, name: Name):
+        """An entry was removed (evicted, aged or removed explicitly)"""
+
+    @abc.abstractmethod
+    def victim(self) -> Name:
+        """Select the entry to be evicted next, without removing it
+        :return: Name of the victim or None if no entry is tracked
+        """
+
+    def record(self, name: Name):
+        """A name was looked up (hit or miss), used by admission policies"""
+
+    def admit(self, candidate: Name, victim: Name) -> bool:
+        """Decide if a new entry should be inserted at the cost of evicting the victim
+        :param candidate: name of the new entry
+        :param victim: name of the entry that would be evicted
+        :return: True if the candidate should be inserted
+        """
+        return True
+
+
+class LRUReplacementPolicy(BaseReplacementPolicy):
+    """Least Recently Used"""
+
+    def __init__(self):
+        self._order: collections.OrderedDict = collections.OrderedDict()
+
+    def on_insert(self, name: Name):
+        self._order[name] = None
+
+    def on_access(self, name: Name):
+        if name in self._order:
+            self._order.move_to_end(name)
+
+    def on_remove(self, name: Name):
+        self._order.pop(name, None)
+
+    def victim(self) -> Name:
+        return next(iter(self._order), None)
+
+
+class LFUReplacementPolicy(BaseReplacementPolicy):
+    """Least Frequently Used, ties are broken by least recent use. Uses frequency buckets for O(1) operations."""
+
+    def __init__(self):
+        self._frequency: Dict[Name, int] = {}
+        self._buckets: Dict[int, collections.OrderedDict] = {}
+        self._min_frequency: int = 0
+
+    def on_insert(self, name: Name):
+        self._frequency[name] = 1
+        self._buckets.setdefault(1, collections.OrderedDict())[name] = None
+        self._min_frequency = 1
+
+    def on_access(self, name: Name):
+        frequency = self._frequency.get(name)
+        if frequency is None:
+            return
+        self._remove_from_bucket(name, frequency)
+        if frequency == self._min_frequency and frequency not in self._buckets:
+            self._min_frequency = frequency + 1
+        self._frequency[name] = frequency + 1
+        self._buckets.setdefault(frequency + 1, collections.OrderedDict())[name] = None
+
+    def on_remove(self, name: Name):
+        frequency = self._frequency.pop(name, None)
+        if frequency is not None:
+            self._remove_from_bucket(name, frequency)
+
+    def victim(self) -> Name:
+        if len(self._frequency) == 0:
+            return None
+        if self._min_frequency not in self._buckets: # min bucket was emptied by a removal
+            self._min_frequency = min(self._buckets)
+        return next(iter(self._buckets[self._min_frequency]))
+
+    def _remove_from_bucket(self, name: Name, frequency: int):
+        bucket = self._buckets[frequency]
+        del bucket[name]
+        if len(bucket) == 0:
+            del self._buckets[frequency]
+
+
+class TinyLFUAdmissionPolicy(BaseReplacementPolicy):
+    """TinyLFU admission on top of another replacement policy: a new entry is only admitted if it was requested more
+    often than the victim selected by the underlying policy. Frequencies are estimated by a count-min sketch, which is
+    halved after sample_size recorded lookups so that old popularity fades.
+    :param policy: policy selecting the victims, LRU if None
+    :param width: number of counters per row of the sketch
+    :param depth: number of rows of the sketch
+    :param sample_size: number of recorded lookups after which all counters are halved
+    """
+
+    def __init__(self, policy: BaseReplacementPolicy=None, width: int=4096, depth: int=4, sample_size: int=40960):
+        self._policy: BaseReplacementPolicy = policy if policy is not None else LRUReplacementPolicy()
+        self._width = width
+        self._depth = depth
+        self._sample_size = sample_size
+        self._samples = 0
+        self._sketch: List[List[int]] = [[0] * width for i in range(depth)]
+
+    def on_insert(self, name: Name):
+        self._policy.on_insert(name)
+
+    def on_access(self, name: Name):
+        self._policy.on_access(name)
+
+    def on_remove(self, name: Name):
+        self._policy.on_remove(name)
+
+    def victim(self) -> Name:
+        return self._policy.victim()
+
+    def record(self, name: Name):
+        for row, index in enumerate(self._indices(name)):
+            self._sketch[row][index] += 1
+        self._samples += 1
+        if self._samples >= self._sample_size:
+            self._sketch = [[c >> 1 for c in row] for row in self._sketch]
+            self._samples = self._samples >> 1
+
+    def admit(self, candidate: Name, victim: Name) -> bool:
+        return self.estimate(candidate) > self.estimate(victim)
+
+    def estimate(self, name: Name) -> int:
+        """Estimated number of recorded lookups of a name"""
+        return min(self._sketch[row][index] for row, index in enumerate(self._indices(name)))
+
+    def _indices(self, name: Name) -> List[int]:
+        digest = hashlib.blake2b(str(name).encode(), digest_size=4 * self._depth).digest()
+        return [int.from_bytes(digest[4 * i:4 * i + 4], 'little') % self._width for i in range(self._depth)]
@@ -0,0 +1,202 @@
+"""Tests for the bounded in Memory Content Store and the Replacement Policies"""
+
+import pickle
+import time
+import unittest
+
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryBounded
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy import LRUReplacementPolicy, LFUReplacementPolicy, \
+    TinyLFUAdmissionPolicy
+from PiCN.Packets import Content, Name
+
+
+class test_ContentStoreMemoryBounded(unittest.TestCase):
+
+    def setUp(self):
+        self.cs = ContentStoreMemoryBounded(max_entries=3, max_bytes=None)
+
+    def tearDown(self):
+        pass
+
+    def test_add_and_find_content(self):
+        """Test adding and searching data"""
+        c = Content("/test/data", "Hello World")
+        self.cs.add_content_object(c)
+        entry = self.cs.find_content_object(Name("/test/data"))
+        self.assertEqual(entry.content, c)
+        self.assertIsNone(self.cs.find_content_object(Name("/test/other")))
+        self.assertEqual(self.cs.get_container_size(), 1)
+
+    def test_pickle_entry(self):
+        """Test that a content store entry keeps its state when pickled"""
+        self.cs.add_content_object(Content("/test/data", "Hello World"), static=True)
+        entry = self.cs.find_content_object(Name("/test/data"))
+        unpickled = pickle.loads(pickle.dumps(entry))
+        self.assertEqual(entry, unpickled)
+        self.assertEqual((True, entry.timestamp), (unpickled.static, unpickled.timestamp))
+
+    def test_add_same_content_twice(self):
+        """Test that adding the same content again does not create a second entry"""
+        self.cs.add_content_object(Content("/test/data", "Hello World"))
+        self.cs.add_content_object(Content("/test/data", "Hello World"))
+        self.assertEqual(self.cs.get_container_size(), 1)
+        self.cs.add_content_object(Content("/test/data", "Goodbye"))
+        self.assertEqual(self.cs.get_container_size(), 1)
+        self.assertEqual(self.cs.find_content_object(Name("/test/data")).content.content, "Goodbye")
+
+    def test_remove_content(self):
+        """Test removing data"""
+        self.cs.add_content_object(Content("/test/data", "Hello World"))
+        self.cs.remove_content_object(Name("/test/data"))
+        self.assertIsNone(self.cs.find_content_object(Name("/test/data")))
+        self.assertEqual(self.cs.size_bytes, 0)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted if the CS is full"""
+        for i in range(3):
+            self.cs.add_content_object(Content("/test/" + str(i), "data"))
+        self.cs.find_content_object(Name("/test/0"))
+        self.cs.add_content_object(Content("/test/3", "data"))
+        self.assertEqual(self.cs.get_container_size(), 3)
+        self.assertIsNone(self.cs.find_content_object(Name("/test/1")))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/0")))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/3")))
+
+    def test_lfu_eviction(self):
+        """Test that the least frequently used entry is evicted if the CS is full"""
+        self.cs = ContentStoreMemoryBounded(max_entries=3, max_bytes=None, replacement_policy=LFUReplacementPolicy())
+        for i in range(3):
+            self.cs.add_content_object(Content("/test/" + str(i), "data"))
+        self.cs.find_content_object(Name("/test/0"))
+        self.cs.find_content_object(Name("/test/0"))
+        self.cs.find_content_object(Name("/test/1"))
+        self.cs.add_content_object(Content("/test/3", "data"))
+        self.assertIsNone(self.cs.find_content_object(Name("/test/2")))
+        self.cs.add_content_object(Content("/test/4", "data"))
+        self.assertIsNone(self.cs.find_content_object(Name("/test/3")))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/0")))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/1")))
+
+    def test_byte_budget_eviction(self):
+        """Test that entries are evicted until the new content fits into the byte budget"""
+        self.cs = ContentStoreMemoryBounded(max_entries=None, max_bytes=30)
+        for i in range(3):
+            self.cs.add_content_object(Content("/test/" + str(i), "x" * 10))
+        self.assertEqual(self.cs.size_bytes, 30)
+        self.cs.add_content_object(Content("/test/big", "x" * 20))
+        self.assertEqual(self.cs.size_bytes, 30)
+        self.assertIsNone(self.cs.find_content_object(Name("/test/0")))
+        self.assertIsNone(self.cs.find_content_object(Name("/test/1")))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/2")))
+        self.cs.add_content_object(Content("/test/huge", "x" * 31))
+        self.assertIsNone(self.cs.find_content_object(Name("/test/huge")))
+        self.assertEqual(self.cs.size_bytes, 30)
+
+    def test_wire_format_in_byte_budget(self):
+        """Test that the wire format kept next to an entry counts towards the byte budget, but evicts no entries"""
+        self.cs = ContentStoreMemoryBounded(max_entries=None, max_bytes=40)
+        self.cs.add_content_object(Content("/test/0", "x" * 10))
+        self.cs.add_content_object(Content("/test/1", "x" * 10))
+        self.cs.set_wire_format(Name("/test/0"), b"w" * 15)
+        self.assertEqual(self.cs.size_bytes, 35)
+        self.assertEqual(self.cs.find_content_object(Name("/test/0")).wire_format, b"w" * 15)
+        self.cs.set_wire_format(Name("/test/1"), b"w" * 15)
+        self.assertIsNone(self.cs.find_content_object(Name("/test/1")).wire_format)
+        self.assertEqual(self.cs.size_bytes, 35)
+        self.cs.remove_content_object(Name("/test/0"))
+        self.assertEqual(self.cs.size_bytes, 10)
+
+    def test_static_content_pinned(self):
+        """Test that static content is never evicted"""
+        self.cs.add_content_object(Content("/test/static", "data"), static=True)
+        for i in range(5):
+            self.cs.add_content_object(Content("/test/" + str(i), "data"))
+        self.assertEqual(self.cs.get_container_size(), 3)
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/static")))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/4")))
+
+    def test_only_static_content(self):
+        """Test that new content is not stored if the CS is full of static content"""
+        for i in range(3):
+            self.cs.add_content_object(Content("/test/" + str(i), "data"), static=True)
+        self.cs.add_content_object(Content("/test/new", "data"))
+        self.assertIsNone(self.cs.find_content_object(Name("/test/new")))
+        self.assertEqual(self.cs.get_container_size(), 3)
+
+    def test_tinylfu_admission(self):
+        """Test that TinyLFU rejects content that is requested less often than the victim"""
+        self.cs = ContentStoreMemoryBounded(max_entries=2, max_bytes=None,
+                                            replacement_policy=TinyLFUAdmissionPolicy())
+        for name in ["/test/0", "/test/1"]:
+            self.cs.find_content_object(Name(name))
+            self.cs.add_content_object(Content(name, "data"))
+        self.cs.add_content_object(Content("/test/once", "data"))
+        self.assertIsNone(self.cs.find_content_object(Name("/test/once")))
+        for i in range(3):
+            self.cs.find_content_object(Name("/test/popular"))
+        self.cs.add_content_object(Content("/test/popular", "data"))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/popular")))
+        self.assertEqual(self.cs.get_container_size(), 2)
+
+    def test_ageing(self):
+        """Test that ageing removes timed out content, but keeps static content"""
+        self.cs = ContentStoreMemoryBounded(cs_timeout=0.2)
+        self.cs.add_content_object(Content("/test/data", "data"))
+        self.cs.add_content_object(Content("/test/static", "data"), static=True)
+        self.cs.ageing()
+        self.assertEqual(self.cs.get_container_size(), 2)
+        time.sleep(0.5)
+        self.cs.ageing()
+        self.assertIsNone(self.cs.find_content_object(Name("/test/data")))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/static")))
+
+    def test_ageing_update_timestamp(self):
+        """Test that updating the timestamp of an entry delays its removal"""
+        self.cs = ContentStoreMemoryBounded(cs_timeout=0.4)
+        self.cs.add_content_object(Content("/test/data", "data"))
+        time.sleep(0.3)
+        self.cs.update_timestamp(self.cs.find_content_object(Name("/test/data")))
+        time.sleep(0.3)
+        self.cs.ageing()
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/data")))
+        time.sleep(0.4)
+        self.cs.ageing()
+        self.assertIsNone(self.cs.find_content_object(Name("/test/data")))
+
+
+class test_ReplacementPolicy(unittest.TestCase):
+
+    def test_lru_victim(self):
+        """Test the victim selection of LRU"""
+        policy = LRUReplacementPolicy()
+        self.assertIsNone(policy.victim())
+        policy.on_insert(Name("/a"))
+        policy.on_insert(Name("/b"))
+        self.assertEqual(policy.victim(), Name("/a"))
+        policy.on_access(Name("/a"))
+        self.assertEqual(policy.victim(), Name("/b"))
+        policy.on_remove(Name("/b"))
+        self.assertEqual(policy.victim(), Name("/a"))
+
+    def test_lfu_victim(self):
+        """Test the victim selection of LFU after removing the least frequently used entry"""
+        policy = LFUReplacementPolicy()
+        policy.on_insert(Name("/a"))
+        policy.on_insert(Name("/b"))
+        policy.on_access(Name("/a"))
+        policy.on_access(Name("/b"))
+        policy.on_access(Name("/b"))
+        self.assertEqual(policy.victim(), Name("/a"))
+        policy.on_remove(Name("/a"))
+        self.assertEqual(policy.victim(), Name("/b"))
+        policy.on_remove(Name("/b"))
+        self.assertIsNone(policy.victim())
+
+    def test_tinylfu_sketch_reset(self):
+        """Test that the TinyLFU sketch halves its counters after the sample size was reached"""
+        policy = TinyLFUAdmissionPolicy(sample_size=8)
+        for i in range(7):
+            policy.record(Name("/a"))
+        self.assertEqual(policy.estimate(Name("/a")), 7)
+        policy.record(Name("/a"))
+        self.assertEqual(policy.estimate(Name("/a")), 4)
@@ -3,6 +3,7 @@
 import unittest
 
 from PiCN.Layers.ICNLayer.ContentStore.ContentStorePersistentExact import ContentStorePersistentExact
+from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder
 from PiCN.Packets import Content
 
 
@@ -49,3 +50,14 @@ class test_ContentStoreMemoryExact(unittest.TestCase):
         restored_cs = ContentStorePersistentExact(db_path=db_path)
         restored_content = restored_cs.find_content_object(c.name).content # TODO
         self.assertEqual(restored_content, c)
+
+    def test_presigned(self):
+        """Test that content is stored with its wire format if an encoder is given"""
+        encoder = NdnTlvEncoder()
+        cs = ContentStorePersistentExact(encoder=encoder)
+        c = Content("/test/data", "Hello World")
+        cs.add_content_object(c)
+        fc = cs.find_content_object(c.name)
+        self.assertIsNotNone(fc.content.wire_format)
+        self.assertEqual(c, encoder.decode(fc.content.wire_format))
+        cs.close_cs()
@@ -0,0 +1,133 @@
+""" A in memory Forwarding Information Base using longest prefix matching on a name component trie"""
+
+from collections import OrderedDict
+from typing import Dict, List
+
+from PiCN.Layers.ICNLayer.ForwardingInformationBase.BaseForwardingInformationBase import BaseForwardingInformationBase, \
+    ForwardingInformationBaseEntry
+from PiCN.Packets import Name
+
+
+class FibTrieNode(object):
+    """Node of the FIB trie, holds the entries of the prefix ending at this node, newest entry first"""
+
+    __slots__ = ('children', 'entries')
+
+    def __init__(self):
+        self.children: Dict[bytes, FibTrieNode] = {}
+        self.entries: List[ForwardingInformationBaseEntry] = []
+
+
+class ForwardingInformationBaseMemoryTrie(BaseForwardingInformationBase):
+    """A in memory Forwarding Information Base using longest prefix matching on a name component trie. A lookup walks
+    down the trie once and then checks the entries from the longest to the shortest matching prefix, so it is O(name
+    depth) instead of O(name depth * number of entries). Entries in already_used and faces in incoming_faceids are
+    skipped like in ForwardingInformationBaseMemoryPrefix. In contrast to the latter, an entry for the empty name
+    (Name()) is matched as default route.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._root: FibTrieNode = FibTrieNode()
+        self._entries: OrderedDict = OrderedDict() # id(entry) -> entry, in insertion order
+
+    @property
+    def container(self) -> List[ForwardingInformationBaseEntry]:
+        return list(reversed(self._entries.values()))
+
+    @container.setter
+    def container(self, container):
+        self._root = FibTrieNode()
+        self._entries = OrderedDict()
+        for fib_entry in reversed(container or []):
+            self._insert(fib_entry)
+
+    def get_container_size(self) -> int:
+        return len(self._entries)
+
+    def find_fib_entry(self, name: Name, already_used: List[ForwardingInformationBaseEntry] = None,
+                       incoming_faceids: List[int]=None) -> ForwardingInformationBaseEntry:
+        node = self._root
+        path = [node]
+        for component in name.components:
+            node = node.children.get(component)
+            if node is None:
+                break
+            path.append(node)
+        for node in reversed(path):
+            for fib_entry in node.entries:
+                if already_used and fib_entry in already_used:
+                    continue
+                if incoming_faceids:
+                    forward_faceids = [faceid for faceid in fib_entry.faceid if faceid not in incoming_faceids]
+                else:
+                    forward_faceids = list(fib_entry.faceid)
+                if len(forward_faceids) == 0:
+                    continue
+                return ForwardingInformationBaseEntry(fib_entry.name, forward_faceids)
+        return None
+
+    def add_fib_entry(self, name: Name, faceid: List[int], static: bool=False):
+        assert (isinstance(faceid, List))
+        fib_entry = ForwardingInformationBaseEntry(name, faceid, static)
+        node = self._find_node(name)
+        if node is not None and fib_entry in node.entries:
+            return
+        self._insert(fib_entry)
+
+    def remove_fib_entry(self, name: Name):
+        path = self._find_path(name)
+        if path is None:
+            return
+        for fib_entry in path[-1].entries:
+            del self._entries[id(fib_entry)]
+        path[-1].entries = []
+        self._prune(name, path)
+
+    def add_faceid_to_entry(self, name, fid):
+        node = self._find_node(name)
+        if node is None or len(node.entries) == 0:
+            return
+        fib_entry = node.entries[0]
+        if fid not in fib_entry.faceid:
+            fib_entry.faceid.append(fid)
+        # the updated entry becomes the newest one, other entries of the same name are kept
+        self._entries.move_to_end(id(fib_entry))
+
+    def clear(self):
+        static_entries = [fib_entry for fib_entry in self.container if fib_entry.static]
+        self.container = static_entries
+
+    def _insert(self, fib_entry: ForwardingInformationBaseEntry):
+        node = self._root
+        for component in fib_entry.name.components:
+            child = node.children.get(component)
+            if child is None:
+                child = FibTrieNode()
+                node.children[component] = child
+            node = child
+        node.entries.insert(0, fib_entry)
+        self._entries[id(fib_entry)] = fib_entry
+
+    def _find_path(self, name: Name) -> List[FibTrieNode]:
+        """nodes from the root to the node of name, None if name is not in the trie"""
+        node = self._root
+        path = [node]
+        for component in name.components:
+            node = node.children.get(component)
+            if node is None:
+                return None
+            path.append(node)
+        return path
+
+    def _find_node(self, name: Name) -> FibTrieNode:
+        path = self._find_path(name)
+        return path[-1] if path is not None else None
+
+    def _prune(self, name: Name, path: List[FibTrieNode]):
+        """remove nodes without entries and children along a path"""
+        for i in range(len(path) - 1, 0, -1):
+            node = path[i]
+            if node.entries or node.children:
+                break
+            del path[i - 1].children[name.components[i - 1]]
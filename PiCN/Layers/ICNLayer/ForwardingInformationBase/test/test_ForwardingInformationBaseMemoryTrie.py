@@ -0,0 +1,129 @@
+"""Test of in-memory Forwarding Information Base using longest prefix matching on a name component trie"""
+
+import unittest
+
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryTrie
+from PiCN.Packets import Name
+
+
+class test_ForwardingInformationBaseMemoryTrie(unittest.TestCase):
+    """Test of in-memory Forwarding Information Base using longest prefix matching on a name component trie"""
+
+    def setUp(self):
+        self.fib = ForwardingInformationBaseMemoryTrie()
+
+    def tearDown(self):
+        pass
+
+    def test_add_entry_to_fib(self):
+        """Test add entry to fib"""
+        fid = [1]
+        name = Name("/test/data")
+        self.fib.add_fib_entry(name, fid)
+        self.fib.add_fib_entry(name, fid)
+        self.assertEqual(self.fib.get_container_size(), 1)
+        entry = self.fib.container[0]
+        self.assertEqual(entry.name, name)
+        self.assertEqual(entry.faceid, fid)
+
+    def test_container_newest_first(self):
+        """Test that the container lists the newest entry first and can be replaced"""
+        self.fib.add_fib_entry(Name("/data/test"), [2])
+        self.fib.add_fib_entry(Name("/test/data"), [1])
+        self.assertEqual(self.fib.container[0].name, Name("/test/data"))
+        self.assertEqual(self.fib.container[1].name, Name("/data/test"))
+        self.fib.container = list(reversed(self.fib.container))
+        self.assertEqual(self.fib.container[0].name, Name("/data/test"))
+        self.assertEqual(self.fib.find_fib_entry(Name("/test/data/x")).faceid, [1])
+
+    def test_find_entry_to_fib_longest_match(self):
+        """Test finding a fib entry using a longest match"""
+        self.fib.add_fib_entry(Name("/test/data"), [1])
+        self.fib.add_fib_entry(Name("/data"), [2])
+        self.fib.add_fib_entry(Name("/test"), [3])
+        self.assertEqual(self.fib.find_fib_entry(Name("/test/data/object")).faceid, [1])
+        self.assertEqual(self.fib.find_fib_entry(Name("/test/data")).faceid, [1])
+        self.assertEqual(self.fib.find_fib_entry(Name("/data/object/content")).faceid, [2])
+        self.assertEqual(self.fib.find_fib_entry(Name("/test/other")).faceid, [3])
+        self.assertIsNone(self.fib.find_fib_entry(Name("/other/test")))
+
+    def test_find_entry_default_route(self):
+        """Test that an entry for the empty name matches all names"""
+        self.fib.add_fib_entry(Name(), [7])
+        self.fib.add_fib_entry(Name("/test"), [1])
+        self.assertEqual(self.fib.find_fib_entry(Name("/test/data")).faceid, [1])
+        self.assertEqual(self.fib.find_fib_entry(Name("/other/data")).faceid, [7])
+
+    def test_get_already_used_fib_entry(self):
+        """Test to get a fib entry if there are already used entries"""
+        self.fib.add_fib_entry(Name("/test/data/content"), [1])
+        self.fib.add_fib_entry(Name("/test"), [2])
+        self.fib.add_fib_entry(Name("/test/data"), [3])
+        iname = Name("/test/data/content/object1")
+        already_used = []
+        for fid in [[1], [3], [2]]:
+            fib_entry = self.fib.find_fib_entry(iname, already_used)
+            self.assertEqual(fib_entry.faceid, fid)
+            already_used.append(fib_entry)
+        self.assertIsNone(self.fib.find_fib_entry(iname, already_used))
+
+    def test_incoming_faceids(self):
+        """Test that incoming faces are not returned and entries without other faces are skipped"""
+        self.fib.add_fib_entry(Name("/test"), [2, 3])
+        self.fib.add_fib_entry(Name("/test/data"), [1])
+        fib_entry = self.fib.find_fib_entry(Name("/test/data/x"), incoming_faceids=[1, 2])
+        self.assertEqual(fib_entry.name, Name("/test"))
+        self.assertEqual(fib_entry.faceid, [3])
+        self.assertIsNone(self.fib.find_fib_entry(Name("/test/data/x"), incoming_faceids=[1, 2, 3]))
+
+    def test_multiple_entries_same_name(self):
+        """Test that the newest entry of a name is preferred"""
+        self.fib.add_fib_entry(Name("/test"), [1])
+        self.fib.add_fib_entry(Name("/test"), [2])
+        already_used = [self.fib.find_fib_entry(Name("/test/data"))]
+        self.assertEqual(already_used[0].faceid, [2])
+        self.assertEqual(self.fib.find_fib_entry(Name("/test/data"), already_used).faceid, [1])
+
+    def test_remove_entry_from_fib(self):
+        """Test remove a fib entry"""
+        self.fib.add_fib_entry(Name("/test"), [1])
+        self.fib.add_fib_entry(Name("/test/data"), [2])
+        self.fib.add_fib_entry(Name("/test/data"), [3])
+        self.fib.remove_fib_entry(Name("/test/data"))
+        self.fib.remove_fib_entry(Name("/not/existing"))
+        self.assertEqual(self.fib.get_container_size(), 1)
+        self.assertEqual(self.fib.find_fib_entry(Name("/test/data")).faceid, [1])
+        self.fib.remove_fib_entry(Name("/test"))
+        self.assertEqual(self.fib._root.children, {})
+
+    def test_clear(self):
+        """Test that clear keeps static entries only"""
+        self.fib.add_fib_entry(Name('/test/foo'), [42], static=True)
+        self.fib.add_fib_entry(Name('/test/bar'), [1337], static=False)
+        self.assertEqual(2, len(self.fib.container))
+        self.fib.clear()
+        self.assertEqual(1, len(self.fib.container))
+        self.assertIsNotNone(self.fib.find_fib_entry(Name('/test/foo')))
+        self.assertIsNone(self.fib.find_fib_entry(Name('/test/bar')))
+
+    def test_add_faceid_to_entry(self):
+        """Test adding a face to an existing entry"""
+        self.fib.add_fib_entry(Name('/test/foo'), [42], static=True)
+        self.fib.add_fib_entry(Name('/test/bar'), [1337], static=False)
+        self.fib.add_faceid_to_entry(Name("/test/bar"), 21)
+        self.assertEqual([1337, 21], self.fib.find_fib_entry(Name("/test/bar")).faceid)
+        self.fib.add_faceid_to_entry(Name("/test/bar"), 21)
+        self.assertEqual([1337, 21], self.fib.find_fib_entry(Name("/test/bar")).faceid)
+        self.fib.add_faceid_to_entry(Name("/test/foo"), 43)
+        self.assertTrue(self.fib.container[0].static)
+        self.assertEqual(2, len(self.fib.container))
+
+    def test_add_faceid_to_entry_keeps_other_entries(self):
+        """Test that adding a face to an entry keeps the other entries of the same name"""
+        self.fib.add_fib_entry(Name('/test/foo'), [1], static=True)
+        self.fib.add_fib_entry(Name('/test/foo'), [2], static=False)
+        self.fib.add_faceid_to_entry(Name("/test/foo"), 3)
+        self.assertEqual(2, self.fib.get_container_size())
+        self.assertEqual([2, 3], self.fib.find_fib_entry(Name("/test/foo")).faceid)
+        first = self.fib.find_fib_entry(Name("/test/foo"))
+        self.assertEqual([1], self.fib.find_fib_entry(Name("/test/foo"), already_used=[first]).faceid)
@@ -13,6 +13,9 @@ from PiCN.Layers.ICNLayer import BaseICNDataStruct
 class PendingInterestTableEntry(object):
     """An entry in the Forwarding Information Base"""
 
+    __slots__ = ('name', '_faceids', '_timestamp', '_retransmits', '_local_app', '_interest',
+                 '_fib_entries_already_used', 'faces_already_nacked', 'number_of_forwards')
+
     def __init__(self, name: Name, faceid: int, interest:Interest = None, local_app: bool=False,
                  fib_entries_already_used: List[ForwardingInformationBaseEntry]=None, faces_already_nacked=None,
                  number_of_forwards=0):
@@ -41,6 +44,14 @@ class PendingInterestTableEntry(object):
         self.number_of_forwards = number_of_forwards
 
 
+    def __reduce__(self):
+        return PendingInterestTableEntry, (self.name, self._faceids, self._interest, self._local_app,
+                                           self._fib_entries_already_used, self.faces_already_nacked,
+                                           self.number_of_forwards), (self._timestamp, self._retransmits)
+
+    def __setstate__(self, state):
+        self._timestamp, self._retransmits = state
+
     def __eq__(self, other):
         if other is None:
             return False
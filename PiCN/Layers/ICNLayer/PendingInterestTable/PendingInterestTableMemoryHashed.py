@@ -0,0 +1,121 @@
+"""in-memory Pending Interest Table using exact matching on a hash index and a timer wheel for ageing"""
+
+import time
+
+from typing import Dict, List
+from PiCN.Layers.ICNLayer.PendingInterestTable.BasePendingInterestTable import BasePendingInterestTable, \
+    PendingInterestTableEntry
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseEntry
+from PiCN.Layers.ICNLayer.TimerWheel import TimerWheel
+from PiCN.Packets import Interest, Name
+
+
+class PendingInterestTableMemoryHashed(BasePendingInterestTable):
+    """in-memory Pending Interest Table using exact matching on a hash index. Lookup, aggregation and removal are O(1).
+    Instead of scanning all entries, ageing only handles entries whose retransmit timer expired: such an entry is
+    removed if it is older than pit_timeout and was retransmitted more than pit_retransmits times, otherwise it is
+    returned for retransmission and its timer is restarted.
+    :param pit_timeout: timeout for a pit entry
+    :param pit_retransmits: number of retransmits before a timed out entry is removed
+    :param retransmit_interval: time between two retransmits of an entry, should match the ageing interval
+    """
+
+    def __init__(self, pit_timeout: int=4, pit_retransmits: int=3, retransmit_interval: float=3) -> None:
+        super().__init__(pit_timeout=pit_timeout, pit_retransmits=pit_retransmits)
+        self._entries: Dict[Name, PendingInterestTableEntry] = {}
+        self._timers: TimerWheel = TimerWheel()
+        self._retransmit_interval = retransmit_interval
+
+    @property
+    def container(self) -> List[PendingInterestTableEntry]:
+        return list(self._entries.values())
+
+    @container.setter
+    def container(self, container):
+        self._entries = {}
+        self._timers = TimerWheel()
+        for entry in container or []:
+            self.append(entry)
+
+    def get_container_size(self) -> int:
+        return len(self._entries)
+
+    def add_pit_entry(self, name, faceid: int, interest: Interest = None, local_app = False):
+        pit_entry = self._entries.get(name)
+        if pit_entry is not None:
+            if faceid in pit_entry.face_id and local_app in pit_entry.local_app:
+                return
+            pit_entry._faceids.append(faceid)
+            pit_entry._local_app.append(local_app)
+            return
+        self._entries[name] = PendingInterestTableEntry(name, faceid, interest, local_app)
+        self._timers.schedule(name, time.time() + self._retransmit_interval)
+
+    def remove_pit_entry(self, name: Name):
+        if self._entries.pop(name, None) is not None:
+            self._timers.cancel(name)
+
+    def remove_pit_entry_by_fid(self, faceid: int):
+        for pit_entry in list(self._entries.values()):
+            if faceid not in pit_entry.faceids:
+                continue
+            keep = [i for i, fid in enumerate(pit_entry.faceids) if fid != faceid]
+            if len(keep) == 0:
+                self.remove_pit_entry(pit_entry.name)
+                continue
+            pit_entry.face_id = [pit_entry.faceids[i] for i in keep]
+            pit_entry.local_app = [pit_entry.local_app[i] for i in keep]
+
+    def find_pit_entry(self, name: Name) -> PendingInterestTableEntry:
+        return self._entries.get(name)
+
+    def update_timestamp(self, pit_entry: PendingInterestTableEntry):
+        new_entry = PendingInterestTableEntry(pit_entry.name, pit_entry.faceids, interest=pit_entry.interest,
+                                              local_app=pit_entry.local_app,
+                                              fib_entries_already_used=pit_entry.fib_entries_already_used,
+                                              faces_already_nacked=pit_entry.faces_already_nacked,
+                                              number_of_forwards=pit_entry.number_of_forwards)
+        self._entries[pit_entry.name] = new_entry
+        self._timers.schedule(pit_entry.name, new_entry.timestamp + self._retransmit_interval)
+
+    def add_used_fib_entry(self, name: Name, used_fib_entry: ForwardingInformationBaseEntry):
+        pit_entry = self.find_pit_entry(name)
+        pit_entry.fib_entries_already_used.append(used_fib_entry)
+
+    def get_already_used_pit_entries(self, name: Name):
+        pit_entry = self.find_pit_entry(name)
+        return pit_entry.fib_entries_already_used
+
+    def append(self, entry):
+        self._entries[entry.name] = entry
+        if entry.name not in self._timers:
+            self._timers.schedule(entry.name, time.time() + self._retransmit_interval)
+
+    def set_number_of_forwards(self, name, forwards):
+        self.find_pit_entry(name).number_of_forwards = forwards
+
+    def increase_number_of_forwards(self, name):
+        self.find_pit_entry(name).number_of_forwards += 1
+
+    def decrease_number_of_forwards(self, name):
+        self.find_pit_entry(name).number_of_forwards -= 1
+
+    def add_nacked_faceid(self, name, fid: int):
+        self.find_pit_entry(name).faces_already_nacked.append(fid)
+
+    def ageing(self) -> (List[PendingInterestTableEntry], List[PendingInterestTableEntry]):
+        cur_time = time.time()
+        remove = []
+        updated = []
+        for name in self._timers.advance(cur_time):
+            pit_entry = self._entries.get(name)
+            if pit_entry is None:
+                continue
+            if pit_entry.timestamp + self._pit_timeout < cur_time and pit_entry.retransmits > self._pit_retransmits:
+                del self._entries[name]
+                remove.append(pit_entry)
+            else:
+                pit_entry.retransmits = pit_entry.retransmits + 1
+                updated.append(pit_entry)
+                self._timers.schedule(name, cur_time + self._retransmit_interval)
+        return updated, remove
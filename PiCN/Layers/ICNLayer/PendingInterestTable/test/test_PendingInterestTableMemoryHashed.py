@@ -0,0 +1,124 @@
+"""Tests for the in Memory Pending Interest Table using a hash index"""
+
+import pickle
+import time
+import unittest
+
+from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterestTableMemoryHashed
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseEntry
+from PiCN.Packets import Interest, Name
+
+
+class test_PendingInterestTableMemoryHashed(unittest.TestCase):
+
+    def setUp(self):
+        self.pit: PendingInterestTableMemoryHashed = PendingInterestTableMemoryHashed(pit_timeout=0.2,
+                                                                                      pit_retransmits=1,
+                                                                                      retransmit_interval=0.2)
+
+    def test_add_and_find_data_in_pit(self):
+        """Test adding and finding data in the PIT"""
+        name = Name("/test/data")
+        self.pit.add_pit_entry(name, 1)
+        res = self.pit.find_pit_entry(Name("/test/data"))
+        self.assertEqual(res.name, name)
+        self.assertEqual(res.face_id, [1])
+        self.assertEqual(self.pit.get_container_size(), 1)
+        self.assertIsNone(self.pit.find_pit_entry(Name("/data/test")))
+
+    def test_pit_aggregation(self):
+        """Test aggregating interests with multiple fids in a single entry"""
+        name = Name("/test/data")
+        self.pit.add_pit_entry(name, 1)
+        self.pit.add_pit_entry(name, 2, local_app=True)
+        self.pit.add_pit_entry(name, 2, local_app=True)
+        res = self.pit.find_pit_entry(name)
+        self.assertEqual(res.face_id, [1, 2])
+        self.assertEqual(res.local_app, [False, True])
+        self.assertEqual(self.pit.get_container_size(), 1)
+
+    def test_remove_data_from_pit(self):
+        """Test removing data from PIT"""
+        name = Name("/test/data")
+        self.pit.add_pit_entry(name, 1)
+        self.pit.remove_pit_entry(name)
+        self.assertEqual(self.pit.get_container_size(), 0)
+        self.assertIsNone(self.pit.find_pit_entry(name))
+        self.assertEqual(self.pit.ageing(), ([], []))
+
+    def test_remove_pit_entry_by_fid(self):
+        """Test removing a face from all PIT entries"""
+        n1 = Name("/test/data1")
+        n2 = Name("/test/data2")
+        self.pit.add_pit_entry(n1, 1)
+        self.pit.add_pit_entry(n1, 2, local_app=True)
+        self.pit.add_pit_entry(n2, 1)
+        self.pit.remove_pit_entry_by_fid(1)
+        self.assertEqual(self.pit.find_pit_entry(n1).face_id, [2])
+        self.assertEqual(self.pit.find_pit_entry(n1).local_app, [True])
+        self.assertIsNone(self.pit.find_pit_entry(n2))
+
+    def test_add_already_used_fib_entry(self):
+        """Test adding an already used FIB Entry"""
+        n1 = Name("/test/data")
+        fib_entry = ForwardingInformationBaseEntry(n1, [2], False)
+        self.pit.add_pit_entry(n1, [1], None, False)
+        self.pit.add_used_fib_entry(n1, fib_entry)
+        self.assertEqual(self.pit.get_already_used_pit_entries(n1)[0], fib_entry)
+
+    def test_number_of_forwards_and_nacks(self):
+        """Test the forward counter and the nacked faces"""
+        n1 = Name("/test/data")
+        self.pit.add_pit_entry(n1, 1)
+        self.pit.set_number_of_forwards(n1, 3)
+        self.pit.increase_number_of_forwards(n1)
+        self.pit.decrease_number_of_forwards(n1)
+        self.pit.decrease_number_of_forwards(n1)
+        self.assertEqual(self.pit.find_pit_entry(n1).number_of_forwards, 2)
+        self.pit.add_nacked_faceid(n1, 4)
+        self.assertTrue(self.pit.test_faceid_was_nacked(n1, 4))
+        self.assertFalse(self.pit.test_faceid_was_nacked(n1, 1))
+
+    def test_pickle_pit_entry(self):
+        """Test that a PIT entry keeps its state when pickled"""
+        n1 = Name("/test/data")
+        self.pit.add_pit_entry(n1, 1, Interest(n1))
+        self.pit.add_pit_entry(n1, 2, local_app=True)
+        self.pit.add_used_fib_entry(n1, ForwardingInformationBaseEntry(n1, [3], False))
+        entry = self.pit.find_pit_entry(n1)
+        entry.retransmits = 1
+        unpickled = pickle.loads(pickle.dumps(entry))
+        self.assertEqual(entry, unpickled)
+        self.assertEqual([1, 2], unpickled.faceids)
+        self.assertEqual([False, True], unpickled.local_app)
+        self.assertEqual(Interest(n1), unpickled.interest)
+        self.assertEqual(entry.fib_entries_already_used, unpickled.fib_entries_already_used)
+        self.assertEqual((entry.timestamp, 1), (unpickled.timestamp, unpickled.retransmits))
+
+    def test_ageing_retransmit_and_remove(self):
+        """Test that entries are retransmitted when their timer expires and removed after the retransmits"""
+        name = Name("/test/data")
+        interest = Interest(name)
+        self.pit.add_pit_entry(name, 1, interest)
+        self.assertEqual(self.pit.ageing(), ([], []))
+        retransmits = 0
+        removed = []
+        timeout = time.time() + 5
+        while len(removed) == 0 and time.time() < timeout:
+            time.sleep(0.1)
+            updated, removed = self.pit.ageing()
+            retransmits += len(updated)
+        self.assertEqual(retransmits, 2)
+        self.assertEqual(removed[0].interest, interest)
+        self.assertEqual(self.pit.get_container_size(), 0)
+
+    def test_update_timestamp_restarts_timer(self):
+        """Test that updating the timestamp resets the retransmits of an entry"""
+        name = Name("/test/data")
+        self.pit.add_pit_entry(name, 1)
+        time.sleep(0.3)
+        updated, removed = self.pit.ageing()
+        self.assertEqual(updated[0].retransmits, 1)
+        self.pit.update_timestamp(self.pit.find_pit_entry(name))
+        self.assertEqual(self.pit.find_pit_entry(name).retransmits, 0)
+        self.assertEqual(self.pit.ageing(), ([], []))
@@ -0,0 +1,147 @@
+"""ICN Forwarding Plane distributed over multiple worker processes"""
+
+import multiprocessing
+import zlib
+from typing import List, Optional
+
+from PiCN.Layers.ICNLayer.BasicICNLayer import BasicICNLayer
+from PiCN.Layers.PacketEncodingLayer.Encoder import BasicEncoder
+from PiCN.Packets import Name
+from PiCN.Processes import LayerProcess, QueueBatch, ShardedDataStructChannel
+
+
+def jump_consistent_hash(key: int, buckets: int) -> int:
+    """Jump consistent hash (Lamping, Veach): maps a key to one of the buckets, such that only 1/buckets of the keys
+    move if a bucket is added
+    :param key: 64 bit key
+    :param buckets: number of buckets
+    :return: bucket of the key
+    """
+    b, j = -1, 0
+    while j < buckets:
+        b = j
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((b + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return b
+
+
+def name_shard(name: Name, shards: int) -> int:
+    """shard responsible for a name. Uses a hash that is stable across processes (unlike hash(), which depends on
+    the hash seed of the interpreter), the digest of the name is not considered.
+    :param name: the name
+    :param shards: number of shards
+    :return: index of the shard
+    """
+    return jump_consistent_hash(zlib.crc32(name.components.key()), shards)
+
+
+class ShardDispatchQueue(object):
+    """Write-only queue that puts each [id, packet] item into the queue of the shard responsible for the packet
+    name. Batches are split into one batch per shard. Items without name are put into the queue of the first shard.
+    Used as queue to higher of the layer below a ShardedICNLayer, so packets are handed to the workers without a
+    detour through the dispatcher process.
+    :param queues: queues of the shards
+    """
+
+    def __init__(self, queues: List[multiprocessing.Queue]):
+        self._queues = queues
+
+    def shard_of(self, item) -> int:
+        name = getattr(item[1], 'name', None)
+        if not isinstance(name, Name):
+            return 0
+        return name_shard(name, len(self._queues))
+
+    def put(self, item, block=True, timeout=None):
+        if isinstance(item, QueueBatch):
+            batches = {}
+            for i in item:
+                batches.setdefault(self.shard_of(i), QueueBatch()).append(i)
+            for shard, batch in batches.items():
+                self._queues[shard].put(batch[0] if len(batch) == 1 else batch, block, timeout)
+        else:
+            self._queues[self.shard_of(item)].put(item, block, timeout)
+
+    def put_nowait(self, item):
+        self.put(item, False)
+
+    def close(self):
+        for q in self._queues:
+            q.close()
+
+    def join_thread(self):
+        for q in self._queues:
+            q.join_thread()
+
+
+class ShardedICNLayer(LayerProcess):
+    """ICN Forwarding Plane distributed over multiple BasicICNLayer worker processes. Each worker owns the CS and PIT
+    entries of a disjoint partition of the name space, chosen by a consistent hash of the name, and a replica of the
+    FIB. Packets are dispatched to the worker of their shard, workers put their output directly into the queues to
+    lower and to higher of this layer.
+    The layer process itself only dispatches packets arriving on its queues. For packets from the network, the layer
+    below should put into dispatch_queue instead, so they are dispatched in the process of the layer below.
+    The tables are accessed through the channel returned by create_data_struct_channel, ageing is executed by the
+    workers.
+    :param shards: number of worker processes
+    :param encoder: encoder of the packet encoding layer, if set CS hits are sent as cached wire format (see
+                    BasicICNLayer)
+    """
+
+    def __init__(self, shards: int=2, log_level=255, ageing_interval: int=3, encoder: BasicEncoder=None):
+        super().__init__(logger_name="ShardedICNLayer", log_level=log_level)
+        if shards < 1:
+            raise ValueError("At least one shard is required")
+        self.workers: List[BasicICNLayer] = [BasicICNLayer(log_level=log_level, ageing_interval=ageing_interval,
+                                                           encoder=encoder)
+                                             for i in range(shards)]
+        for worker in self.workers:
+            worker.queue_from_lower = multiprocessing.Queue()
+            worker.queue_from_higher = multiprocessing.Queue()
+        self.dispatch_queue: ShardDispatchQueue = ShardDispatchQueue([w.queue_from_lower for w in self.workers])
+        self._dispatch_queue_from_higher = ShardDispatchQueue([w.queue_from_higher for w in self.workers])
+
+    def shard_of(self, arg) -> Optional[int]:
+        """shard of a data struct call argument: a name, or an object with a name (e.g. content, PIT entry)
+        :param arg: first argument of a data struct call
+        :return: index of the shard, None if the argument does not select a shard
+        """
+        name = arg if isinstance(arg, Name) else getattr(arg, 'name', None)
+        if not isinstance(name, Name):
+            return None
+        return name_shard(name, len(self.workers))
+
+    def create_data_struct_channel(self) -> ShardedDataStructChannel:
+        """Let each worker take ownership of its CS, PIT and FIB. Must be called after the data structs of the workers
+        are set and before the layer is started. CS and PIT calls are forwarded to the worker of the name, FIB calls
+        to all workers.
+        :return: the channel to create proxies from ("cs", "pit", "fib")
+        """
+        channels = [w.create_data_struct_channel() for w in self.workers]
+        return ShardedDataStructChannel(channels, self.shard_of, replicated=("fib",))
+
+    def data_from_lower(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
+        self.dispatch_queue.put(data)
+
+    def data_from_higher(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
+        self._dispatch_queue_from_higher.put(data)
+
+    def ageing(self):
+        """Start the periodic ageing of all workers"""
+        for worker in self.workers:
+            worker.ageing()
+
+    def start_process(self):
+        for worker in self.workers:
+            worker.queue_to_lower = self.queue_to_lower
+            worker.queue_to_higher = self.queue_to_higher
+            worker.batch_size = self.batch_size
+            worker.coalesce_to_lower = self.coalesce_to_lower
+            worker.coalesce_to_higher = self.coalesce_to_higher
+            worker.start_process()
+        super().start_process()
+
+    def stop_process(self):
+        for worker in self.workers:
+            worker.stop_process()
+        super().stop_process()
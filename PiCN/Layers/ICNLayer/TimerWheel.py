@@ -0,0 +1,99 @@
+"""Hierarchical Timer Wheel for the expiry of ICN data struct entries"""
+
+import time
+from typing import Dict, List, Set
+
+
+class TimerWheel(object):
+    """Hierarchical Timer Wheel. Timers are identified by a hashable key, scheduling, rescheduling and canceling a
+    timer is O(1). advance() only touches the slots of the ticks that passed, instead of all scheduled timers.
+    :param resolution: length of a tick in seconds
+    :param slots: number of slots per wheel
+    :param levels: number of wheels, timers beyond the span of all wheels are cascaded until they are due
+    """
+
+    def __init__(self, resolution: float=0.1, slots: int=64, levels: int=4):
+        self._resolution = resolution
+        self._slots = slots
+        self._levels = levels
+        self._wheels: List[List[Set]] = [[set() for i in range(slots)] for l in range(levels)]
+        self._timers: Dict[object, List[int]] = {} # key -> [deadline tick, level, slot]
+        self._current_tick: int = self._tick(time.time())
+
+    def __len__(self):
+        return len(self._timers)
+
+    def __contains__(self, key):
+        return key in self._timers
+
+    def schedule(self, key, deadline: float):
+        """schedule or reschedule a timer
+        :param key: key identifying the timer
+        :param deadline: point in time (as returned by time.time()) at which the timer expires
+        """
+        if key in self._timers:
+            self.cancel(key)
+        self._place(key, max(self._tick(deadline), self._current_tick + 1))
+
+    def cancel(self, key):
+        """cancel a timer, if it exists
+        :param key: key identifying the timer
+        """
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            self._wheels[timer[1]][timer[2]].discard(key)
+
+    def advance(self, now: float=None) -> List:
+        """advance the wheel to the given point in time and return the keys of all expired timers
+        :param now: current time, time.time() if None
+        :return: keys of the expired timers, these timers are removed
+        """
+        target = self._tick(time.time() if now is None else now)
+        expired = []
+        while self._current_tick < target:
+            if len(self._timers) == 0:
+                self._current_tick = target
+                break
+            self._current_tick += 1
+            if self._current_tick % self._slots == 0:
+                self._cascade(1)
+            index = self._current_tick % self._slots
+            bucket = self._wheels[0][index]
+            if not bucket:
+                continue
+            remaining = set()
+            for key in bucket:
+                if self._timers[key][0] <= self._current_tick:
+                    del self._timers[key]
+                    expired.append(key)
+                else:
+                    remaining.add(key)
+            self._wheels[0][index] = remaining
+        return expired
+
+    def _tick(self, t: float) -> int:
+        return int(t / self._resolution)
+
+    def _place(self, key, deadline_tick: int):
+        """insert a timer into the wheel with the finest granularity that covers its deadline"""
+        level = 0
+        if deadline_tick - self._current_tick >= self._slots:
+            level = 1
+            while level < self._levels - 1 and \
+                    deadline_tick // self._slots ** level - self._current_tick // self._slots ** level > self._slots:
+                level += 1
+        index = (deadline_tick // self._slots ** level) % self._slots
+        self._wheels[level][index].add(key)
+        self._timers[key] = [deadline_tick, level, index]
+
+    def _cascade(self, level: int):
+        """move the timers of the current slot of a wheel to the wheels below"""
+        if level >= self._levels:
+            return
+        index = (self._current_tick // self._slots ** level) % self._slots
+        if index == 0:
+            self._cascade(level + 1)
+        bucket = self._wheels[level][index]
+        self._wheels[level][index] = set()
+        for key in bucket:
+            self._place(key, self._timers[key][0])
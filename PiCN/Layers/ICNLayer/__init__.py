@@ -8,4 +8,5 @@
 """
 
 from .BaseICNDataStruct import BaseICNDataStruct
-from .BasicICNLayer import BasicICNLayer
\ No newline at end of file
+from .BasicICNLayer import BasicICNLayer
+from .ShardedICNLayer import ShardedICNLayer
@@ -8,6 +8,7 @@ from PiCN.Layers.ICNLayer import BasicICNLayer
 from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact
 from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix
 from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterstTableMemoryExact
+from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder
 from PiCN.Packets import Name, Interest, Content, Nack, NackReason
 from PiCN.Processes import PiCNSyncDataStructFactory
 
@@ -176,6 +177,26 @@ class test_BasicICNLayer(unittest.TestCase):
         self.assertEqual(data, content)
         self.assertEqual(face_id, from_face_id)
 
+    def test_ICNLayer_interest_forward_content_match_cached_wire_format(self):
+        """Test ICN layer with CS entry matching, sending the encoded content kept in the CS"""
+        encoder = NdnTlvEncoder()
+        self.icn_layer._encoder = encoder
+        self.icn_layer.start_process()
+
+        content = Content("/test/data", "HelloWorld")
+        self.icn_layer.cs.add_content_object(content)
+        self.assertIsNone(self.icn_layer.cs.find_content_object(content.name).wire_format)
+
+        for i in range(2):
+            self.queue1_icn_routing_up.put([2, Interest("/test/data")])
+            try:
+                face_id, data = self.queue1_icn_routing_down.get(timeout=2.0)
+            except:
+                self.fail()
+            self.assertEqual(face_id, 2)
+            self.assertEqual(encoder.decode(data), content)
+            self.assertEqual(self.icn_layer.cs.find_content_object(content.name).wire_format, data)
+
     def test_ICNLayer_interest_forward_content_no_match(self):
         """Test ICN layer with CS entry no match"""
         self.icn_layer.start_process()
@@ -0,0 +1,89 @@
+"""Test the Sharded ICN Layer"""
+
+import multiprocessing
+import unittest
+
+from PiCN.Layers.ICNLayer import ShardedICNLayer
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix
+from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterstTableMemoryExact
+from PiCN.Layers.ICNLayer.ShardedICNLayer import name_shard, ShardDispatchQueue
+from PiCN.Packets import Name, Interest, Content
+from PiCN.Processes import QueueBatch, LocalQueue
+
+
+class test_ShardedICNLayer(unittest.TestCase):
+    """Test the Sharded ICN Layer"""
+
+    def setUp(self):
+        self.icn_layer = ShardedICNLayer(shards=3, log_level=255)
+        for worker in self.icn_layer.workers:
+            worker.cs = ContentStoreMemoryExact()
+            worker.fib = ForwardingInformationBaseMemoryPrefix()
+            worker.pit = PendingInterstTableMemoryExact()
+        self.channel = self.icn_layer.create_data_struct_channel()
+        self.cs = self.channel.get_proxy("cs", asynchronous_prefixes=())
+        self.fib = self.channel.get_proxy("fib", asynchronous_prefixes=())
+        self.pit = self.channel.get_proxy("pit", asynchronous_prefixes=())
+
+        self.queue_from_lower = multiprocessing.Queue()
+        self.queue_to_lower = multiprocessing.Queue()
+        self.icn_layer.queue_from_lower = self.queue_from_lower
+        self.icn_layer.queue_to_lower = self.queue_to_lower
+        self.icn_layer.queue_from_higher = multiprocessing.Queue()
+        self.icn_layer.queue_to_higher = multiprocessing.Queue()
+
+    def tearDown(self):
+        self.icn_layer.stop_process()
+        self.channel.close()
+
+    def test_name_shard(self):
+        """Test that names are distributed over all shards and only few move if a shard is added"""
+        names = [Name("/test/data/" + str(i)) for i in range(1000)]
+        shards = [name_shard(n, 4) for n in names]
+        self.assertEqual({0, 1, 2, 3}, set(shards))
+        self.assertEqual(shards, [name_shard(Name(n.to_string()), 4) for n in names])
+        moved = [s for n, s in zip(names, shards) if name_shard(n, 5) != s]
+        self.assertLess(len(moved), 300)
+        self.assertTrue(all(name_shard(n, 5) == 4 for n, s in zip(names, shards) if name_shard(n, 5) != s))
+
+    def test_dispatch_queue(self):
+        """Test that the dispatch queue splits batches by shard"""
+        queues = [LocalQueue() for i in range(2)]
+        dispatch_queue = ShardDispatchQueue(queues)
+        interests = [Interest("/test/data/" + str(i)) for i in range(20)]
+        dispatch_queue.put(QueueBatch([[1, i] for i in interests]))
+        dispatch_queue.put([2, interests[0]])
+        received = [[], []]
+        for shard, q in enumerate(queues):
+            while not q.empty():
+                item = q.get()
+                received[shard] += item if isinstance(item, QueueBatch) else [item]
+        for shard in range(2):
+            for faceid, interest in received[shard]:
+                self.assertEqual(shard, name_shard(interest.name, 2))
+        self.assertEqual(21, len(received[0]) + len(received[1]))
+
+    def test_forward_and_satisfy(self):
+        """Test forwarding interests and returning content over all shards"""
+        self.icn_layer.start_process()
+        self.fib.add_fib_entry(Name("/test"), [1], static=True)
+        names = [Name("/test/data/" + str(i)) for i in range(30)]
+        for i, name in enumerate(names):
+            q = self.icn_layer.dispatch_queue if i % 2 == 0 else self.queue_from_lower
+            q.put([2, Interest(name)])
+        forwarded = [self.queue_to_lower.get(timeout=5.0) for name in names]
+        self.assertEqual(set(names), {d[1].name for d in forwarded})
+        self.assertTrue(all(d[0] == 1 for d in forwarded))
+        self.assertEqual(30, self.pit.get_container_size())
+
+        for name in names:
+            self.icn_layer.dispatch_queue.put([1, Content(name, "content")])
+        returned = [self.queue_to_lower.get(timeout=5.0) for name in names]
+        self.assertEqual(set(names), {d[1].name for d in returned})
+        self.assertTrue(all(d[0] == 2 for d in returned))
+        self.assertEqual(0, self.pit.get_container_size())
+        self.assertEqual(30, self.cs.get_container_size())
+        for name in names:
+            self.assertEqual(name, self.cs.find_content_object(name).name)
+        self.assertEqual([1], self.fib.find_fib_entry(Name("/test/data/1")).faceid)
@@ -0,0 +1,54 @@
+"""Tests for the hierarchical Timer Wheel"""
+
+import random
+import unittest
+
+from PiCN.Layers.ICNLayer.TimerWheel import TimerWheel
+
+
+class test_TimerWheel(unittest.TestCase):
+
+    def setUp(self):
+        self.wheel: TimerWheel = TimerWheel(resolution=1.0, slots=4, levels=3)
+        self.now = self.wheel._current_tick
+
+    def test_expire_in_order(self):
+        """Test that timers expire when their deadline is reached"""
+        self.wheel.schedule("a", self.now + 2)
+        self.wheel.schedule("b", self.now + 30)
+        self.assertEqual(self.wheel.advance(self.now + 1), [])
+        self.assertEqual(self.wheel.advance(self.now + 2), ["a"])
+        self.assertEqual(self.wheel.advance(self.now + 29), [])
+        self.assertEqual(self.wheel.advance(self.now + 31), ["b"])
+        self.assertEqual(len(self.wheel), 0)
+
+    def test_cancel_and_reschedule(self):
+        """Test canceling and rescheduling timers"""
+        self.wheel.schedule("a", self.now + 2)
+        self.wheel.schedule("b", self.now + 2)
+        self.wheel.cancel("a")
+        self.wheel.schedule("b", self.now + 10)
+        self.assertNotIn("a", self.wheel)
+        self.assertEqual(self.wheel.advance(self.now + 5), [])
+        self.assertEqual(self.wheel.advance(self.now + 10), ["b"])
+
+    def test_deadline_in_past(self):
+        """Test that a deadline in the past expires with the next tick"""
+        self.wheel.schedule("a", self.now - 10)
+        self.assertEqual(self.wheel.advance(self.now + 1), ["a"])
+
+    def test_random_against_reference(self):
+        """Test the wheel against a plain dict of deadlines, including timers beyond the wheel span"""
+        deadlines = {}
+        now = self.now
+        for step in range(500):
+            key = random.randrange(50)
+            deadline = now + random.randint(1, 200)
+            self.wheel.schedule(key, deadline)
+            deadlines[key] = deadline
+            now += random.randint(0, 7)
+            expired = self.wheel.advance(now)
+            expected = [k for k, d in deadlines.items() if d <= now]
+            self.assertEqual(sorted(expired), sorted(expected))
+            for k in expired:
+                del deadlines[k]
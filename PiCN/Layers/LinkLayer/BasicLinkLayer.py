@@ -1,11 +1,12 @@
 """Default Link Layer implementation for PiCN"""
+import asyncio
 import multiprocessing
 import select
 import socket
 
-from typing import List
+from typing import Dict, List, Tuple
 
-from PiCN.Processes import LayerProcess
+from PiCN.Processes import LayerProcess, BatchingQueue
 
 from PiCN.Layers.LinkLayer.Interfaces import AddressInfo
 from PiCN.Layers.LinkLayer.Interfaces import BaseInterface
@@ -24,16 +25,20 @@ class BasicLinkLayer(LayerProcess):
         self.interfaces = interfaces
         self.faceidtable = faceidtable
 
-    def data_from_lower(self, interface: BaseInterface, to_higher: multiprocessing.Queue, data):
+    def data_from_lower(self, interface: BaseInterface, to_higher: multiprocessing.Queue, data,
+                        interface_id: int=None):
         """In the Linklayer, it handles received data, to lower is the network interface
         :param interface: Network interface, that received the data
         :param to_higher: queue to the higher layer
         :param data: received data
+        :param interface_id: index of the interface, looked up if not given
         """
         packet = data[0]
         addr = data[1]
 
-        addr_info = AddressInfo(addr, self.interfaces.index(interface))
+        if interface_id is None:
+            interface_id = self.interfaces.index(interface)
+        addr_info = AddressInfo(addr, interface_id)
         faceid = self.faceidtable.get_or_create_faceid(addr_info)
         self.logger.info("Got data from Network and from Face ID: " + str(faceid) + ", addr: " + str(addr_info.address))
         to_higher.put([faceid, packet])
@@ -45,6 +50,29 @@ class BasicLinkLayer(LayerProcess):
         :param data: data to be send
         """
 
+        self._send(data, queued=False)
+
+    def data_from_higher_batch(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, batch):
+        """queue the packets of a batch on their interfaces and send them in a burst per interface"""
+        interfaces = set()
+        for data in batch:
+            interface_id = self._send(data, queued=True)
+            if interface_id is not None:
+                interfaces.add(interface_id)
+        for interface_id in interfaces:
+            try:
+                failed = self.interfaces[interface_id].flush()
+            except:
+                self.logger.error("Could not flush interface with ID " + str(interface_id))
+                continue
+            for addr, error in failed:
+                self.logger.error("Could not send packet to " + str(addr) + " on interface with ID " +
+                                  str(interface_id) + ": " + str(error))
+
+    def _send(self, data, queued: bool):
+        """send data to the face, or queue it on the interface of the face
+        :return: index of the interface, None if the face is unknown
+        """
         faceid = data[0]
         packet = data[1]
         self.logger.info("Got data from Higher Layer with faceid: " + str(faceid))
@@ -52,55 +80,132 @@ class BasicLinkLayer(LayerProcess):
         addr_info = self.faceidtable.get_address_info(faceid)
         if not addr_info:
             self.logger.error("No addr_info found for faceid: " + str(faceid))
-            return
+            return None
         try:
-            self.interfaces[addr_info.interface_id].send(packet, addr_info.address)
+            interface = self.interfaces[addr_info.interface_id]
+            if queued:
+                interface.queue_send(packet, addr_info.address)
+            else:
+                interface.send(packet, addr_info.address)
         except:
             self.logger.error("Could not sned packet to" + str(addr_info.address) + " Interface with ID" +
-                              addr_info.interface_id + " not available")
+                              str(addr_info.interface_id) + " not available")
+            return None
         self.logger.info("Send packet to: " + str(addr_info.address))
+        return addr_info.interface_id
+
+    def _interface_map(self) -> Dict[int, Tuple[BaseInterface, int]]:
+        """map the file descriptor numbers of the interfaces to the interfaces and their index"""
+        return {interface.file_descriptor.fileno(): (interface, index)
+                for index, interface in enumerate(self.interfaces)}
+
+    def _receive_from_interface_fd(self, interface_map: Dict[int, Tuple[BaseInterface, int]], fd: int,
+                                   to_higher: multiprocessing.Queue) -> bool:
+        """receive all data available on a readable interface file descriptor
+        :return: False if the file descriptor does not belong to an interface
+        """
+        entry = interface_map.get(fd)
+        if entry is None:
+            return False
+        interface, interface_id = entry
+        if self.coalesce_to_higher:
+            to_higher = BatchingQueue(to_higher)
+        try:
+            for data in interface.receive_burst():
+                self.data_from_lower(interface, to_higher, data, interface_id)
+        finally:
+            if self.coalesce_to_higher:
+                to_higher.flush()
+        return True
+
+    def _run(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
+             to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
+        """Use epoll if available, it has no limit on the number of file descriptors"""
+        if hasattr(select, 'epoll'):
+            self._run_epoll(from_lower, from_higher, to_lower, to_higher)
+        else:
+            super()._run(from_lower, from_higher, to_lower, to_higher)
+
+    def _run_epoll(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
+                   to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
+        interface_map = self._interface_map()
+        higher_fd = from_higher._reader.fileno()
+        control = self._queue_control
+        control_fd = control._reader.fileno() if control else None
+        poller = select.epoll()
+        READ_ONLY = select.EPOLLIN | select.EPOLLPRI | select.EPOLLHUP | select.EPOLLERR
+        for fd in interface_map:
+            poller.register(fd, READ_ONLY)
+        poller.register(higher_fd, READ_ONLY)
+        if control:
+            poller.register(control_fd, READ_ONLY)
+        try:
+            while True:
+                for fd, _ in poller.poll():
+                    if fd == higher_fd:
+                        self._handle_from_higher(from_higher, to_lower, to_higher)
+                    elif fd == control_fd:
+                        if not control.empty():
+                            self.data_from_control(control.get())
+                    elif not self._receive_from_interface_fd(interface_map, fd, to_higher):
+                        return
+        finally:
+            poller.close()
 
     def _run_poll(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
                   to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
+        interface_map = self._interface_map()
+        higher_fd = from_higher._reader.fileno()
+        control = self._queue_control
+        control_fd = control._reader.fileno() if control else None
+        poller = select.poll()
+        READ_ONLY = select.POLLIN | select.POLLPRI | select.POLLHUP | select.POLLERR
+        for fd in interface_map:
+            poller.register(fd, READ_ONLY)
+        poller.register(higher_fd, READ_ONLY)
+        if control:
+            poller.register(control_fd, READ_ONLY)
         while True:
-            poller = select.poll()
-            READ_ONLY = select.POLLIN | select.POLLPRI | select.POLLHUP | select.POLLERR
-            fds = list(map(lambda x: x.file_descriptor, self.interfaces))
-            for fd in fds:
-                poller.register(fd, READ_ONLY)
-            poller.register(from_higher._reader, READ_ONLY)
-            ready_fds = poller.poll()
-            for fd in ready_fds:
-                if fd[0] == from_higher._reader.fileno():
-                    data = from_higher.get()
-                    self.data_from_higher(to_lower, to_higher, data)
-                else:
-                    interfaces = list(filter(lambda x: x.file_descriptor.fileno() == fd[0], self.interfaces))
-                    try:
-                        interface = interfaces[0]
-                    except:
-                        return
-                    data = interface.receive()
-                    self.data_from_lower(interface, to_higher, data)
+            for fd, _ in poller.poll():
+                if fd == higher_fd:
+                    self._handle_from_higher(from_higher, to_lower, to_higher)
+                elif fd == control_fd:
+                    if not control.empty():
+                        self.data_from_control(control.get())
+                elif not self._receive_from_interface_fd(interface_map, fd, to_higher):
+                    return
 
     def _run_select(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
                     to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
+        interface_map = self._interface_map()
+        higher_fd = from_higher._reader.fileno()
+        control = self._queue_control
+        control_fd = control._reader.fileno() if control else None
+        fds = list(interface_map.keys()) + [higher_fd]
+        if control:
+            fds.append(control_fd)
         while True:
-            fds = list(map(lambda x: x.file_descriptor, self.interfaces))
-            fds.append(from_higher._reader)
             ready_fds, _, _ = select.select(fds, [], [])
             for fd in ready_fds:
-                if fd == from_higher._reader:
-                    data = from_higher.get()
-                    self.data_from_higher(to_lower, to_higher, data)
-                else:
-                    interfaces = list(filter(lambda x: x.file_descriptor == fd, self.interfaces))
-                    try:
-                        interface = interfaces[0]
-                    except:
-                        return
-                    data = interface.receive()
-                    self.data_from_lower(interface, to_higher, data)
+                if fd == higher_fd:
+                    self._handle_from_higher(from_higher, to_lower, to_higher)
+                elif fd == control_fd:
+                    if not control.empty():
+                        self.data_from_control(control.get())
+                elif not self._receive_from_interface_fd(interface_map, fd, to_higher):
+                    return
+
+    async def _run_async(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
+                         to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
+        loop = asyncio.get_event_loop()
+        interface_map = self._interface_map()
+        for fd in interface_map:
+            loop.add_reader(fd, self._receive_from_interface_fd, interface_map, fd, to_higher)
+        try:
+            await super()._run_async(None, from_higher, to_lower, to_higher)
+        finally:
+            for fd in interface_map:
+                loop.remove_reader(fd)
 
     def _run_sleep(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
                    to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
@@ -1,6 +1,8 @@
 """Abstract Superclass for a PiCN Interface"""
 
 import abc
+from typing import List, Optional, Tuple
+
 from . import BaseInterface
 
 class AddressInfo(object):
@@ -32,12 +34,39 @@ class BaseInterface(object):
         :param data: data to be sent
         """
 
+    def queue_send(self, data, addr):
+        """queue data to be sent on the next flush. Should be overwritten if an interface implementation can send a
+        burst of data more efficiently than single packets.
+        :param addr: addr to send the data to
+        :param data: data to be sent
+        """
+        self.send(data, addr)
+
+    def flush(self) -> List[Tuple]:
+        """send all queued data, a failing send does not prevent sending the remaining data
+        :return List of tuples of addr and error of the data which could not be sent
+        """
+        return []
+
+    @property
+    def max_receive_size(self) -> Optional[int]:
+        """maximum size of a received packet in bytes, larger packets are truncated. None if not limited"""
+        return None
+
     @abc.abstractmethod
     def receive(self):
         """receives data from the socket
         :return Tuple of received data and addr from which the data where received
         """
 
+    def receive_burst(self, max_packets: int=64) -> List[Tuple]:
+        """receives all data that is available without blocking, called if the file descriptor is readable. Should be
+        overwritten if an interface implementation can receive without blocking.
+        :param max_packets: maximum number of packets to receive
+        :return List of tuples of received data and addr from which the data where received
+        """
+        return [self.receive()]
+
     @property
     @abc.abstractmethod
     def file_descriptor(self):
@@ -1,29 +1,80 @@
 """Implementation of an Interface using UDP4 for communication"""
 
 import socket
+from typing import List, Tuple
 
 from PiCN.Layers.LinkLayer.Interfaces import BaseInterface
 
 
 class UDP4Interface(BaseInterface):
     """Implementation of an Interface using UDP4 for communication
-    :param listen
-
+    Datagrams are received into a reusable buffer and copied out once with their exact size. Packets queued for sending
+    are sent in order on flush, with one sendto per datagram (Python has no sendmmsg binding). A datagram which cannot
+    be sent is skipped and reported by flush.
+    :param listen_port: port to bind to, 0 for any free port
+    :param buffersize: maximum size of a received datagram, larger datagrams are truncated
+    :param rcvbuf_size: size of the kernel receive buffer (SO_RCVBUF), system default if None
+    :param sndbuf_size: size of the kernel send buffer (SO_SNDBUF), system default if None
     """
 
-    def __init__(self, listen_port: int, buffersize: int=8192):
+    def __init__(self, listen_port: int, buffersize: int=8192, rcvbuf_size: int=None, sndbuf_size: int=None):
         self.listen_port = listen_port
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        if rcvbuf_size is not None:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf_size)
+        if sndbuf_size is not None:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf_size)
         self.sock.bind(("0.0.0.0", self.listen_port))
 
         self._buffersize = buffersize
+        self._receive_buffer = bytearray(buffersize)
+        self._receive_view = memoryview(self._receive_buffer)
+        self._send_queue: List[Tuple] = []
 
     def send(self, data, addr):
         self.sock.sendto(data, addr)
 
+    def queue_send(self, data, addr):
+        self._send_queue.append((data, addr))
+
+    def flush(self) -> List[Tuple]:
+        send_queue = self._send_queue
+        self._send_queue = []
+        sendto = self.sock.sendto
+        failed = []
+        for data, addr in send_queue:
+            try:
+                sendto(data, addr)
+            except OSError as e:
+                failed.append((addr, e))
+        return failed
+
     def receive(self):
-        data, addr = self.sock.recvfrom(self._buffersize)
-        return data, addr
+        size, addr = self.sock.recvfrom_into(self._receive_buffer)
+        return bytes(self._receive_view[:size]), addr
+
+    def receive_burst(self, max_packets: int=64) -> List[Tuple]:
+        """receives datagrams until the socket would block, without changing the blocking mode of the socket"""
+        packets = []
+        buffer = self._receive_buffer
+        view = self._receive_view
+        recvfrom_into = self.sock.recvfrom_into
+        try:
+            while len(packets) < max_packets:
+                size, addr = recvfrom_into(buffer, 0, socket.MSG_DONTWAIT)
+                packets.append((bytes(view[:size]), addr))
+        except BlockingIOError:
+            pass
+        return packets
+
+    def get_buffer_sizes(self) -> Tuple[int, int]:
+        """Returns the sizes of the kernel receive and send buffer, as set by the kernel"""
+        return self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF), \
+               self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF)
+
+    @property
+    def max_receive_size(self) -> int:
+        return self._buffersize
 
     @property
     def file_descriptor(self):
@@ -1,6 +1,8 @@
 """Test the UDP4 Interface"""
 
+import select
 import socket
+import time
 import unittest
 
 from PiCN.Layers.LinkLayer.Interfaces import UDP4Interface
@@ -30,6 +32,25 @@ class test_UDP4Interface(unittest.TestCase):
         self.assertEqual(data, b"HelloWorld")
         self.assertEqual(addr, ("127.0.0.1", test_sock.getsockname()[1]))
 
+    def test_receiving_burst(self):
+        """test receiving all available datagrams without blocking"""
+        test_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        test_sock.bind(("0.0.0.0", 0))
+        port = self.interface1.get_port()
+
+        self.assertEqual([], self.interface1.receive_burst())
+        for i in range(10):
+            test_sock.sendto(bytes([i]), ("127.0.0.1", port))
+        time.sleep(0.1)
+
+        packets = self.interface1.receive_burst(max_packets=8)
+        self.assertEqual([bytes([i]) for i in range(8)], [p[0] for p in packets])
+        packets = self.interface1.receive_burst()
+        self.assertEqual([bytes([8]), bytes([9])], [p[0] for p in packets])
+        self.assertEqual(("127.0.0.1", test_sock.getsockname()[1]), packets[0][1])
+        self.assertEqual([], self.interface1.receive_burst())
+        test_sock.close()
+
     def test_sending_data(self):
         "test sending data"
         test_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -43,6 +64,50 @@ class test_UDP4Interface(unittest.TestCase):
         self.assertEqual(data, b"HelloWorld")
         self.assertEqual(addr, ("127.0.0.1", self.interface1.get_port()))
 
+    def test_sending_queued_data(self):
+        "test that queued data is sent on flush, in order"
+        test_socks = [socket.socket(socket.AF_INET, socket.SOCK_DGRAM) for i in range(2)]
+        for test_sock in test_socks:
+            test_sock.bind(("0.0.0.0", 0))
+            test_sock.settimeout(2.0)
+        addrs = [("127.0.0.1", test_sock.getsockname()[1]) for test_sock in test_socks]
+
+        for i in range(4):
+            self.interface1.queue_send(bytes([i]), addrs[i % 2])
+        time.sleep(0.1)
+        self.assertEqual([], select.select(test_socks, [], [], 0)[0])
+        self.interface1.flush()
+
+        self.assertEqual([b"\x00", b"\x02"], [test_socks[0].recvfrom(8192)[0] for i in range(2)])
+        self.assertEqual([b"\x01", b"\x03"], [test_socks[1].recvfrom(8192)[0] for i in range(2)])
+        for test_sock in test_socks:
+            test_sock.close()
+
+    def test_flush_skips_failed_data(self):
+        "test that data which cannot be sent does not prevent sending the remaining queued data"
+        test_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        test_sock.bind(("0.0.0.0", 0))
+        test_sock.settimeout(2.0)
+        port = test_sock.getsockname()[1]
+
+        self.interface1.queue_send(b"Unresolvable", ("unresolvable.invalid", port))
+        self.interface1.queue_send(b"HelloWorld", ("127.0.0.1", port))
+        failed = self.interface1.flush()
+
+        self.assertEqual(b"HelloWorld", test_sock.recvfrom(8192)[0])
+        self.assertEqual(1, len(failed))
+        self.assertEqual(("unresolvable.invalid", port), failed[0][0])
+        self.assertIsInstance(failed[0][1], OSError)
+        test_sock.close()
+
+    def test_buffer_sizes(self):
+        "test setting the kernel buffer sizes"
+        interface = UDP4Interface(0, rcvbuf_size=65536, sndbuf_size=32768)
+        rcvbuf, sndbuf = interface.get_buffer_sizes()
+        interface.close()
+        self.assertGreaterEqual(rcvbuf, 65536) # linux doubles the requested size
+        self.assertGreaterEqual(sndbuf, 32768)
+
     def test_send_receive(self):
         "test sending and receiving data"
         self.interface1.send(b"HelloWorld", ("127.0.0.1", self.interface2.get_port()))
@@ -67,6 +67,18 @@ class test_BasicLinkLayer(unittest.TestCase):
         self.assertEqual(self.linklayer1.faceidtable.get_address_info(0).address[1], self.test_port)
         self.assertEqual(self.linklayer1.faceidtable.get_address_info(0).interface_id, 0)
 
+    def test_receiving_a_burst(self):
+        """Test if a burst of packets is received completely and in order"""
+        self.linklayer1.start_process()
+        for i in range(100):
+            self.testSock.sendto(str(i).encode(), ("127.0.0.1", self.udp4interface1.get_port()))
+
+        for i in range(100):
+            faceid, packet = self.linklayer1.queue_to_higher.get(timeout=2.0)
+            self.assertEqual(0, faceid)
+            self.assertEqual(str(i), packet.decode())
+        self.assertEqual(self.linklayer1.faceidtable.get_num_entries(), 1)
+
     def test_sending_a_packet(self):
         """Test if a packet is sent correctly"""
         self.linklayer1.start_process()
@@ -78,6 +90,35 @@ class test_BasicLinkLayer(unittest.TestCase):
         data, addr = self.testSock.recvfrom(8192)
         self.assertEqual(data.decode(), "HelloWorld")
 
+    def test_sending_a_batch(self):
+        """Test if a batch of packets is sent completely and in order"""
+        self.linklayer1.batch_size = 16
+        self.linklayer1.start_process()
+        fid = self.linklayer1.faceidtable.get_or_create_faceid(AddressInfo(("127.0.0.1", self.test_port), 0))
+        for i in range(50):
+            self.linklayer1.queue_from_higher.put([fid, str(i).encode()])
+
+        self.testSock.settimeout(2.0)
+        for i in range(50):
+            data, addr = self.testSock.recvfrom(8192)
+            self.assertEqual(str(i), data.decode())
+
+    def test_control_queue(self):
+        """Test if commands on the control queue are handled in all process loops"""
+        for run in ['_run_epoll', '_run_poll', '_run_select']:
+            linklayer = BasicLinkLayer([UDP4Interface(0)], self.faceidtable1)
+            linklayer.queue_to_higher = multiprocessing.Queue()
+            linklayer.queue_from_higher = multiprocessing.Queue()
+            linklayer.queue_control = multiprocessing.Queue()
+            linklayer.data_from_control = lambda data, q=linklayer.queue_to_higher: q.put(["control", data])
+            linklayer._run = getattr(linklayer, run)
+            linklayer.start_process()
+            try:
+                linklayer.queue_control.put("command")
+                self.assertEqual(["control", "command"], linklayer.queue_to_higher.get(timeout=2.0), run)
+            finally:
+                linklayer.stop_process()
+
     def test_sending_and_receiving_a_packet(self):
         """Test sending/receiving in a single case"""
         self.linklayer1.start_process()
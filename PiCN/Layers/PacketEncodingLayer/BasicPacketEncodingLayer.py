@@ -6,7 +6,9 @@ from PiCN.Processes import LayerProcess
 
 
 class BasicPacketEncodingLayer(LayerProcess):
-    """ De- and Encoding Layer, using a predefined Encoder """
+    """ De- and Encoding Layer, using a predefined Encoder
+    Packets from higher that are already encoded (bytes, e.g. cached by the content store) are passed to lower unchanged.
+    """
 
     def __init__(self, encoder: BasicEncoder=None, log_level=255):
         LayerProcess.__init__(self, logger_name="PktEncLayer", log_level=log_level)
@@ -24,6 +26,9 @@ class BasicPacketEncodingLayer(LayerProcess):
         face_id, packet = self.check_data(data)
         if face_id == None or packet is None:
             return
+        if isinstance(packet, (bytes, bytearray)):
+            to_lower.put([face_id, packet])
+            return
         self.logger.info("Packet from higher, Faceid: " + str(face_id) + ", Name: " + str(packet.name))
         encoded_packet = self.encode(packet)
         if encoded_packet is None:
@@ -31,6 +36,19 @@ class BasicPacketEncodingLayer(LayerProcess):
             return
         to_lower.put([face_id, encoded_packet])
 
+    def data_from_higher_batch(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, batch):
+        """encode a batch at once, so the encoder can share work between the packets (e.g. parallel signing)"""
+        checked = [self.check_data(data) for data in batch]
+        checked = [(face_id, packet) for face_id, packet in checked if face_id is not None and packet is not None]
+        encoded_packets = iter(self._encoder.encode_all([packet for _, packet in checked
+                                                         if not isinstance(packet, (bytes, bytearray))]))
+        for face_id, packet in checked: # already encoded packets keep their position in the batch
+            encoded_packet = packet if isinstance(packet, (bytes, bytearray)) else next(encoded_packets)
+            if encoded_packet is None:
+                self.logger.info("Dropping Packet since None")
+                continue
+            to_lower.put([face_id, encoded_packet])
+
     def data_from_lower(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
         face_id, packet = self.check_data(data)
         if face_id == None or packet == None:
@@ -1,6 +1,8 @@
 """Abstract Encoder for the BasicPacketEncoding Layer"""
 
 import abc
+from typing import List
+
 from PiCN.Packets import Packet
 from PiCN.Logger import Logger
 
@@ -23,6 +25,10 @@ class BasicEncoder(object):
     def decode(self, wire_data) -> Packet:
         """decode a packet to Packet data structure"""
 
+    def encode_all(self, packets: List[Packet]) -> List:
+        """encode a burst of packets, encoders may overwrite this to share work between the packets"""
+        return [self.encode(packet) for packet in packets]
+
     def __getstate__(self):
         d = dict(self.__dict__)
         if 'logger' in d:
@@ -0,0 +1,140 @@
+"""Compact, binary safe Packet Encoder for the BasicPacketEncodingLayer"""
+
+import struct
+
+from PiCN.Layers.PacketEncodingLayer.Encoder import BasicEncoder
+from PiCN.Packets import Packet, Content, LazyContent, Interest, Name, Nack, NackReason, UnknownPacket
+
+
+class CompactEncoder(BasicEncoder):
+    """
+    Compact, binary safe Packet Encoder, replacement for the SimpleStringEncoder.
+    All fields are length-prefixed, so names and payloads are never escaped. Packets are written in a single pass into a
+    preallocated buffer and decoded on a memoryview, content decoded from bytes keeps the wire format and slices the
+    payload out of it on demand (see LazyContent).
+
+    Wire format (big endian):
+        packet    = type (1 byte) | flags (1 byte) | name | body
+        name      = component count (2 bytes) | (component length (2 bytes) | component)* | [digest (32 bytes)]
+        Interest  = empty body
+        Content   = payload length (4 bytes) | payload
+        Nack      = reason length (1 byte) | reason (NackReason value, utf-8)
+    The digest is present if the digest flag is set. The type values differ from the first byte of packets of the
+    SimpleStringEncoder and the NdnTlvEncoder.
+    Packets with a field exceeding its length prefix (e.g. a name component of more than 65535 bytes) or a digest which is
+    not 32 bytes long cannot be encoded and are dropped. The interest of a Nack is not transmitted, a decoded Nack carries an interest for its name.
+    """
+
+    TYPE_INTEREST = 0xA1
+    TYPE_CONTENT = 0xA2
+    TYPE_NACK = 0xA3
+    FLAG_DIGEST = 0x01
+    DIGEST_SIZE = 32
+
+    _HEADER = struct.Struct('>BBH') # type, flags, component count
+    _U8 = struct.Struct('>B')
+    _U16 = struct.Struct('>H')
+    _U32 = struct.Struct('>I')
+
+    def __init__(self, log_level=255):
+        super().__init__(logger_name="CompactEnc", log_level=log_level)
+
+    def encode(self, packet: Packet):
+        if isinstance(packet, Interest):
+            self.logger.info("Encode interest")
+            return self._encode_packet(self.TYPE_INTEREST, packet.name, b'', None)
+        elif isinstance(packet, Content):
+            self.logger.info("Encode content object")
+            wire_format = packet.wire_format
+            if isinstance(wire_format, bytes) and len(wire_format) > 0 and wire_format[0] == self.TYPE_CONTENT:
+                return wire_format # decoded or encoded before by this encoder
+            return self._encode_packet(self.TYPE_CONTENT, packet.name, packet.payload_view(), self._U32)
+        elif isinstance(packet, Nack):
+            self.logger.info("Encode NACK")
+            return self._encode_packet(self.TYPE_NACK, packet.name, packet.reason.value.encode(), self._U8)
+        elif isinstance(packet, UnknownPacket):
+            return packet.wire_format
+        return None
+
+    def decode(self, wire_data) -> Packet:
+        try:
+            with memoryview(wire_data) as view:
+                packet_type, flags, count = self._HEADER.unpack_from(view, 0)
+                if packet_type not in [self.TYPE_INTEREST, self.TYPE_CONTENT, self.TYPE_NACK]:
+                    self.logger.info("Decode failed (unknown packet type)")
+                    return UnknownPacket(wire_format=wire_data)
+                name, offset = self._decode_name(view, self._HEADER.size, flags, count)
+                if packet_type == self.TYPE_INTEREST:
+                    self.logger.info("Decode interest")
+                    return Interest(name)
+                elif packet_type == self.TYPE_CONTENT:
+                    self.logger.info("Decode content object")
+                    length = self._U32.unpack_from(view, offset)[0]
+                    offset += self._U32.size
+                    self._check_length(view, offset + length)
+                    if isinstance(wire_data, bytes):
+                        return LazyContent(name, wire_data, offset, length)
+                    return Content(name, bytes(view[offset:offset + length]))
+                else:
+                    self.logger.info("Decode NACK")
+                    length = view[offset]
+                    self._check_length(view, offset + 1 + length)
+                    reason = NackReason(bytes(view[offset + 1:offset + 1 + length]).decode())
+                    return Nack(name, reason, Interest(name))
+        except (struct.error, IndexError, ValueError):
+            self.logger.info("Decode failed (malformed packet)")
+            return UnknownPacket(wire_format=wire_data)
+
+    def _encode_packet(self, packet_type: int, name: Name, body, body_length: struct.Struct) -> bytes:
+        """write header, name and length-prefixed body into one buffer"""
+        components = [c.encode() if isinstance(c, str) else c for c in name.components]
+        if len(components) > 0xFFFF or any(len(c) > 0xFFFF for c in components) or \
+                (name.digest and len(name.digest) != self.DIGEST_SIZE) or \
+                (body_length is not None and len(body) >= 1 << (8 * body_length.size)):
+            self.logger.warning("Encode failed (field does not fit its length prefix or size), dropping " + str(name))
+            return None
+        flags = self.FLAG_DIGEST if name.digest else 0
+        size = self._HEADER.size + 2 * len(components) + sum(len(c) for c in components)
+        if name.digest:
+            size += self.DIGEST_SIZE
+        if body_length is not None:
+            size += body_length.size
+        size += len(body)
+        buffer = bytearray(size)
+        self._HEADER.pack_into(buffer, 0, packet_type, flags, len(components))
+        offset = self._HEADER.size
+        for c in components:
+            self._U16.pack_into(buffer, offset, len(c))
+            offset += 2
+            buffer[offset:offset + len(c)] = c
+            offset += len(c)
+        if name.digest:
+            buffer[offset:offset + self.DIGEST_SIZE] = name.digest
+            offset += self.DIGEST_SIZE
+        if body_length is not None:
+            body_length.pack_into(buffer, offset, len(body))
+            offset += body_length.size
+        buffer[offset:] = body
+        return bytes(buffer)
+
+    def _decode_name(self, view: memoryview, offset: int, flags: int, count: int):
+        """decode the name following the header
+        :return: the name and the offset after it
+        """
+        components = []
+        for _ in range(count):
+            length = self._U16.unpack_from(view, offset)[0]
+            offset += 2
+            self._check_length(view, offset + length)
+            components.append(bytes(view[offset:offset + length]))
+            offset += length
+        name = Name(components)
+        if flags & self.FLAG_DIGEST:
+            self._check_length(view, offset + self.DIGEST_SIZE)
+            name.digest = bytes(view[offset:offset + self.DIGEST_SIZE])
+            offset += self.DIGEST_SIZE
+        return name, offset
+
+    def _check_length(self, view: memoryview, end: int):
+        if end > len(view):
+            raise ValueError("Field exceeds packet")
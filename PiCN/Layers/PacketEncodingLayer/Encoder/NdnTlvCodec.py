@@ -0,0 +1,535 @@
+"""Fast NDN-TLV codec used by the NdnTlvEncoder.
+Packets are encoded in a single forward pass into a preallocated bytearray: all lengths are known up front, since the
+encoding of a name is computed first. Packets are decoded on a memoryview, only the name components and the payload
+are copied out of the wire format.
+"""
+
+import hashlib
+import os
+import struct
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from PiCN.Packets import Name
+
+TLV_INTEREST = 5
+TLV_DATA = 6
+TLV_NAME = 7
+TLV_IMPLICIT_SHA256_DIGEST_COMPONENT = 1
+TLV_NAME_COMPONENT = 8
+TLV_NONCE = 10
+TLV_META_INFO = 20
+TLV_CONTENT = 21
+TLV_SIGNATURE_INFO = 22
+TLV_SIGNATURE_VALUE = 23
+TLV_SIGNATURE_TYPE = 27
+TLV_LP_PACKET = 100
+TLV_LP_FRAGMENT = 80
+TLV_LP_SEQUENCE = 81
+TLV_LP_FRAG_INDEX = 82
+TLV_LP_FRAG_COUNT = 83
+TLV_LP_NACK = 800
+TLV_LP_NACK_REASON = 801
+
+NONCE_SIZE = 4
+SIGNATURE_SIZE = 32
+LP_SEQUENCE_SIZE = 8
+
+_VAR16 = struct.Struct('>BH')
+_VAR32 = struct.Struct('>BI')
+_VAR64 = struct.Struct('>BQ')
+_U16 = struct.Struct('>H')
+_U32 = struct.Struct('>I')
+_U64 = struct.Struct('>Q')
+
+_META_INFO = bytes([TLV_META_INFO, 0]) # empty
+_SIGNATURE_INFO = bytes([TLV_SIGNATURE_INFO, 3, TLV_SIGNATURE_TYPE, 1, 0]) # DigestSha256
+_SIGNATURE_VALUE_HEADER = bytes([TLV_SIGNATURE_VALUE, SIGNATURE_SIZE])
+
+
+class NoncePool(object):
+    """Nonces taken from a pool of random bytes, which is refilled by a single os.urandom call when it is used up.
+    The pool is discarded in child processes after a fork, so processes never share nonces.
+    :param size: number of random bytes fetched at once
+    """
+
+    def __init__(self, size: int=4096):
+        self._size = size
+        self._pool = b''
+        self._offset = 0
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self.discard)
+
+    def discard(self):
+        """drop the remaining random bytes"""
+        self._pool = b''
+        self._offset = 0
+
+    def take(self, n: int=NONCE_SIZE) -> bytes:
+        """take n random bytes from the pool"""
+        if self._offset + n > len(self._pool):
+            self._pool = os.urandom(max(self._size, n))
+            self._offset = 0
+        nonce = self._pool[self._offset:self._offset + n]
+        self._offset += n
+        return nonce
+
+
+nonce_pool = NoncePool()
+"""per process nonce pool"""
+
+
+def var_number_size(value: int) -> int:
+    """size of a VAR-NUMBER in bytes"""
+    if value < 253:
+        return 1
+    if value <= 0xFFFF:
+        return 3
+    if value <= 0xFFFFFFFF:
+        return 5
+    return 9
+
+
+def tlv_size(type: int, length: int) -> int:
+    """size of a TLV element with a value of the given length"""
+    return var_number_size(type) + var_number_size(length) + length
+
+
+def write_var_number(buffer: bytearray, offset: int, value: int) -> int:
+    """write a VAR-NUMBER
+    :return: offset after the number
+    """
+    if value < 253:
+        buffer[offset] = value
+        return offset + 1
+    if value <= 0xFFFF:
+        _VAR16.pack_into(buffer, offset, 253, value)
+        return offset + 3
+    if value <= 0xFFFFFFFF:
+        _VAR32.pack_into(buffer, offset, 254, value)
+        return offset + 5
+    _VAR64.pack_into(buffer, offset, 255, value)
+    return offset + 9
+
+
+def write_type_and_length(buffer: bytearray, offset: int, type: int, length: int) -> int:
+    """write the type and length of a TLV element
+    :return: offset of the value
+    """
+    return write_var_number(buffer, write_var_number(buffer, offset, type), length)
+
+
+def write_tlv(buffer: bytearray, offset: int, type: int, value) -> int:
+    """write a TLV element
+    :return: offset after the element
+    """
+    offset = write_type_and_length(buffer, offset, type, len(value))
+    end = offset + len(value)
+    buffer[offset:end] = value
+    return end
+
+
+def nonneg_int_size(value: int) -> int:
+    """size of a NonNegativeInteger in bytes"""
+    if value <= 0xFF:
+        return 1
+    if value <= 0xFFFF:
+        return 2
+    if value <= 0xFFFFFFFF:
+        return 4
+    return 8
+
+
+def write_nonneg_int_tlv(buffer: bytearray, offset: int, type: int, value: int) -> int:
+    """write a TLV element with a NonNegativeInteger value
+    :return: offset after the element
+    """
+    size = nonneg_int_size(value)
+    offset = write_type_and_length(buffer, offset, type, size)
+    buffer[offset:offset + size] = value.to_bytes(size, 'big')
+    return offset + size
+
+
+def encode_var_number(value: int) -> bytes:
+    """VAR-NUMBER in wire format"""
+    buffer = bytearray(var_number_size(value))
+    write_var_number(buffer, 0, value)
+    return bytes(buffer)
+
+
+def _component_bytes(component) -> bytes:
+    if isinstance(component, str):
+        return component.encode()
+    return component
+
+
+def encode_name(name: Name) -> bytes:
+    """Name-TLV of a name, the digest (if set) is appended as implicit digest component"""
+    components = [_component_bytes(c) for c in name.components]
+    value_length = 0
+    for c in components:
+        value_length += tlv_size(TLV_NAME_COMPONENT, len(c))
+    if name.digest:
+        value_length += tlv_size(TLV_IMPLICIT_SHA256_DIGEST_COMPONENT, len(name.digest))
+    buffer = bytearray(tlv_size(TLV_NAME, value_length))
+    offset = write_type_and_length(buffer, 0, TLV_NAME, value_length)
+    for c in components:
+        offset = write_tlv(buffer, offset, TLV_NAME_COMPONENT, c)
+    if name.digest:
+        write_tlv(buffer, offset, TLV_IMPLICIT_SHA256_DIGEST_COMPONENT, name.digest)
+    return bytes(buffer)
+
+
+def append_name_component(name_tlv: bytes, component) -> bytes:
+    """Name-TLV of a name extended by one component, built from the Name-TLV of the name. The name must not have a
+    digest."""
+    component = _component_bytes(component)
+    with memoryview(name_tlv) as view:
+        offset, end = read_expected(view, 0, len(view), TLV_NAME)
+        value_length = end - offset + tlv_size(TLV_NAME_COMPONENT, len(component))
+        buffer = bytearray(tlv_size(TLV_NAME, value_length))
+        buffer_offset = write_type_and_length(buffer, 0, TLV_NAME, value_length)
+        buffer[buffer_offset:buffer_offset + end - offset] = view[offset:end]
+    write_tlv(buffer, buffer_offset + end - offset, TLV_NAME_COMPONENT, component)
+    return bytes(buffer)
+
+
+class NameTlvCache(object):
+    """Bounded cache of encoded names (least recently used names are evicted). Names are keyed by their components
+    and digest, not by the name key, since equal names may differ in their encoding (e.g. a component containing '/').
+    On a miss, the name is built from the cached encoding of its prefix if possible (e.g. chunk names).
+    :param max_entries: maximum number of cached names
+    """
+
+    def __init__(self, max_entries: int=4096):
+        self._max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.prefix_hits = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def encode(self, name: Name) -> bytes:
+        """Name-TLV of a name, from the cache if possible"""
+        key = (tuple(name.components), name.digest)
+        name_tlv = self._entries.get(key)
+        if name_tlv is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return name_tlv
+        self.misses += 1
+        prefix_tlv = None
+        if name.digest is None and len(key[0]) > 1:
+            prefix_tlv = self._entries.get((key[0][:-1], None))
+        if prefix_tlv is not None:
+            self.prefix_hits += 1
+            name_tlv = append_name_component(prefix_tlv, key[0][-1])
+        else:
+            name_tlv = encode_name(name)
+        self._insert(key, name_tlv)
+        return name_tlv
+
+    def encode_with_component(self, prefix: Name, component) -> bytes:
+        """Name-TLV of a prefix extended by one component, built from the cached encoding of the prefix. The prefix is
+        cached, the extended name is not.
+        :raises ValueError if the prefix has a digest
+        """
+        if prefix.digest is not None:
+            raise ValueError("Cannot append a component to a name with digest")
+        return append_name_component(self.encode(prefix), component)
+
+    def clear(self):
+        """remove all entries and reset the counters"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.prefix_hits = 0
+
+    def _insert(self, key, name_tlv: bytes):
+        if self._max_entries <= 0:
+            return
+        self._entries[key] = name_tlv
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+def encode_interest(name_tlv: bytes, nonce: bytes=None) -> bytes:
+    """Interest-TLV
+    :param name_tlv: encoded name
+    :param nonce: nonce of 4 bytes, taken from the nonce pool if None
+    """
+    if nonce is None:
+        nonce = nonce_pool.take()
+    value_length = len(name_tlv) + tlv_size(TLV_NONCE, len(nonce))
+    buffer = bytearray(tlv_size(TLV_INTEREST, value_length))
+    offset = write_type_and_length(buffer, 0, TLV_INTEREST, value_length)
+    buffer[offset:offset + len(name_tlv)] = name_tlv
+    write_tlv(buffer, offset + len(name_tlv), TLV_NONCE, nonce)
+    return bytes(buffer)
+
+
+def build_data(name_tlv: bytes, payload) -> bytearray:
+    """Data-TLV with empty meta info and a DigestSha256 signature, with the signature value still zeroed
+    :param name_tlv: encoded name
+    :param payload: content, bytes-like
+    """
+    value_length = len(name_tlv) + len(_META_INFO) + tlv_size(TLV_CONTENT, len(payload)) + len(_SIGNATURE_INFO) \
+                   + len(_SIGNATURE_VALUE_HEADER) + SIGNATURE_SIZE
+    buffer = bytearray(tlv_size(TLV_DATA, value_length))
+    offset = write_type_and_length(buffer, 0, TLV_DATA, value_length)
+    buffer[offset:offset + len(name_tlv)] = name_tlv
+    offset += len(name_tlv)
+    buffer[offset:offset + len(_META_INFO)] = _META_INFO
+    offset = write_tlv(buffer, offset + len(_META_INFO), TLV_CONTENT, payload)
+    buffer[offset:offset + len(_SIGNATURE_INFO)] = _SIGNATURE_INFO
+    offset += len(_SIGNATURE_INFO)
+    buffer[offset:offset + len(_SIGNATURE_VALUE_HEADER)] = _SIGNATURE_VALUE_HEADER
+    return buffer
+
+
+def sign_data(buffer: bytearray) -> bytes:
+    """Set the signature value of a Data-TLV built by build_data. The DigestSha256 covers the whole packet up to the
+    signature value, including the outer type and length.
+    :return: the signed packet
+    """
+    size = len(buffer)
+    with memoryview(buffer) as view:
+        buffer[size - SIGNATURE_SIZE:] = hashlib.sha256(view[:size - SIGNATURE_SIZE]).digest()
+    return bytes(buffer)
+
+
+def encode_data(name_tlv: bytes, payload, sign: bool=True) -> bytes:
+    """Data-TLV with empty meta info and a DigestSha256 signature
+    :param name_tlv: encoded name
+    :param payload: content, bytes-like
+    :param sign: if false, the signature value is left zeroed
+    """
+    buffer = build_data(name_tlv, payload)
+    if sign:
+        return sign_data(buffer)
+    return bytes(buffer)
+
+
+class ThreadPoolSigner(object):
+    """Signs Data-TLVs built by build_data in a pool of threads. hashlib releases the GIL while hashing larger buffers,
+    so the packets of a burst (e.g. the chunks of an object) are hashed in parallel. The pool is created on first use
+    in the process using it and is not pickled.
+    :param threads: number of signing threads
+    """
+
+    def __init__(self, threads: int=4):
+        self._threads = threads
+        self._executor: ThreadPoolExecutor = None
+        self._pid: int = None
+
+    def sign_all(self, buffers: List[bytearray]) -> List[bytes]:
+        """sign all buffers
+        :return: the signed packets, in the same order
+        """
+        if len(buffers) < 2:
+            return [sign_data(b) for b in buffers]
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self._threads)
+            self._pid = os.getpid()
+        return list(self._executor.map(sign_data, buffers))
+
+    def __getstate__(self):
+        d = dict(self.__dict__)
+        d['_executor'] = None
+        d['_pid'] = None
+        return d
+
+
+def encode_nack(interest_wire_format: bytes, reason_value: Optional[int]) -> bytes:
+    """NDNLPv2 LpPacket carrying a Nack header and the interest as fragment
+    :param interest_wire_format: encoded interest
+    :param reason_value: wire value of the nack reason, None to omit the reason
+    """
+    reason_length = 0
+    if reason_value is not None:
+        reason_length = tlv_size(TLV_LP_NACK_REASON, var_number_size(reason_value))
+    value_length = tlv_size(TLV_LP_NACK, reason_length) + tlv_size(TLV_LP_FRAGMENT, len(interest_wire_format))
+    buffer = bytearray(tlv_size(TLV_LP_PACKET, value_length))
+    offset = write_type_and_length(buffer, 0, TLV_LP_PACKET, value_length)
+    offset = write_type_and_length(buffer, offset, TLV_LP_NACK, reason_length)
+    if reason_value is not None:
+        offset = write_type_and_length(buffer, offset, TLV_LP_NACK_REASON, var_number_size(reason_value))
+        offset = write_var_number(buffer, offset, reason_value)
+    write_tlv(buffer, offset, TLV_LP_FRAGMENT, interest_wire_format)
+    return bytes(buffer)
+
+
+def _lp_fragment_value_length(fragment_length: int, frag_index: int, frag_count: int) -> int:
+    return tlv_size(TLV_LP_SEQUENCE, LP_SEQUENCE_SIZE) \
+           + tlv_size(TLV_LP_FRAG_INDEX, nonneg_int_size(frag_index)) \
+           + tlv_size(TLV_LP_FRAG_COUNT, nonneg_int_size(frag_count)) \
+           + tlv_size(TLV_LP_FRAGMENT, fragment_length)
+
+
+def lp_fragment_size(fragment_length: int, frag_index: int, frag_count: int) -> int:
+    """size of a NDNLPv2 LpPacket carrying a fragment, see encode_lp_fragment"""
+    return tlv_size(TLV_LP_PACKET, _lp_fragment_value_length(fragment_length, frag_index, frag_count))
+
+
+def encode_lp_fragment(sequence: int, frag_index: int, frag_count: int, fragment) -> bytes:
+    """NDNLPv2 LpPacket carrying one fragment of a network layer packet
+    :param sequence: sequence number of the fragment (64 bit)
+    :param frag_index: index of the fragment
+    :param frag_count: number of fragments of the packet
+    :param fragment: part of the packet, bytes-like
+    """
+    value_length = _lp_fragment_value_length(len(fragment), frag_index, frag_count)
+    buffer = bytearray(tlv_size(TLV_LP_PACKET, value_length))
+    offset = write_type_and_length(buffer, 0, TLV_LP_PACKET, value_length)
+    offset = write_type_and_length(buffer, offset, TLV_LP_SEQUENCE, LP_SEQUENCE_SIZE)
+    _U64.pack_into(buffer, offset, sequence & 0xFFFFFFFFFFFFFFFF)
+    offset = write_nonneg_int_tlv(buffer, offset + LP_SEQUENCE_SIZE, TLV_LP_FRAG_INDEX, frag_index)
+    offset = write_nonneg_int_tlv(buffer, offset, TLV_LP_FRAG_COUNT, frag_count)
+    write_tlv(buffer, offset, TLV_LP_FRAGMENT, fragment)
+    return bytes(buffer)
+
+
+def read_var_number(view: memoryview, offset: int) -> Tuple[int, int]:
+    """read a VAR-NUMBER
+    :return: the number and the offset after it
+    """
+    first = view[offset]
+    if first < 253:
+        return first, offset + 1
+    if first == 253:
+        return _U16.unpack_from(view, offset + 1)[0], offset + 3
+    if first == 254:
+        return _U32.unpack_from(view, offset + 1)[0], offset + 5
+    return _U64.unpack_from(view, offset + 1)[0], offset + 9
+
+
+def read_type_and_length(view: memoryview, offset: int, end: int) -> Tuple[int, int, int]:
+    """read the type and length of a TLV element, that must end before end
+    :return: type, length and offset of the value
+    :raises ValueError if the element exceeds end
+    """
+    type, offset = read_var_number(view, offset)
+    length, offset = read_var_number(view, offset)
+    if offset + length > end:
+        raise ValueError("TLV element exceeds its enclosing element")
+    return type, length, offset
+
+
+def read_expected(view: memoryview, offset: int, end: int, expected_type: int) -> Tuple[int, int]:
+    """read the type and length of a TLV element of the expected type
+    :return: offset of the value and end of the element
+    :raises ValueError if the element has another type
+    """
+    type, length, offset = read_type_and_length(view, offset, end)
+    if type != expected_type:
+        raise ValueError("Expected TLV type " + str(expected_type) + ", got " + str(type))
+    return offset, offset + length
+
+
+def decode_name(view: memoryview, offset: int, end: int) -> Tuple[Name, int]:
+    """decode a Name-TLV
+    :return: the name and the offset after the Name-TLV
+    """
+    offset, name_end = read_expected(view, offset, end, TLV_NAME)
+    components: List[bytes] = []
+    digest = None
+    while offset < name_end:
+        type, length, offset = read_type_and_length(view, offset, name_end)
+        if type == TLV_IMPLICIT_SHA256_DIGEST_COMPONENT:
+            digest = bytes(view[offset:offset + length])
+        else:
+            components.append(bytes(view[offset:offset + length]))
+        offset += length
+    name = Name(components, suite='ndn2013')
+    name.digest = digest
+    return name, name_end
+
+
+def decode_interest(wire_data) -> Name:
+    """name of an Interest-TLV"""
+    with memoryview(wire_data) as view:
+        offset, end = read_expected(view, 0, len(view), TLV_INTEREST)
+        return decode_name(view, offset, end)[0]
+
+
+def decode_data(wire_data) -> Tuple[Name, bytes]:
+    """name and payload of a Data-TLV"""
+    name, payload_offset, payload_length = decode_data_lazy(wire_data)
+    with memoryview(wire_data) as view:
+        return name, bytes(view[payload_offset:payload_offset + payload_length])
+
+
+def decode_data_lazy(wire_data) -> Tuple[Name, int, int]:
+    """name and position of the payload of a Data-TLV, meta info is skipped
+    :return: name, offset and length of the payload in the wire format
+    """
+    with memoryview(wire_data) as view:
+        offset, end = read_expected(view, 0, len(view), TLV_DATA)
+        name, offset = decode_name(view, offset, end)
+        type, length, value_offset = read_type_and_length(view, offset, end)
+        if type == TLV_META_INFO:
+            type, length, value_offset = read_type_and_length(view, value_offset + length, end)
+        if type != TLV_CONTENT:
+            raise ValueError("Data packet without content")
+        return name, value_offset, length
+
+
+def decode_nack(wire_data) -> Tuple[Name, Optional[int]]:
+    """name of the interest and wire value of the nack reason (None if omitted) of a NDNLPv2 Nack"""
+    with memoryview(wire_data) as view:
+        offset, end = read_expected(view, 0, len(view), TLV_LP_PACKET)
+        name = None
+        reason_value = None
+        is_nack = False
+        while offset < end:
+            type, length, offset = read_type_and_length(view, offset, end)
+            if type == TLV_LP_NACK:
+                is_nack = True
+                if length > 0:
+                    reason_offset, _ = read_expected(view, offset, offset + length, TLV_LP_NACK_REASON)
+                    reason_value = read_var_number(view, reason_offset)[0]
+            elif type == TLV_LP_FRAGMENT:
+                name = decode_interest(view[offset:offset + length])
+            offset += length
+        if not is_nack or name is None:
+            raise ValueError("LpPacket is not a Nack")
+        return name, reason_value
+
+
+def read_nonneg_int(view: memoryview, offset: int, length: int) -> int:
+    """read a NonNegativeInteger of 1, 2, 4 or 8 bytes"""
+    if length not in (1, 2, 4, 8):
+        raise ValueError("Invalid NonNegativeInteger length " + str(length))
+    return int.from_bytes(view[offset:offset + length], 'big')
+
+
+def decode_lp_packet(wire_data) -> Tuple[Optional[int], Optional[int], Optional[int], int, int, bool]:
+    """fragmentation fields of a NDNLPv2 LpPacket
+    :return: sequence, fragment index and fragment count (None if omitted), offset and length of the fragment
+             (0, 0 if there is none) and whether the packet carries other header fields (e.g. a Nack)
+    :raises ValueError if the packet is no LpPacket or malformed
+    """
+    with memoryview(wire_data) as view:
+        offset, end = read_expected(view, 0, len(view), TLV_LP_PACKET)
+        sequence = frag_index = frag_count = None
+        fragment_offset = fragment_length = 0
+        other_headers = False
+        while offset < end:
+            type, length, offset = read_type_and_length(view, offset, end)
+            if type == TLV_LP_SEQUENCE:
+                if length != LP_SEQUENCE_SIZE:
+                    raise ValueError("Invalid Sequence length")
+                sequence = _U64.unpack_from(view, offset)[0]
+            elif type == TLV_LP_FRAG_INDEX:
+                frag_index = read_nonneg_int(view, offset, length)
+            elif type == TLV_LP_FRAG_COUNT:
+                frag_count = read_nonneg_int(view, offset, length)
+            elif type == TLV_LP_FRAGMENT:
+                fragment_offset, fragment_length = offset, length
+            else:
+                other_headers = True
+            offset += length
+        return sequence, frag_index, frag_count, fragment_offset, fragment_length, other_headers
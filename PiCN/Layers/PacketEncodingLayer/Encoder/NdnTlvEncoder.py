@@ -1,15 +1,13 @@
 """NDN TLV Encoder"""
 
+from typing import List
+
 from PiCN.Layers.PacketEncodingLayer.Encoder import BasicEncoder
-from PiCN.Packets import Packet, Content, Interest, Nack, NackReason, Name, UnknownPacket
+from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvCodec
+from PiCN.Packets import Packet, Content, LazyContent, Interest, Nack, NackReason, Name, UnknownPacket
 
-from PiCNExternal.pyndn.encoding.tlv.tlv.tlv_encoder import TlvEncoder
-from PiCNExternal.pyndn.encoding.tlv.tlv.tlv_decoder import TlvDecoder
 from PiCNExternal.pyndn.encoding.tlv.tlv.tlv import Tlv
 
-from random import SystemRandom
-import hashlib
-
 
 class NdnTlvEncoder(BasicEncoder):
     """
@@ -25,6 +23,13 @@ class NdnTlvEncoder(BasicEncoder):
 
        - Additional in-network computation related NACK Reasons
 
+    Packets are encoded and decoded by the NdnTlvCodec in a single pass. Encoded names are cached.
+    Data packets with a wire format (e.g. pre-signed by a repository) are passed through without hashing them again.
+    :param name_cache_size: maximum number of cached encoded names, 0 to disable the cache
+    :param signer_threads: if larger than 1, data packets of a burst (see encode_all) are signed by this many threads
+    :param trusted_link: skip the DigestSha256 of data packets, the signature value is left zeroed. Applies to all
+                         faces of the stack using the encoder, so only for stacks whose faces all connect trusted local
+                         processes (e.g. a repository only reachable through a forwarder on the same host).
     """
 
     __nack_reason_values = {
@@ -59,14 +64,17 @@ class NdnTlvEncoder(BasicEncoder):
     }
     """Mapping of wire format nack reasons to NackReason Enum"""
 
-    def __init__(self, log_level=255):
+    def __init__(self, log_level=255, name_cache_size: int=4096, signer_threads: int=0, trusted_link: bool=False):
         super().__init__(logger_name="NdnTlvEnc", log_level=log_level)
+        self.name_cache = NdnTlvCodec.NameTlvCache(name_cache_size)
+        self._signer = NdnTlvCodec.ThreadPoolSigner(signer_threads) if signer_threads > 1 else None
+        self._trusted_link = trusted_link
 
-    def encode(self, packet: Packet) -> bytearray:
+    def encode(self, packet: Packet) -> bytes:
         """
         Python object (PiCN's internal representation) to NDN TLV wire format
         :param packet: Packet in PiCN's representation
-        :return: Packet in NDN TLV representation
+        :return: Packet in NDN TLV representation (bytes)
         """
         if isinstance(packet, Interest):
             self.logger.info("Encode interest")
@@ -90,6 +98,30 @@ class NdnTlvEncoder(BasicEncoder):
             self.logger.info("Encode UnknownPacket")
             return packet.wire_format
 
+    def encode_all(self, packets: List[Packet]) -> List[bytes]:
+        """
+        Encode a burst of packets. Data packets without wire format are signed in parallel if signer threads are used.
+        :param packets: Packets in PiCN's representation
+        :return: Packets in NDN TLV representation, in the same order
+        """
+        if self._signer is None or self._trusted_link:
+            return super().encode_all(packets)
+        encoded = []
+        unsigned = []
+        for packet in packets:
+            if isinstance(packet, Content) and not isinstance(packet.wire_format, bytes):
+                self.logger.info("Encode content object")
+                unsigned.append((len(encoded), NdnTlvCodec.build_data(self.encode_name(packet.name),
+                                                                      packet.get_bytes())))
+                encoded.append(None)
+            else:
+                encoded.append(self.encode(packet))
+        if len(unsigned) > 0:
+            signed = self._signer.sign_all([buffer for _, buffer in unsigned])
+            for (index, _), wire_format in zip(unsigned, signed):
+                encoded[index] = wire_format
+        return encoded
+
     def decode(self, wire_data) -> Packet:
         """
         NDN TLV wire format packet to python object (PiCN's internal representation)
@@ -100,6 +132,9 @@ class NdnTlvEncoder(BasicEncoder):
         if(self.is_content(wire_data)):
             self.logger.info("Decode content object")
             try:
+                if isinstance(wire_data, bytes): # immutable, the payload is sliced out of it on demand
+                    (name, payload_offset, payload_length) = NdnTlvCodec.decode_data_lazy(wire_data)
+                    return LazyContent(name, wire_data, payload_offset, payload_length)
                 (name, payload) = self.decode_data(wire_data)
                 return Content(name, payload, wire_data)
             except:
@@ -128,71 +163,43 @@ class NdnTlvEncoder(BasicEncoder):
 
     ### Helpers ###
 
-    def encode_name(self, name: Name) -> bytearray:
+    def encode_name(self, name: Name) -> bytes:
         """
-        Assembly a name-TLV
+        Assembly a name-TLV, taken from the name cache if possible
         :param name: Name
         :return: Name-TLV
         """
-        encoder = TlvEncoder()
-        # name = name[1:].split('/')
-        # for component in name[::-1]:
-        #     encoder.writeBlobTlv(Tlv.NameComponent, [ord(c) for c in component])
-        # fill backwards
-        if name.digest:
-            encoder.writeBlobTlv(Tlv.ImplicitSha256DigestComponent, name.digest)
-        for c in name._components[::-1]:
-            encoder.writeBlobTlv(Tlv.NameComponent, c)
-        encoder.writeTypeAndLength(Tlv.Name, len(encoder))
-        return encoder.getOutput() #.tobytes()
+        return self.name_cache.encode(name)
+
+    def encode_name_with_component(self, prefix: Name, component: bytes) -> bytes:
+        """
+        Assembly the name-TLV of a prefix extended by one component (e.g. a chunk name), without encoding the prefix
+        again if it is cached
+        :param prefix: Name without digest
+        :param component: component to append
+        :return: Name-TLV
+        """
+        return self.name_cache.encode_with_component(prefix, component)
 
-    def encode_interest(self, name: Name) -> bytearray:
+    def encode_interest(self, name: Name) -> bytes:
         """
-        Assembly an interest packet
+        Assembly an interest packet, with a nonce from the per process nonce pool
         :param name: Name
         :return: Interest-TLV
         """
-        encoder = TlvEncoder()
-        # Add nonce
-        nonce = bytearray(4)
-        for i in range(4):
-            nonce[i] = SystemRandom().randint(0, 0xff)
-        encoder.writeBlobTlv(Tlv.Nonce, nonce)
-        # TODO: add implicitDigest flag here ?
-        # Add name
-        encoder.writeBuffer(self.encode_name(name))
-        # Add interest type and len
-        encoder.writeTypeAndLength(Tlv.Interest, len(encoder))
-        return encoder.getOutput().tobytes()
+        return NdnTlvCodec.encode_interest(self.encode_name(name))
 
-    def encode_data(self, name: Name, payload: bytearray) -> bytearray:
+    def encode_data(self, name: Name, payload: bytearray) -> bytes:
         """
         Assembly a data packet including a signature according to NDN packet format specification 0.3 (DigestSha256).
+        On trusted links, the signature value is left zeroed.
         :param name: Name
         :param payload: Payload
         :return: Data-TLV
         """
-        encoder = TlvEncoder()
-        # Add signature (DigestSha256, zeroed)
-        encoder.writeBlobTlv(Tlv.SignatureValue, bytearray(32)) # signature value to set later
-        encoder.writeBlobTlv(Tlv.SignatureInfo, bytearray([Tlv.SignatureType, 1, 0]))
-        # Add content
-        encoder.writeBlobTlv(Tlv.Content, payload)
-        # Add meta info (empty)
-        encoder.writeTypeAndLength(Tlv.MetaInfo, 0)
-        # Add name
-        encoder.writeBuffer(self.encode_name(name))
-        # Add data type and len
-        encoder.writeTypeAndLength(Tlv.Data, len(encoder))
-        # Add signature value
-        packet_without_sig = encoder.getOutput().tobytes()
-        m = hashlib.sha256()
-        m.update(packet_without_sig[:-32])
-        sig = m.digest()
-        packet_with_sig = packet_without_sig[:-32] + sig
-        return packet_with_sig
+        return NdnTlvCodec.encode_data(self.encode_name(name), payload, sign=not self._trusted_link)
 
-    def encode_nack(self, name: Name, reason: NackReason, interest: Interest) -> bytearray:
+    def encode_nack(self, name: Name, reason: NackReason, interest: Interest) -> bytes:
         """
         Assembly a negative acknowledgement packet
         :param name: Name carried by interest for which this NACK is generated
@@ -200,73 +207,18 @@ class NdnTlvEncoder(BasicEncoder):
         :param interest: Interest for which this NACk is generated
         :return:  NACK-TLV
         """
-        encoder = TlvEncoder()
-        # write fragment (interest packet)
         if interest.wire_format is None:
             interest._wire_format = self.encode(interest)
-        encoder.writeBuffer(interest.wire_format)
-        encoder.writeTypeAndLength(Tlv.LpPacket_Fragment, len(encoder))
-        fragment_len = len(encoder)
-        # write nack reason if needed
-        if reason is not NackReason.NOT_SET:
-            wire_reason = self.encode_nack_reason(reason)
-            encoder.writeBuffer(wire_reason)
-            encoder.writeTypeAndLength(Tlv.LpPacket_NackReason, len(wire_reason))
-        # write nack header
-        encoder.writeTypeAndLength(Tlv.LpPacket_Nack, len(encoder) - fragment_len)
-        # write link packet header
-        encoder.writeTypeAndLength(Tlv.LpPacket_LpPacket, len(encoder))
-        return encoder.getOutput().tobytes()
+        reason_value = None if reason is NackReason.NOT_SET else self.__nack_reason_values[reason]
+        return NdnTlvCodec.encode_nack(interest.wire_format, reason_value)
 
-    def encode_nack_reason(self, reason: NackReason) -> bytearray:
+    def encode_nack_reason(self, reason: NackReason) -> bytes:
         """
         Encode a NackReason
         :param reason: NackReason
         :return: Nack reason in wire format
         """
-        encoder = TlvEncoder()
-        encoder.writeVarNumber(self.__nack_reason_values[reason])
-        return encoder.getOutput().tobytes()
-
-    def decode_name_component(self, decoder: TlvDecoder) -> bytearray:
-        """
-        Decode a name component
-        :param decoder: Decoder
-        :return: Value of name component
-        """
-        savePosition = decoder.getOffset()
-        type = decoder.readVarNumber()
-        decoder.seek(savePosition)
-        return decoder.readBlobTlv(type).tobytes()
-
-    def decode_name(self, decoder: TlvDecoder) -> Name:
-        """
-        Decode a name
-        :param decoder: Decoder
-        :return: Name
-        """
-        endOffset = decoder.readNestedTlvsStart(Tlv.Name)
-        comps = []
-        dgest = None
-        while decoder.getOffset() < endOffset:
-            if decoder.peekType(Tlv.ImplicitSha256DigestComponent, endOffset):
-                dgest = decoder.readBlobTlv(Tlv.ImplicitSha256DigestComponent)
-                dgest = dgest.tobytes()
-            else:
-                comps.append(self.decode_name_component(decoder))
-        decoder.finishNestedTlvs(endOffset)
-        return Name(suite='ndn2013').__add__(comps).setDigest(dgest)
-
-    def decode_meta_info(self, decoder: TlvDecoder) -> None:
-        """
-        Decode meta info
-        :param decoder: Decoder
-        :return: Nothing so far
-        """
-        endOffset = decoder.readNestedTlvsStart(Tlv.MetaInfo)
-        # Does not yet parse meta data, but:
-        # Lets the decoder jump over meta data.
-        decoder.finishNestedTlvs(endOffset)
+        return NdnTlvCodec.encode_var_number(self.__nack_reason_values[reason])
 
     def decode_interest(self, input: bytearray) -> Name:
         """
@@ -274,22 +226,15 @@ class NdnTlvEncoder(BasicEncoder):
         :param input: Interest packet in NDN-TLV wire format
         :return: Name
         """
-        decoder = TlvDecoder(input)
-        decoder.readNestedTlvsStart(Tlv.Interest)
-        return self.decode_name(decoder)
+        return NdnTlvCodec.decode_interest(input)
 
-    def decode_data(self, input: bytearray) -> ([bytearray], bytearray):
+    def decode_data(self, input: bytearray) -> (Name, bytes):
         """
         Decodes a data packet
         :param input: Data packet in NDN-TLV wire format
         :return: Name and payload
         """
-        decoder = TlvDecoder(input)
-        decoder.readNestedTlvsStart(Tlv.Data)
-        name = self.decode_name(decoder)
-        self.decode_meta_info(decoder)
-        payload = decoder.readBlobTlv(Tlv.Content).tobytes()
-        return (name, payload)
+        return NdnTlvCodec.decode_data(input)
 
     def decode_nack(self, input: bytearray) -> (Name, NackReason):
         """
@@ -297,20 +242,10 @@ class NdnTlvEncoder(BasicEncoder):
         :param input: Data packet in NDN-TLV wire format
         :return: Name
         """
-        # decode name
-        name = self.decode_interest(input[13:])
-        # decode nack reason
-        decoder = TlvDecoder(input)
-        decoder.readNestedTlvsStart(Tlv.LpPacket_LpPacket)
-        decoder.readNestedTlvsStart(Tlv.LpPacket_Nack)
-        try:
-            decoder.readNestedTlvsStart(Tlv.LpPacket_NackReason)
-            wire_reason = decoder.readVarNumber()
-            reason = self.__nack_reason_enum[wire_reason]
-        except ValueError:
-            # happens when nack reason is not specified
-            reason = NackReason.NOT_SET
-        return (name, reason)
+        name, wire_reason = NdnTlvCodec.decode_nack(input)
+        if wire_reason is None: # nack reason is not specified
+            return (name, NackReason.NOT_SET)
+        return (name, self.__nack_reason_enum[wire_reason])
 
     def is_content(self, input: bytearray) -> bool:
         """
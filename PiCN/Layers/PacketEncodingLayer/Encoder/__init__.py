@@ -2,4 +2,5 @@
 
 from .BasicEncoder import BasicEncoder
 from .SimpleStringEncoder import SimpleStringEncoder
-from .NdnTlvEncoder import NdnTlvEncoder
\ No newline at end of file
+from .NdnTlvEncoder import NdnTlvEncoder
+from .CompactEncoder import CompactEncoder
@@ -0,0 +1,90 @@
+"""Test the CompactEncoder"""
+
+import unittest
+
+from PiCN.Layers.PacketEncodingLayer.Encoder import CompactEncoder, SimpleStringEncoder, NdnTlvEncoder
+from PiCN.Packets import Content, LazyContent, Interest, Nack, NackReason, Name, UnknownPacket
+
+
+class test_CompactEncoder(unittest.TestCase):
+    """Test the CompactEncoder"""
+
+    def setUp(self):
+        self.encoder = CompactEncoder()
+
+    def tearDown(self):
+        pass
+
+    def test_encode_interest(self):
+        """Test the interest encoding"""
+        ei = self.encoder.encode(Interest("/test/data"))
+        self.assertEqual(b"\xa1\x00\x00\x02\x00\x04test\x00\x04data", ei)
+
+    def test_encode_decode_interest(self):
+        """Test encoding and decoding an interest"""
+        i = Interest("/test/data")
+        self.assertEqual(i, self.encoder.decode(self.encoder.encode(i)))
+        i = Interest(Name("/test/data").setDigest(bytes(range(32))))
+        di = self.encoder.decode(self.encoder.encode(i))
+        self.assertEqual(i.name, di.name)
+        self.assertEqual(bytes(range(32)), di.name.digest)
+
+    def test_encode_decode_content(self):
+        """Test encoding and decoding a content object"""
+        c = Content("/test/data", "Hello: World")
+        ec = self.encoder.encode(c)
+        self.assertEqual(b"\xa2\x00\x00\x02\x00\x04test\x00\x04data\x00\x00\x00\x0cHello: World", ec)
+        dc = self.encoder.decode(ec)
+        self.assertIsInstance(dc, LazyContent)
+        self.assertEqual(c, dc)
+        self.assertEqual("Hello: World", dc.content)
+        self.assertIs(ec, self.encoder.encode(dc))
+        self.assertEqual(c, self.encoder.decode(bytearray(ec)))
+
+    def test_binary_content_and_names(self):
+        """Test that binary payloads and components containing separators of the other encoders are preserved"""
+        payload = bytes(range(256)) * 300
+        name = Name([b"te:st", b"%58", b"\x00\xff", b""])
+        dc = self.encoder.decode(self.encoder.encode(Content(name, payload)))
+        self.assertEqual(name.components, dc.name.components)
+        self.assertEqual(payload, dc.get_bytes())
+        self.assertEqual(Content("/test/data", b""), self.encoder.decode(self.encoder.encode(Content("/test/data"))))
+
+    def test_encode_decode_nack(self):
+        """Test encoding and decoding a nack"""
+        for reason in NackReason:
+            n = Nack(Name("/test/data"), reason, interest=Interest("/test/data"))
+            self.assertEqual(n, self.encoder.decode(self.encoder.encode(n)))
+            self.assertEqual(Interest("/test/data"), self.encoder.decode(self.encoder.encode(n)).interest)
+
+    def test_fields_too_long(self):
+        """Test that packets with fields exceeding their length prefix are not encoded"""
+        self.assertIsNone(self.encoder.encode(Interest(Name([b"a" * 65536]))))
+        self.assertIsNone(self.encoder.encode(Content(Name([b"test"] * 65536), b"data")))
+        self.assertIsNotNone(self.encoder.encode(Interest(Name([b"a" * 65535]))))
+
+    def test_digest_of_wrong_size(self):
+        """Test that packets with a digest which is not 32 bytes long are not encoded"""
+        name = Name("/test/data")
+        name.digest = b"d" * 20
+        self.assertIsNone(self.encoder.encode(Interest(name)))
+        name.digest = b"d" * 32
+        self.assertEqual(name, self.encoder.decode(self.encoder.encode(Interest(name))).name)
+
+    def test_unknown_and_malformed_packets(self):
+        """Test that packets of other encoders and truncated packets are decoded as UnknownPacket"""
+        packets = [SimpleStringEncoder().encode(Content("/test/data", "Hello World")),
+                   NdnTlvEncoder().encode(Content("/test/data", "Hello World")),
+                   b"\xa2"]
+        ec = self.encoder.encode(Content("/test/data", "Hello World"))
+        packets += [ec[:n] for n in [4, 7, 12, 15, len(ec) - 1]]
+        packets.append(self.encoder.encode(Nack(Name("/test"), NackReason.NO_ROUTE, None))[:-1])
+        for wire_data in packets:
+            self.assertIsInstance(self.encoder.decode(wire_data), UnknownPacket)
+        self.assertEqual(b"abc", self.encoder.encode(UnknownPacket(wire_format=b"abc")))
+
+    def test_content_encoded_by_other_encoder(self):
+        """Test that the wire format of other encoders is not passed through"""
+        ndn_content = NdnTlvEncoder().decode(NdnTlvEncoder().encode(Content("/test/data", "Hello World")))
+        ec = self.encoder.encode(ndn_content)
+        self.assertEqual(self.encoder.encode(Content("/test/data", "Hello World")), ec)
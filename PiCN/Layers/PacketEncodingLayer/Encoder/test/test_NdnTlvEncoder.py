@@ -1,9 +1,38 @@
 """Test the NdnTlvEncoder"""
 
+import hashlib
 import unittest
 
 from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder
-from PiCN.Packets import Content, Interest, Nack, NackReason, Name
+from PiCN.Packets import Content, LazyContent, Interest, Nack, NackReason, Name, UnknownPacket
+
+from PiCNExternal.pyndn.encoding.tlv.tlv.tlv_encoder import TlvEncoder
+from PiCNExternal.pyndn.encoding.tlv.tlv.tlv import Tlv
+
+
+def reference_name(name: Name) -> bytes:
+    """Name-TLV assembled backwards by the pyndn TlvEncoder"""
+    encoder = TlvEncoder()
+    if name.digest:
+        encoder.writeBlobTlv(Tlv.ImplicitSha256DigestComponent, name.digest)
+    for c in name.components[::-1]:
+        encoder.writeBlobTlv(Tlv.NameComponent, c)
+    encoder.writeTypeAndLength(Tlv.Name, len(encoder))
+    return encoder.getOutput().tobytes()
+
+
+def reference_data(name: Name, payload: bytes) -> bytes:
+    """Data-TLV assembled backwards by the pyndn TlvEncoder"""
+    encoder = TlvEncoder()
+    encoder.writeBlobTlv(Tlv.SignatureValue, bytearray(32))
+    encoder.writeBlobTlv(Tlv.SignatureInfo, bytearray([Tlv.SignatureType, 1, 0]))
+    encoder.writeBlobTlv(Tlv.Content, payload)
+    encoder.writeTypeAndLength(Tlv.MetaInfo, 0)
+    encoder.writeBuffer(reference_name(name))
+    encoder.writeTypeAndLength(Tlv.Data, len(encoder))
+    packet = encoder.getOutput().tobytes()
+    return packet[:-32] + hashlib.sha256(packet[:-32]).digest()
+
 
 class test_NdnTlvEncoder(unittest.TestCase):
     """Test the NdnTlvEncoder"""
@@ -51,4 +80,110 @@ class test_NdnTlvEncoder(unittest.TestCase):
         self.assertFalse(self.encoder.is_content(enc_n1))
         self.assertTrue(self.encoder.is_nack(enc_n1))
         dec_n1 = self.encoder.decode(enc_n1)
-        self.assertEqual(dec_n1, n1)
\ No newline at end of file
+        self.assertEqual(dec_n1, n1)
+    def test_wire_format_compatibility(self):
+        """Test that names and data packets are encoded byte for byte like by the pyndn TlvEncoder"""
+        names = [Name(), Name("/test/data"), Name([b"a" * 252, b"b" * 253, b"", b"c" * 70000]),
+                 Name("/test/digest").setDigest(bytes(range(32)))]
+        for name in names:
+            self.assertEqual(reference_name(name), self.encoder.encode_name(name))
+            for payload in [b"", b"HelloWorld", bytes(300), bytes(70000)]:
+                self.assertEqual(reference_data(name, payload), self.encoder.encode_data(name, payload))
+                self.assertEqual((name, payload), self.encoder.decode_data(self.encoder.encode_data(name, payload)))
+
+    def test_Interest_nonce(self):
+        """Test that interests are built from the name TLV and a fresh nonce"""
+        name = Name("/test/data")
+        encoded = [self.encoder.encode_interest(name) for i in range(100)]
+        name_tlv = reference_name(name)
+        for i in encoded:
+            self.assertEqual(bytes([Tlv.Interest, len(name_tlv) + 6]) + name_tlv + bytes([Tlv.Nonce, 4]), i[:-4])
+            self.assertEqual(name, self.encoder.decode_interest(i))
+        self.assertGreater(len(set(i[-4:] for i in encoded)), 90)
+
+    def test_Nack_reasons(self):
+        """Test encoding and decoding nacks with and without reason and a large interest"""
+        name = Name([b"x" * 300])
+        interest = Interest(name)
+        for reason in NackReason:
+            enc_n = self.encoder.encode(Nack(name, reason, interest=interest))
+            self.assertEqual((name, reason), self.encoder.decode_nack(enc_n))
+
+    def test_malformed_packets(self):
+        """Test that truncated packets are decoded as unknown packets"""
+        wire_formats = [self.encoder.encode(Interest("/test/data")),
+                        self.encoder.encode(Content("/test/data", "HelloWorld"))]
+        for wire_format in wire_formats:
+            for length in range(1, len(wire_format)):
+                self.assertIsInstance(self.encoder.decode(wire_format[:length]), UnknownPacket)
+
+    def test_Content_lazy_decoding(self):
+        """Test that content objects are decoded lazily and encoded as pass-through of their wire format"""
+        enc_c1 = self.encoder.encode(Content("/test/data", "HelloWorld"))
+        dec_c1 = self.encoder.decode(enc_c1)
+        self.assertIsInstance(dec_c1, LazyContent)
+        self.assertEqual(Name("/test/data"), dec_c1.name)
+        self.assertEqual(b"HelloWorld", dec_c1.payload_view().tobytes())
+        self.assertIs(enc_c1, self.encoder.encode(dec_c1))
+        dec_c2 = self.encoder.decode(bytearray(enc_c1))
+        self.assertEqual(dec_c1, dec_c2)
+
+    def test_name_cache(self):
+        """Test that encoded names are cached and shared by interests, data packets and nacks"""
+        name = Name("/test/data")
+        interest = Interest(name)
+        self.encoder.encode(interest)
+        self.encoder.encode(Content(name, "HelloWorld"))
+        self.encoder.encode(Nack(name, NackReason.NO_ROUTE, interest=Interest(name)))
+        self.assertEqual(1, self.encoder.name_cache.misses)
+        self.assertEqual(2, self.encoder.name_cache.hits)
+        self.assertEqual(reference_name(Name([b"a/b"])), self.encoder.encode_name(Name([b"a/b"])))
+        self.assertEqual(reference_name(Name("/a/b")), self.encoder.encode_name(Name("/a/b")))
+        digest_name = Name("/test/data").setDigest(bytes(32))
+        self.assertEqual(reference_name(digest_name), self.encoder.encode_name(digest_name))
+
+    def test_name_cache_prefix(self):
+        """Test building names from the cached encoding of their prefix"""
+        prefix = Name("/test/data")
+        self.encoder.encode_name(prefix)
+        for i in range(10):
+            chunk_name = prefix + ("c" + str(i))
+            self.assertEqual(reference_name(chunk_name), self.encoder.encode_name(chunk_name))
+        self.assertEqual(10, self.encoder.name_cache.prefix_hits)
+        self.assertEqual(reference_name(prefix + "c42"), self.encoder.encode_name_with_component(prefix, b"c42"))
+        with self.assertRaises(ValueError):
+            self.encoder.encode_name_with_component(Name("/test").setDigest(bytes(32)), b"c1")
+
+    def test_name_cache_bounded(self):
+        """Test that the least recently used names are evicted"""
+        encoder = NdnTlvEncoder(name_cache_size=10)
+        popular = Name("/popular")
+        for i in range(100):
+            encoder.encode_name(popular)
+            encoder.encode_name(Name("/test/" + str(i)))
+        self.assertEqual(10, len(encoder.name_cache))
+        self.assertEqual(99, encoder.name_cache.hits)
+        self.assertEqual(101, encoder.name_cache.misses)
+
+    def test_encode_all_thread_pool_signer(self):
+        """Test that signing a burst in a thread pool yields the same packets as encoding them one by one"""
+        encoder = NdnTlvEncoder(signer_threads=4)
+        packets = [Content("/test/data/c" + str(i), bytes([i]) * (i * 1000)) for i in range(20)]
+        packets.insert(5, Nack(Name("/test/nack"), NackReason.NO_ROUTE, interest=Interest("/test/nack")))
+        encoded = encoder.encode_all(packets)
+        self.assertEqual(len(packets), len(encoded))
+        for packet, wire_format in zip(packets, encoded):
+            if isinstance(packet, Content):
+                self.assertEqual(self.encoder.encode(packet), wire_format)
+            self.assertEqual(packet, encoder.decode(wire_format))
+
+    def test_presigned_and_trusted_link(self):
+        """Test that pre-signed data packets are passed through and trusted links skip the signature"""
+        c = Content("/test/data", "Hello World")
+        c.wire_format = self.encoder.encode(c)
+        self.assertIs(c.wire_format, self.encoder.encode(c))
+        trusted = NdnTlvEncoder(trusted_link=True)
+        wire_format = trusted.encode(Content("/test/data", "Hello World"))
+        self.assertEqual(bytes(32), wire_format[-32:])
+        self.assertEqual(c.wire_format[:-32], wire_format[:-32])
+        self.assertEqual(Content("/test/data", "Hello World"), trusted.decode(wire_format))
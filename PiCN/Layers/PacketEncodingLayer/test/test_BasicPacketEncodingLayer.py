@@ -107,6 +107,28 @@ class cases_BasicPacketEncodingLayer(object):
             self.fail()
         self.assertEqual(c, dc)
 
+    def test_BasicPacketEncodingLayer_encoded_from_higher(self):
+        """Test that already encoded packets from higher are passed to lower unchanged"""
+        self.packetEncodingLayer1.start_process()
+        wire_format = self.encoder1.encode(Content("/test/data", "HelloWorld"))
+        self.q1_fromHigher.put([2, wire_format])
+        try:
+            data = self.q1_toLower.get(timeout=2.0)
+        except:
+            self.fail()
+        self.assertEqual([2, wire_format], data)
+
+    def test_BasicPacketEncodingLayer_batch_keeps_order(self):
+        """Test that a batch of already encoded and not encoded packets is passed to lower in order"""
+        to_lower = Queue()
+        wire_format = self.encoder1.encode(Content("/test/data", "HelloWorld"))
+        batch = [[1, Interest("/test/a")], [2, wire_format], [3, Interest("/test/b")]]
+        self.packetEncodingLayer1.data_from_higher_batch(to_lower, None, batch)
+        data = [to_lower.get(timeout=2.0) for i in range(3)]
+        self.assertEqual([1, 2, 3], [d[0] for d in data])
+        self.assertEqual(wire_format, data[1][1])
+        self.assertEqual(Interest("/test/b"), self.encoder1.decode(data[2][1]))
+
     def test_BasicPacketEncodingLayer_interest_transfer_udp4(self):
         """Test the BasicPacketEncodingLayer and the UDP4LinkLayer to verify interest transport"""
         self.linkLayer1.start_process()
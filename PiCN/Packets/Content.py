@@ -7,6 +7,8 @@ class Content(Packet):
     Internal representation of a content object
     """
 
+    __slots__ = ('_content',)
+
     def __init__(self, name = None, content = None, wire_format = None):
         Packet.__init__(self, name)
         if type(content) == str:
@@ -32,6 +34,15 @@ class Content(Packet):
     def get_bytes(self) -> bytearray:
         return self._content
 
+    def payload_view(self) -> memoryview:
+        """payload as memoryview, without copying it"""
+        return memoryview(self._content if self._content is not None else b"")
+
+    @property
+    def content_length(self) -> int:
+        """length of the payload in bytes"""
+        return len(self._content) if self._content is not None else 0
+
     @content.setter
     def content(self, content):
         if type(content) == str:
@@ -40,7 +51,10 @@ class Content(Packet):
         self._content = content
 
 
+    def __reduce__(self):
+        return type(self), (self._name, self._content, self._wire_format)
+
     def __eq__(self, other):
-        if type(other) is not Content:
+        if not isinstance(other, Content):
             return False
         return self.name == other.name and self._content == other._content
@@ -0,0 +1,52 @@
+"""Content object that decodes its payload on demand"""
+
+from .Content import Content
+from .Packet import Packet
+
+
+class LazyContent(Content):
+    """
+    Content object decoded from its wire format on demand: only the name is decoded up front, the payload is sliced out
+    of the wire format when it is accessed. Since the wire format is kept, encoders pass it through and forwarded
+    content is never re-serialized. Pickling transfers the wire format but not a decoded copy of the payload.
+    """
+
+    __slots__ = ('_payload_offset', '_payload_length', '_payload', '_payload_modified')
+
+    def __init__(self, name, wire_format: bytes, payload_offset: int, payload_length: int):
+        Packet.__init__(self, name, wire_format)
+        self._payload_offset = payload_offset
+        self._payload_length = payload_length
+        self._payload = None
+        self._payload_modified = False
+
+    @property
+    def _content(self):
+        if self._payload is None:
+            self._payload = bytes(self.payload_view())
+        return self._payload
+
+    @_content.setter
+    def _content(self, content):
+        self._payload = content
+        self._payload_modified = True
+
+    def payload_view(self) -> memoryview:
+        if self._payload is not None:
+            return memoryview(self._payload)
+        return memoryview(self._wire_format)[self._payload_offset:self._payload_offset + self._payload_length]
+
+    @property
+    def content_length(self) -> int:
+        if self._payload is not None:
+            return len(self._payload)
+        return self._payload_length
+
+    def __reduce__(self):
+        args = (self._name, self._wire_format, self._payload_offset, self._payload_length)
+        if not self._payload_modified:
+            return LazyContent, args
+        return LazyContent, args, self._payload
+
+    def __setstate__(self, payload):
+        self._content = payload
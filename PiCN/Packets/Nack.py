@@ -10,6 +10,8 @@ class Nack(Packet):
     Internal representation of an NACK (negative acknowledgement) packet
     """
 
+    __slots__ = ('_reason', '_interest')
+
     def __init__(self, name: Name, reason: NackReason, interest, wire_format=None):
         """
         New negative acknowledgement (NACK) object
@@ -41,6 +43,9 @@ class Nack(Packet):
     def interest(self, i:Interest):
         self._interest = i
 
+    def __reduce__(self):
+        return type(self), (self._name, self._reason, self._interest, self._wire_format)
+
     def __eq__(self, other):
         if type(other) is not Nack:
             return False
@@ -1,18 +1,106 @@
 """Internal representation of network name"""
 
-from typing import List, Union
-
 import binascii
 import json
-import os
-from typing import List, Union
+import operator
+from typing import Dict, List, Union
+
+
+class NameComponents(list):
+    """
+    List of name components that caches an immutable key and its hash. The key is the byte string of the components
+    joined by '/', so names compare equal if their string representations are equal (e.g. a component containing '/'
+    equals the split components, as produced by the string based encoders). Components can still be modified in
+    place like a list, every modification invalidates the cached key.
+    """
+
+    __slots__ = ('_key', '_hash')
+
+    def __init__(self, components=()):
+        list.__init__(self, components)
+        self._key = None
+        self._hash = None
+
+    def key(self) -> bytes:
+        """components joined by '/', computed once after each modification"""
+        if self._key is None:
+            self._key = b'/'.join(c if type(c) is bytes else (c.encode() if isinstance(c, str) else bytes(c))
+                                  for c in self)
+            self._hash = hash(self._key)
+        return self._key
+
+    def key_hash(self) -> int:
+        """hash of the key"""
+        if self._key is None:
+            self.key()
+        return self._hash
+
+    def _invalidate(self):
+        self._key = None
+        self._hash = None
+
+    def __setitem__(self, index, value):
+        self._invalidate()
+        list.__setitem__(self, index, value)
+
+    def __delitem__(self, index):
+        self._invalidate()
+        list.__delitem__(self, index)
+
+    def __iadd__(self, other):
+        self._invalidate()
+        return list.__iadd__(self, other)
+
+    def __imul__(self, n):
+        self._invalidate()
+        return list.__imul__(self, n)
+
+    def append(self, component):
+        self._invalidate()
+        list.append(self, component)
+
+    def extend(self, components):
+        self._invalidate()
+        list.extend(self, components)
+
+    def insert(self, index, component):
+        self._invalidate()
+        list.insert(self, index, component)
+
+    def pop(self, index=-1):
+        self._invalidate()
+        return list.pop(self, index)
+
+    def remove(self, component):
+        self._invalidate()
+        list.remove(self, component)
+
+    def clear(self):
+        self._invalidate()
+        list.clear(self)
+
+    def reverse(self):
+        self._invalidate()
+        list.reverse(self)
+
+    def sort(self, *args, **kwargs):
+        self._invalidate()
+        list.sort(self, *args, **kwargs)
+
+    def __reduce__(self):
+        return NameComponents, (list(self),)
 
 
 class Name(object):
     """
     Internal representation of network name
+    Names are compared and hashed by a cached key of their components (and digest), see NameComponents.
     """
 
+    __slots__ = ('suite', 'digest', '_components')
+
+    _intern_table: Dict[bytes, bytes] = None
+
     def __init__(self, name: Union[str, List[bytes]] = None, suite='ndn2013'):
         self.suite = suite
         self.digest = None
@@ -20,15 +108,31 @@ class Name(object):
             if isinstance(name, str):
                 self.from_string(name)
             else:
-                self._components = name
+                self._components = Name._make_components(name)
         else:
-            self._components = []
+            self._components = NameComponents()
+
+    @classmethod
+    def set_component_interning(cls, enabled: bool):
+        """Enable or disable interning of components: equal components of names created from strings or component
+        lists share a single bytes object, so names with common prefixes share memory. The intern table is process wide
+        and only cleared by disabling interning.
+        :param enabled: True to enable interning
+        """
+        cls._intern_table = {} if enabled else None
+
+    @staticmethod
+    def _make_components(components) -> NameComponents:
+        table = Name._intern_table
+        if table is None:
+            return NameComponents(components)
+        return NameComponents(table.setdefault(c, c) if type(c) is bytes else c for c in components)
 
     def from_string(self, name: str):
         """Set the name from a string, components separated by /"""
         # FIXME: handle '/' as part of a component, UTF etc
         comps = name.split("/")[1:]
-        self._components = [c.encode('ascii') for c in comps]
+        self._components = Name._make_components(c.encode('ascii') for c in comps)
 
     def components_to_string(self) -> str:
         # FIXME: handle '/' as part of a component, and binary components
@@ -59,7 +163,7 @@ class Name(object):
     def from_json(self, s: str) -> str:
         n = json.loads(s)
         self.suite = n['suite']
-        self._components = [binascii.dehexlify(c) for c in n['comps']]
+        self._components = Name._make_components(binascii.dehexlify(c) for c in n['comps'])
         self.digest = binascii.dehexlify(n['dgest']) if 'dgest' in n else None
         return self
 
@@ -67,6 +171,15 @@ class Name(object):
         self.digest = digest
         return self
 
+    def __reduce__(self):
+        args = (list(self._components), self.suite)
+        if self.digest is None:
+            return Name, args
+        return Name, args, self.digest
+
+    def __setstate__(self, digest):
+        self.digest = digest
+
     def __str__(self) -> str:
         return self.to_string()
 
@@ -76,9 +189,9 @@ class Name(object):
     def __eq__(self, other) -> bool:
         if type(other) is not Name:
             return False
-        if self.suite != other.suite:
+        if self.suite != other.suite or self.digest != other.digest:
             return False
-        return self.to_string() == other.to_string()
+        return self._components.key() == other._components.key()
 
     def __add__(self, other) -> 'Name':
         components: List[bytes] = []
@@ -102,7 +215,9 @@ class Name(object):
         return Name(components)
 
     def __hash__(self) -> int:
-        return self._components.__str__().__hash__()
+        if self.digest is None:
+            return self._components.key_hash()
+        return hash((self._components.key_hash(), self.digest))
 
     def __len__(self):
         return len(self._components)
@@ -113,8 +228,9 @@ class Name(object):
         :param name: name
         :return: true if self is prefix of given name, false otherwise
         """
-        pfx = os.path.commonprefix([self._components, name._components])
-        return len(pfx) == len(self._components)
+        prefix = self._components
+        other = name._components
+        return len(prefix) <= len(other) and all(map(operator.eq, prefix, other))
 
     def has_prefix(self, name):
         """
@@ -131,7 +247,7 @@ class Name(object):
 
     @components.setter
     def components(self, components):
-        self._components = components
+        self._components = Name._make_components(components)
 
     @property
     def string_components(self):
@@ -140,4 +256,4 @@ class Name(object):
 
     @string_components.setter
     def string_components(self, string_components):
-        self._components = [c.encode('ascii') for c in string_components]
+        self._components = Name._make_components(c.encode('ascii') for c in string_components)
@@ -5,8 +5,12 @@ from .Name import Name
 class Packet(object):
     """
     Base class for internal representation of network packets
+    Packets are slot based and pickle to a tuple of their constructor arguments, since they cross a process boundary on
+    every queue hop.
     """
 
+    __slots__ = ('_name', '_wire_format')
+
     def __init__(self, name: Name = None, wire_format = None):
         if type(name) == str:
             self._name = Name(name)
@@ -20,6 +24,9 @@ class Packet(object):
             return False
         return self.name == other.name #and self.name_payload == other.name_payload
 
+    def __reduce__(self):
+        return type(self), (self._name, self._wire_format)
+
     def __hash__(self):
         return self._name.__hash__() + self._name_payload.__hash__()
 
@@ -35,3 +42,8 @@ class Packet(object):
     @property
     def wire_format(self):
         return self._wire_format
+
+    @wire_format.setter
+    def wire_format(self, wire_format):
+        assert (type(wire_format) in [bytes, bytearray, type(None)]), "MUST be raw bytes or None"
+        self._wire_format = wire_format
@@ -0,0 +1,44 @@
+"""Test Lazy Content Object"""
+import pickle
+import unittest
+
+from PiCN.Packets import Content, LazyContent, Name
+
+
+class TestLazyContent(unittest.TestCase):
+
+    def setUp(self):
+        self.wire_format = b"\x06\x08header" + b"HelloWorld" + b"trailer"
+        self.content = LazyContent(Name("/test/data"), self.wire_format, 8, 10)
+
+    def test_payload_on_demand(self):
+        """Test that the payload is sliced out of the wire format when it is accessed"""
+        self.assertIsNone(self.content._payload)
+        self.assertEqual(10, self.content.content_length)
+        self.assertEqual(b"HelloWorld", self.content.payload_view().tobytes())
+        self.assertIsNone(self.content._payload)
+        self.assertEqual("HelloWorld", self.content.content)
+        self.assertEqual(b"HelloWorld", self.content.get_bytes())
+        self.assertEqual(self.wire_format, self.content.wire_format)
+
+    def test_equal_to_content(self):
+        """Test that lazy content objects are equal to content objects with the same name and payload"""
+        self.assertEqual(Content("/test/data", "HelloWorld"), self.content)
+        self.assertEqual(self.content, Content("/test/data", "HelloWorld"))
+        self.assertNotEqual(self.content, Content("/test/data", "HelloWorld2"))
+
+    def test_set_content(self):
+        """Test replacing the payload"""
+        self.content.content = "Other"
+        self.assertEqual("Other", self.content.content)
+        self.assertEqual(5, self.content.content_length)
+        self.assertEqual(b"Other", self.content.payload_view().tobytes())
+
+    def test_pickle(self):
+        """Test that pickling transfers the wire format but not a decoded copy of the payload"""
+        self.content.get_bytes()
+        unpickled = pickle.loads(pickle.dumps(self.content))
+        self.assertIsNone(unpickled._payload)
+        self.assertEqual(self.content, unpickled)
+        self.content.content = "Other"
+        self.assertEqual("Other", pickle.loads(pickle.dumps(self.content)).content)
@@ -1,6 +1,8 @@
 """Test Name Object"""
 import unittest
 
+import pickle
+
 from PiCN.Packets import Name
 
 
@@ -65,3 +67,61 @@ class TestName(unittest.TestCase):
         n += 'data'
         self.assertEqual([b'test', b'data'], n._components)
         self.assertEqual('/test/data', n.components_to_string())
+
+    def test_hash_equal_names(self):
+        """Test that equal names have equal hashes and can be used as dict keys"""
+        n1 = Name('/test/data')
+        n2 = Name([b'test', b'data'])
+        self.assertEqual(hash(n1), hash(n2))
+        d = {n1: 1}
+        self.assertEqual(1, d[n2])
+        self.assertNotEqual(Name('/test/data').setDigest(b'\x01'), n1)
+
+    def test_modify_components_in_place(self):
+        """Test that modifying the components in place updates equality and hash"""
+        n = Name('/test/data')
+        self.assertEqual(Name('/test/data'), n)
+        n.components.append(b'more')
+        self.assertEqual(Name('/test/data/more'), n)
+        self.assertEqual(hash(Name('/test/data/more')), hash(n))
+        n.components[-1] = b'other'
+        self.assertEqual(Name('/test/data/other'), n)
+        del n.components[0]
+        self.assertEqual(Name('/data/other'), n)
+
+    def test_is_prefix_of(self):
+        """Test the prefix check"""
+        self.assertTrue(Name('/test').is_prefix_of(Name('/test/data')))
+        self.assertTrue(Name('/test/data').is_prefix_of(Name('/test/data')))
+        self.assertTrue(Name().is_prefix_of(Name('/test')))
+        self.assertFalse(Name('/test/data').is_prefix_of(Name('/test')))
+        self.assertFalse(Name('/te').is_prefix_of(Name('/test/data')))
+        self.assertTrue(Name('/test/data').has_prefix(Name('/test')))
+
+    def test_pickle(self):
+        """Test that a name survives pickling"""
+        n = Name('/test/data').setDigest(b'\x01\x02')
+        n2 = pickle.loads(pickle.dumps(n))
+        self.assertEqual(n, n2)
+        self.assertEqual(hash(n), hash(n2))
+        n2.components.append(b'x')
+        self.assertEqual(Name('/test/data/x').setDigest(b'\x01\x02'), n2)
+
+    def test_component_interning(self):
+        """Test that interned components of different names are the same object"""
+        Name.set_component_interning(True)
+        try:
+            n1 = Name('/test/data/1')
+            n2 = Name('/test/data/2')
+            self.assertIs(n1.components[0], n2.components[0])
+            self.assertIs(n1.components[1], n2.components[1])
+        finally:
+            Name.set_component_interning(False)
+
+    def test_equal_string_representation(self):
+        """Test that names with equal string representation are equal, even if the components are split differently"""
+        n1 = Name([b'test', b'/lib/func/f1(_)', b'NFN'])
+        n2 = Name('/test//lib/func/f1(_)/NFN')
+        self.assertEqual(n1, n2)
+        self.assertEqual(hash(n1), hash(n2))
+        self.assertEqual(Name(['test', 'data']), Name('/test/data'))
@@ -1,7 +1,8 @@
 """Test Packet Object"""
+import pickle
 import unittest
 
-from PiCN.Packets import Packet
+from PiCN.Packets import Packet, Interest, Content, Nack, NackReason, Name
 
 class TestPacket(unittest.TestCase):
 
@@ -14,9 +15,7 @@ class TestPacket(unittest.TestCase):
     def test_packet_equal(self):
         """Test if two packet objects are equal"""
         p1 = Packet("/test/data")
-        p1.name_payload = "Hello World"
         p2 = Packet("/test/data")
-        p2.name_payload = "Hello World"
         self.assertEqual(p1, p2)
 
     def test_packet_not_equal_name(self):
@@ -25,6 +24,19 @@ class TestPacket(unittest.TestCase):
         p2 = Packet("/test/data1")
         self.assertNotEqual(p1, p2)
 
+    def test_pickle(self):
+        """Test that packets pickle to their constructor arguments and carry no instance dict"""
+        interest = Interest("/test/data", wire_format=b"\x05\x00")
+        content = Content("/test/data", "Hello World", wire_format=b"\x06\x00")
+        nack = Nack(Name("/test/data"), NackReason.NO_CONTENT, interest=interest)
+        for packet in [Packet("/test/data"), interest, content, nack]:
+            self.assertFalse(hasattr(packet, '__dict__'))
+            unpickled = pickle.loads(pickle.dumps(packet))
+            self.assertIs(type(packet), type(unpickled))
+            self.assertEqual(packet, unpickled)
+            self.assertEqual(packet.wire_format, unpickled.wire_format)
+        self.assertEqual(interest, pickle.loads(pickle.dumps(nack)).interest)
+
     # disabled name payload in compare, since it breaks 1 content <-> 1 interest
     # def test_packet_not_equal_namepayload(self):
     #     """Test if two packet objects are not equal: payload"""
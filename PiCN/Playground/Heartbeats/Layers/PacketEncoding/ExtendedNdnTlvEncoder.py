@@ -1,17 +1,16 @@
 """NDN TLV Encoder (Extended)"""
 
-from PiCNExternal.pyndn.encoding.tlv.tlv.tlv_decoder import TlvDecoder
 from PiCNExternal.pyndn.encoding.tlv.tlv.tlv_encoder import TlvEncoder
 
-from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder
+from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder, NdnTlvCodec
 from PiCN.Packets import Packet, Content, Interest, Name, Nack, UnknownPacket
 
 from PiCN.Playground.Heartbeats.Layers.PacketEncoding.Heartbeat import Heartbeat
 
 
 class ExtendedNdnTlvEncoder(NdnTlvEncoder):
-    def __init__(self, log_level=255):
-        NdnTlvEncoder.__init__(self, log_level=log_level)
+    def __init__(self, log_level=255, name_cache_size: int=4096):
+        NdnTlvEncoder.__init__(self, log_level=log_level, name_cache_size=name_cache_size)
         self.heartbeatTV = 0x02  # deliberately picked for this prototype :)
 
     def encode(self, packet: Packet) -> bytearray:
@@ -87,9 +86,9 @@ class ExtendedNdnTlvEncoder(NdnTlvEncoder):
         :param input: Heartbeat packet in NDN-TLV wire format
         :return: Name
         """
-        decoder = TlvDecoder(input)
-        decoder.readNestedTlvsStart(self.heartbeatTV)
-        return self.decode_name(decoder)
+        with memoryview(input) as view:
+            offset, end = NdnTlvCodec.read_expected(view, 0, len(view), self.heartbeatTV)
+            return NdnTlvCodec.decode_name(view, offset, end)[0]
 
     def encode_heartbeat(self, name: Name) -> bytearray:
         """
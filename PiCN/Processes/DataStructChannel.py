@@ -0,0 +1,192 @@
+"""Command Channel to access data structs owned by a LayerProcess from other processes"""
+
+import multiprocessing
+import queue
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class DataStructProxy(object):
+    """Client side of a DataStructChannel. Method calls are forwarded to the data struct in the owning process.
+    Calls of methods starting with one of the asynchronous prefixes are fire-and-forget, all other calls wait for the
+    result. A proxy must only be used by a single process, use DataStructChannel.get_proxy to create one per client.
+    :param command_queue: command queue of the channel
+    :param name: name under which the data struct is registered in the channel
+    :param reply_queue: queue on which the owner sends results to this proxy
+    :param client_id: id of the reply queue in the channel
+    :param asynchronous_prefixes: method prefixes of calls that do not wait for a result
+    :param timeout: maximum time to wait for a result
+    """
+
+    def __init__(self, command_queue: multiprocessing.Queue, name: str, reply_queue: multiprocessing.Queue,
+                 client_id: int, asynchronous_prefixes: Tuple[str, ...], timeout: float):
+        self._command_queue = command_queue
+        self._name = name
+        self._reply_queue = reply_queue
+        self._client_id = client_id
+        self._asynchronous_prefixes = asynchronous_prefixes
+        self._timeout = timeout
+        self._request_id = 0
+        self._lock = threading.Lock()
+
+    def __getattr__(self, method: str):
+        if method.startswith('_'):
+            raise AttributeError(method)
+
+        def call(*args, **kwargs):
+            return self._call(method, args, kwargs)
+        return call
+
+    def _call(self, method: str, args, kwargs):
+        if method.startswith(self._asynchronous_prefixes):
+            self._command_queue.put((self._name, method, args, kwargs, None, None))
+            return None
+        with self._lock:
+            self._request_id += 1
+            request_id = self._request_id
+            self._command_queue.put((self._name, method, args, kwargs, self._client_id, request_id))
+            while True:
+                try:
+                    reply_id, is_exception, result = self._reply_queue.get(timeout=self._timeout)
+                except queue.Empty:
+                    raise TimeoutError("No reply from data struct owner for " + self._name + "." + method)
+                if reply_id == request_id: # drop replies of requests that timed out before
+                    break
+        if is_exception:
+            raise result
+        return result
+
+    def __getstate__(self):
+        d = dict(self.__dict__)
+        del d['_lock']
+        return d
+
+    def __setstate__(self, d):
+        self.__dict__.update(d)
+        self._lock = threading.Lock()
+
+
+class DataStructChannel(object):
+    """Command Channel to access data structs owned by a LayerProcess from other processes. The owning layer keeps the
+    data structs as local objects and executes commands received on the command queue (use the command queue as
+    control queue of the layer), so the hot path does not need any inter process communication.
+    Proxies must be created before the owning process is started.
+    """
+
+    DEFAULT_ASYNCHRONOUS_PREFIXES = ('add_', 'remove_', 'set_', 'update_', 'clear')
+
+    def __init__(self):
+        self.command_queue: multiprocessing.Queue = multiprocessing.Queue()
+        self._data_structs: Dict[str, object] = {}
+        self._reply_queues: List[multiprocessing.Queue] = []
+
+    def register(self, name: str, data_struct):
+        """register a data struct owned by the layer
+        :param name: name under which the data struct is accessible by proxies
+        :param data_struct: the data struct
+        """
+        self._data_structs[name] = data_struct
+
+    def get_proxy(self, name: str, asynchronous_prefixes: Tuple[str, ...]=DEFAULT_ASYNCHRONOUS_PREFIXES,
+                  timeout: float=10.0) -> DataStructProxy:
+        """create a proxy for a registered data struct
+        :param name: name of the data struct
+        :param asynchronous_prefixes: method prefixes of calls that do not wait for a result
+        :param timeout: maximum time to wait for a result
+        :return: the proxy
+        """
+        if name not in self._data_structs:
+            raise ValueError("No data struct registered with name " + name)
+        reply_queue = multiprocessing.Queue()
+        self._reply_queues.append(reply_queue)
+        return DataStructProxy(self.command_queue, name, reply_queue, len(self._reply_queues) - 1,
+                               asynchronous_prefixes, timeout)
+
+    def handle_command(self, command):
+        """execute a command received on the command queue, must be called by the owning process
+        :param command: command tuple created by a DataStructProxy
+        """
+        name, method, args, kwargs, client_id, request_id = command
+        try:
+            result = getattr(self._data_structs[name], method)(*args, **kwargs)
+            is_exception = False
+        except Exception as e:
+            result = e
+            is_exception = True
+        if client_id is not None:
+            self._reply_queues[client_id].put((request_id, is_exception, result))
+
+    def close(self):
+        """close all queues of the channel"""
+        self.command_queue.close()
+        for q in self._reply_queues:
+            q.close()
+
+
+class ShardedDataStructProxy(object):
+    """Proxy of a data struct that exists once per shard, each copy owned by another LayerProcess.
+    If the data struct is partitioned, calls whose first argument selects a shard (see shard_of) are forwarded to the
+    owner of this shard only. All other calls are forwarded to all owners: integer results are summed up, list results
+    are concatenated, otherwise the result of the first owner is returned.
+    If the data struct is replicated (shard_of is None), all calls are forwarded to all owners and the result of the
+    first owner is returned.
+    :param proxies: proxies of the data struct, one per shard
+    :param shard_of: maps the first argument of a call to a shard index, or to None if it does not select a shard
+    """
+
+    def __init__(self, proxies: List[DataStructProxy], shard_of: Callable[[object], Optional[int]]=None):
+        self._proxies = proxies
+        self._shard_of = shard_of
+
+    def __getattr__(self, method: str):
+        if method.startswith('_'):
+            raise AttributeError(method)
+
+        def call(*args, **kwargs):
+            return self._call(method, args, kwargs)
+        return call
+
+    def _call(self, method: str, args, kwargs):
+        if self._shard_of is None:
+            results = [getattr(p, method)(*args, **kwargs) for p in self._proxies]
+            return results[0]
+        shard = self._shard_of(args[0]) if len(args) > 0 else None
+        if shard is not None:
+            return getattr(self._proxies[shard], method)(*args, **kwargs)
+        results = [getattr(p, method)(*args, **kwargs) for p in self._proxies]
+        if all(type(r) is int for r in results):
+            return sum(results)
+        if all(isinstance(r, list) for r in results):
+            return [e for r in results for e in r]
+        return results[0]
+
+
+class ShardedDataStructChannel(object):
+    """Access data structs that exist once per shard through the DataStructChannels of their owners
+    :param channels: channels of the owning processes, one per shard
+    :param shard_of: maps the first argument of a call to a shard index, see ShardedDataStructProxy
+    :param replicated: names of the data structs that are replicated instead of partitioned
+    """
+
+    def __init__(self, channels: List[DataStructChannel], shard_of: Callable[[object], Optional[int]],
+                 replicated: Tuple[str, ...]=()):
+        self.channels = channels
+        self._shard_of = shard_of
+        self._replicated = replicated
+
+    def get_proxy(self, name: str,
+                  asynchronous_prefixes: Tuple[str, ...]=DataStructChannel.DEFAULT_ASYNCHRONOUS_PREFIXES,
+                  timeout: float=10.0) -> ShardedDataStructProxy:
+        """create a proxy for a data struct registered in all channels
+        :param name: name of the data struct
+        :param asynchronous_prefixes: method prefixes of calls that do not wait for a result
+        :param timeout: maximum time to wait for a result
+        :return: the proxy
+        """
+        proxies = [c.get_proxy(name, asynchronous_prefixes, timeout) for c in self.channels]
+        return ShardedDataStructProxy(proxies, None if name in self._replicated else self._shard_of)
+
+    def close(self):
+        """close all channels"""
+        for c in self.channels:
+            c.close()
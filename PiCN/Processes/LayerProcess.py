@@ -1,13 +1,19 @@
 """ Abstract Class defining a Process running on a layer"""
 
 import abc
+import asyncio
 import inspect
 import multiprocessing
 import os
+import queue
 import select
+import threading
 import time
+from typing import List
 
 from PiCN.Processes import PiCNProcess
+from PiCN.Processes.LocalQueue import LocalQueue
+from PiCN.Processes.QueueBatch import QueueBatch, BatchingQueue
 
 class LayerProcess(PiCNProcess):
     """ Abstract Class defining a Process running on a layer"""
@@ -18,6 +24,12 @@ class LayerProcess(PiCNProcess):
         self._queue_from_higher: multiprocessing.Queue = None
         self._queue_to_lower: multiprocessing.Queue = None
         self._queue_to_higher: multiprocessing.Queue = None
+        self._queue_control: multiprocessing.Queue = None
+        self._event_loop: asyncio.AbstractEventLoop = None
+        self._task = None
+        self._batch_size: int = 1
+        self.coalesce_to_lower: bool = False # put the output of a batch into the queue to lower as one QueueBatch
+        self.coalesce_to_higher: bool = False # put the output of a batch into the queue to higher as one QueueBatch
         self.stop: bool = False
 
     @property
@@ -56,6 +68,33 @@ class LayerProcess(PiCNProcess):
     def queue_to_higher(self, q):
         self._queue_to_higher = q
 
+    @property
+    def queue_control(self):
+        """Queue to get control commands from other processes, handled by data_from_control"""
+        return self._queue_control
+
+    @queue_control.setter
+    def queue_control(self, q):
+        self._queue_control = q
+
+    @property
+    def event_loop(self):
+        """Event loop to run the layer in (asyncio execution mode), None to run the layer in its own process"""
+        return self._event_loop
+
+    @event_loop.setter
+    def event_loop(self, loop: asyncio.AbstractEventLoop):
+        self._event_loop = loop
+
+    @property
+    def batch_size(self) -> int:
+        """Maximum number of items dequeued and handled at once when a queue is readable (batch mode if > 1)"""
+        return self._batch_size
+
+    @batch_size.setter
+    def batch_size(self, batch_size: int):
+        self._batch_size = max(1, batch_size)
+
     @abc.abstractmethod
     def data_from_lower(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
         """ handle incoming data from the lower layer """
@@ -64,6 +103,74 @@ class LayerProcess(PiCNProcess):
     def data_from_higher(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
         """ handle incoming data from the higher layer """
 
+    def data_from_control(self, data):
+        """ handle incoming data from the control queue, must be implemented by layers using a control queue """
+        self.logger.warning("Layer does not handle control commands, dropping")
+
+    def data_from_lower_batch(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, batch: List):
+        """ handle a burst of incoming data from the lower layer in batch mode, calls data_from_lower for each item.
+            Override to process the whole burst at once. """
+        for data in batch:
+            self.data_from_lower(to_lower, to_higher, data)
+
+    def data_from_higher_batch(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, batch: List):
+        """ handle a burst of incoming data from the higher layer in batch mode, calls data_from_higher for each item.
+            Override to process the whole burst at once. """
+        for data in batch:
+            self.data_from_higher(to_lower, to_higher, data)
+
+    def _handle_from_lower(self, from_lower: multiprocessing.Queue, to_lower: multiprocessing.Queue,
+                           to_higher: multiprocessing.Queue) -> bool:
+        """ dequeue and handle data from the lower layer, up to batch_size items in batch mode
+            :return: True if data was handled
+        """
+        return self._handle_queue(from_lower, to_lower, to_higher, self.data_from_lower, self.data_from_lower_batch)
+
+    def _handle_from_higher(self, from_higher: multiprocessing.Queue, to_lower: multiprocessing.Queue,
+                            to_higher: multiprocessing.Queue) -> bool:
+        """ dequeue and handle data from the higher layer, up to batch_size items in batch mode
+            :return: True if data was handled
+        """
+        return self._handle_queue(from_higher, to_lower, to_higher, self.data_from_higher,
+                                  self.data_from_higher_batch)
+
+    def _handle_queue(self, q, to_lower, to_higher, handler, batch_handler) -> bool:
+        """ dequeue one item, or in batch mode drain up to batch_size items without checking empty() per item and
+            coalesce the output of the batch handler. Received QueueBatches are unpacked in both modes. """
+        if self._batch_size <= 1:
+            if q.empty():
+                return False
+            data = q.get()
+            if type(data) is QueueBatch:
+                for d in data:
+                    handler(to_lower, to_higher, d)
+            else:
+                handler(to_lower, to_higher, data)
+            return True
+        batch = []
+        while len(batch) < self._batch_size:
+            try:
+                data = q.get_nowait()
+            except queue.Empty:
+                break
+            if type(data) is QueueBatch:
+                batch.extend(data)
+            else:
+                batch.append(data)
+        if len(batch) == 0:
+            return False
+        if self.coalesce_to_lower and to_lower is not None:
+            to_lower = BatchingQueue(to_lower)
+        if self.coalesce_to_higher and to_higher is not None:
+            to_higher = BatchingQueue(to_higher)
+        try:
+            batch_handler(to_lower, to_higher, batch)
+        finally:
+            for out in [to_lower, to_higher]:
+                if isinstance(out, BatchingQueue):
+                    out.flush()
+        return True
+
     def _run_poll(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
             to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
         """ Process loop, handle incoming packets, use poll if many file descriptors are required
@@ -78,13 +185,18 @@ class LayerProcess(PiCNProcess):
             poller.register(from_lower._reader, READ_ONLY)
         if from_higher:
             poller.register(from_higher._reader, READ_ONLY)
+        control = self._queue_control
+        if control:
+            poller.register(control._reader, READ_ONLY)
         while True:
             ready_vars = poller.poll()
             for filno, var in ready_vars:
-                if from_lower and filno == from_lower._reader.fileno() and not from_lower.empty():
-                    self.data_from_lower(to_lower, to_higher, from_lower.get())
-                elif from_higher and filno == from_higher._reader.fileno() and not from_higher.empty():
-                    self.data_from_higher(to_lower, to_higher, from_higher.get())
+                if from_lower and filno == from_lower._reader.fileno():
+                    self._handle_from_lower(from_lower, to_lower, to_higher)
+                elif from_higher and filno == from_higher._reader.fileno():
+                    self._handle_from_higher(from_higher, to_lower, to_higher)
+                elif control and filno == control._reader.fileno() and not control.empty():
+                    self.data_from_control(control.get())
 
     def _run_select(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
              to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
@@ -99,15 +211,20 @@ class LayerProcess(PiCNProcess):
             in_queues.append(from_lower._reader)
         if from_higher:
             in_queues.append(from_higher._reader)
+        control = self._queue_control
+        if control:
+            in_queues.append(control._reader)
         while True:
             if len(in_queues) == 0:
                 continue
             ready_vars, _, _ = select.select(in_queues, [], [])
             for var in ready_vars:
-                if from_lower and var == from_lower._reader and not from_lower.empty():
-                    self.data_from_lower(to_lower, to_higher, from_lower.get())
-                elif from_higher and var == from_higher._reader and not from_higher.empty():
-                    self.data_from_higher(to_lower, to_higher, from_higher.get())
+                if from_lower and var == from_lower._reader:
+                    self._handle_from_lower(from_lower, to_lower, to_higher)
+                elif from_higher and var == from_higher._reader:
+                    self._handle_from_higher(from_higher, to_lower, to_higher)
+                elif control and var == control._reader and not control.empty():
+                    self.data_from_control(control.get())
 
     def _run_sleep(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
                    to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
@@ -120,14 +237,63 @@ class LayerProcess(PiCNProcess):
          """
         while True:
             dequeued: bool = False
-            if from_lower and not from_lower.empty():
-                self.data_from_lower(to_lower, to_higher, from_lower.get())
+            if from_lower and self._handle_from_lower(from_lower, to_lower, to_higher):
                 dequeued = True
-            if from_higher and not from_higher.empty():
-                self.data_from_higher(to_lower, to_higher, from_higher.get())
+            if from_higher:
+                self._handle_from_higher(from_higher, to_lower, to_higher)
+            if self._queue_control and not self._queue_control.empty():
+                self.data_from_control(self._queue_control.get())
             if not dequeued:
                 time.sleep(0.3)
 
+    async def _run_async(self, from_lower, from_higher, to_lower, to_higher):
+        """ Process loop for the asyncio execution mode, handle incoming packets as coroutine in a shared event loop.
+            Queues are expected to be LocalQueues, multiprocessing.Queues are watched using their file descriptor.
+            :param from_lower: Queue to receive data from lower Layer
+            :param from_higher: Queue to receive data from higher Layer
+            :param to_lower: Queue to send data to lower Layer
+            :param to_higher: Queue to send data to higher Layer
+        """
+        loop = asyncio.get_event_loop()
+        loop_thread = threading.get_ident()
+        wakeup = asyncio.Event()
+
+        def notify():
+            if threading.get_ident() == loop_thread:
+                wakeup.set()
+            else:
+                loop.call_soon_threadsafe(wakeup.set)
+
+        control = self._queue_control
+        watched = [q for q in [from_lower, from_higher, control] if q]
+        for q in watched:
+            if isinstance(q, LocalQueue):
+                q.register_listener(notify)
+            else:
+                loop.add_reader(q._reader.fileno(), notify)
+        wakeup.set() # handle data enqueued before the listeners were registered
+        try:
+            while True:
+                await wakeup.wait()
+                wakeup.clear()
+                dequeued = True
+                while dequeued: # handle one packet (or batch) per direction, then let the other layers run
+                    dequeued = False
+                    if from_lower and self._handle_from_lower(from_lower, to_lower, to_higher):
+                        dequeued = True
+                    if from_higher and self._handle_from_higher(from_higher, to_lower, to_higher):
+                        dequeued = True
+                    if control and not control.empty():
+                        self.data_from_control(control.get())
+                        dequeued = True
+                    await asyncio.sleep(0)
+        finally:
+            for q in watched:
+                if isinstance(q, LocalQueue):
+                    q.unregister_listener(notify)
+                else:
+                    loop.remove_reader(q._reader.fileno())
+
     def _run(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
              to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
         """
@@ -146,7 +312,13 @@ class LayerProcess(PiCNProcess):
             self._run_select(from_lower, from_higher, to_lower, to_higher)
 
     def start_process(self):
-        """Start the Layer Process"""
+        """Start the Layer Process, or schedule it as coroutine if an event loop was assigned"""
+        if self._event_loop is not None:
+            self._task = asyncio.run_coroutine_threadsafe(self._run_async(self._queue_from_lower,
+                                                                          self._queue_from_higher,
+                                                                          self._queue_to_lower,
+                                                                          self._queue_to_higher), self._event_loop)
+            return
         self.process = multiprocessing.Process(target=self._run, args=[self._queue_from_lower,
                                                                             self._queue_from_higher,
                                                                             self._queue_to_lower,
@@ -156,6 +328,9 @@ class LayerProcess(PiCNProcess):
 
     def stop_process(self):
         """Stop the Layer Process"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
         if self.process:
             #self.process.kill()
             self.process.terminate()
@@ -173,6 +348,9 @@ class LayerProcess(PiCNProcess):
         if self.queue_from_higher:
             self.queue_from_higher.close()
             self.queue_from_higher.join_thread()
+        if self.queue_control:
+            self.queue_control.close()
+            self.queue_control.join_thread()
         time.sleep(0.1)
 
     def in_unittest(self):
@@ -0,0 +1,84 @@
+"""In-memory Queue connecting LayerProcesses that run in the same process"""
+
+import collections
+import queue
+import threading
+import time
+
+
+class LocalQueue(object):
+    """In-memory Queue connecting LayerProcesses that run in the same process (asyncio execution mode).
+    Provides the subset of the multiprocessing.Queue interface used by the layers, but hands over objects by
+    reference instead of pickling them through a pipe. put and get are thread safe, so timers and applications
+    running in other threads can use the queue as well.
+    """
+
+    def __init__(self):
+        self._items = collections.deque()
+        self._not_empty = threading.Condition(threading.Lock())
+        self._listeners = []
+
+    def put(self, item, block: bool=True, timeout: float=None):
+        """Append an item to the queue and notify registered listeners
+        :param item: item to be appended
+        :param block: unused, the queue is unbounded
+        :param timeout: unused, the queue is unbounded
+        """
+        with self._not_empty:
+            self._items.append(item)
+            self._not_empty.notify()
+        for listener in self._listeners:
+            listener()
+
+    def put_nowait(self, item):
+        self.put(item, False)
+
+    def get(self, block: bool=True, timeout: float=None):
+        """Remove and return the first item of the queue
+        :param block: if true, wait until an item is available
+        :param timeout: maximum time to wait if block is true, None to wait forever
+        :raises queue.Empty if no item is available
+        """
+        with self._not_empty:
+            if not block:
+                if not self._items:
+                    raise queue.Empty
+            elif timeout is None:
+                while not self._items:
+                    self._not_empty.wait()
+            else:
+                end = time.time() + timeout
+                while not self._items:
+                    remaining = end - time.time()
+                    if remaining <= 0:
+                        raise queue.Empty
+                    self._not_empty.wait(remaining)
+            return self._items.popleft()
+
+    def get_nowait(self):
+        return self.get(False)
+
+    def empty(self) -> bool:
+        return len(self._items) == 0
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def register_listener(self, listener):
+        """Register a callable that is invoked after each put, used to wake up the consuming coroutine
+        :param listener: callable without arguments
+        """
+        self._listeners.append(listener)
+
+    def unregister_listener(self, listener):
+        """Remove a listener that was registered with register_listener
+        :param listener: listener to be removed
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def close(self):
+        """Nothing to release, exists for compatibility with multiprocessing.Queue"""
+
+    def join_thread(self):
+        """No feeder thread, exists for compatibility with multiprocessing.Queue"""
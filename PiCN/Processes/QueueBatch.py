@@ -0,0 +1,39 @@
+"""Batches of queue items, used by LayerProcess to coalesce the output of a burst into a single put"""
+
+import multiprocessing
+from typing import List
+
+
+class QueueBatch(list):
+    """A list of queue items that was put into a queue as a whole. LayerProcess unpacks batches before handling the
+    items, so a batch must only be put into queues read by a LayerProcess."""
+
+
+class BatchingQueue(object):
+    """Wrapper of a queue that collects all items put into it until flush() is called. flush() puts a single item as it
+    is and multiple items as one QueueBatch. Other attributes are forwarded to the wrapped queue.
+    :param queue: the wrapped queue
+    """
+
+    def __init__(self, queue: multiprocessing.Queue):
+        self._queue = queue
+        self._items: List = []
+
+    def put(self, item, block=True, timeout=None):
+        self._items.append(item)
+
+    def put_nowait(self, item):
+        self._items.append(item)
+
+    def flush(self):
+        """put the collected items into the wrapped queue"""
+        if len(self._items) == 0:
+            return
+        if len(self._items) == 1:
+            self._queue.put(self._items[0])
+        else:
+            self._queue.put(QueueBatch(self._items))
+        self._items = []
+
+    def __getattr__(self, item):
+        return getattr(self._queue, item)
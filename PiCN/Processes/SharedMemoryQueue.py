@@ -0,0 +1,233 @@
+"""Queue connecting LayerProcesses through a ring buffer in shared memory"""
+
+import errno
+import multiprocessing
+import os
+import pickle
+import queue
+import select
+import struct
+import time
+from multiprocessing import shared_memory
+
+
+class _WakeupReader(object):
+    """Readable file descriptor of a SharedMemoryQueue, used in place of the _reader connection of a
+    multiprocessing.Queue by the poll/select loops of the layers"""
+
+    def __init__(self, fd: int):
+        self._fd = fd
+
+    def fileno(self) -> int:
+        return self._fd
+
+
+class SharedMemoryQueue(object):
+    """Queue connecting LayerProcesses through a ring buffer in shared memory.
+    Items are written as length-prefixed frames. Items of the form [faceid, bytes], as exchanged between the link layer
+    and the packet encoding layer, are copied into the ring as they are; all other items are pickled.
+    An eventfd (a pipe if eventfd is not available) is used for wakeups only: it is readable whenever the ring may
+    contain frames, and the consumer only resets it when it finds the ring empty, so a burst costs one read syscall.
+    Provides the subset of the multiprocessing.Queue interface used by the layers. The queue must be created before the
+    processes using it are forked. Producers and consumers are serialized by process shared locks (e.g. timers of a
+    layer put from the parent process), which do not need a syscall if uncontended.
+    The write and read index are only accessed while holding a third process shared lock. Taking and releasing it is
+    a full memory barrier, so a consumer that sees a published write index also sees the frame data written before
+    it, also on weakly ordered CPUs (e.g. ARM).
+    Items whose frame exceeds half of the ring are pickled into a shared memory segment of their own, which the
+    consumer unlinks after reading it. Only a frame with the name of the segment is written to the ring, which keeps
+    these items in order with the other ones.
+    :param capacity: size of the ring buffer in bytes
+    """
+
+    _INDEX = struct.Struct('<QQ') # write index, read index (both monotonic)
+    _FRAME = struct.Struct('<IBq') # payload length, kind, faceid
+    _KIND_WIRE = 0
+    _KIND_PICKLE = 1
+    _KIND_OVERFLOW = 2
+
+    def __init__(self, capacity: int=4 * 1024 * 1024):
+        self._capacity = capacity
+        self._shm = shared_memory.SharedMemory(create=True, size=self._INDEX.size + capacity)
+        self._INDEX.pack_into(self._shm.buf, 0, 0, 0)
+        self._creator_pid = os.getpid()
+        if hasattr(os, 'eventfd'):
+            self._wakeup_r = os.eventfd(0, os.EFD_NONBLOCK)
+            self._wakeup_w = self._wakeup_r
+        else:
+            self._wakeup_r, self._wakeup_w = os.pipe()
+            os.set_blocking(self._wakeup_r, False)
+            os.set_blocking(self._wakeup_w, False)
+        self._reader = _WakeupReader(self._wakeup_r)
+        self._put_lock = multiprocessing.Lock()
+        self._get_lock = multiprocessing.Lock()
+        self._index_lock = multiprocessing.Lock()
+        self._closed = False
+
+    def put(self, item, block: bool=True, timeout: float=None):
+        """Append an item to the queue, waits for free space if the ring is full
+        :param item: item to be appended
+        :param block: if true, wait until there is enough space in the ring
+        :param timeout: maximum time to wait if block is true, None to wait forever
+        :raises queue.Full if there is not enough space in the ring
+        """
+        if type(item) is list and len(item) == 2 and type(item[0]) is int and type(item[1]) in [bytes, bytearray]:
+            header = self._FRAME.pack(len(item[1]), self._KIND_WIRE, item[0])
+            payload = item[1]
+        else:
+            payload = pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+            header = self._FRAME.pack(len(payload), self._KIND_PICKLE, 0)
+        if len(header) + len(payload) > self._capacity // 2:
+            if header[4] == self._KIND_WIRE:
+                payload = pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+            segment = shared_memory.SharedMemory(create=True, size=len(payload))
+            segment.buf[:len(payload)] = payload
+            segment.close()
+            header = self._FRAME.pack(len(segment.name.encode()), self._KIND_OVERFLOW, len(payload))
+            payload = segment.name.encode()
+        size = len(header) + len(payload)
+        with self._put_lock:
+            write, read = self._read_index()
+            if self._capacity - (write - read) < size:
+                self._wait_for_space(write, size, block, timeout)
+            self._copy_in(write, header)
+            self._copy_in(write + len(header), payload)
+            with self._index_lock: # publish the frame after its data was written
+                struct.pack_into('<Q', self._shm.buf, 0, write + size)
+        self._signal()
+
+    def put_nowait(self, item):
+        self.put(item, False)
+
+    def get(self, block: bool=True, timeout: float=None):
+        """Remove and return the first item of the queue
+        :param block: if true, wait until an item is available
+        :param timeout: maximum time to wait if block is true, None to wait forever
+        :raises queue.Empty if no item is available
+        """
+        end = None if timeout is None else time.time() + timeout
+        with self._get_lock:
+            while True:
+                if not self._ring_empty() or not self._reset_wakeup():
+                    return self._pop()
+                if not block:
+                    raise queue.Empty
+                remaining = None if end is None else end - time.time()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                select.select([self._wakeup_r], [], [], remaining)
+
+    def get_nowait(self):
+        return self.get(False)
+
+    def empty(self) -> bool:
+        """True if the ring is empty, resets the wakeup file descriptor in this case"""
+        with self._get_lock:
+            if not self._ring_empty():
+                return False
+            return self._reset_wakeup()
+
+    def close(self):
+        """Release the shared memory and the wakeup file descriptors, the creating process also unlinks the memory"""
+        if self._closed:
+            return
+        self._closed = True
+        self._shm.close()
+        if os.getpid() == self._creator_pid:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+        for fd in {self._wakeup_r, self._wakeup_w}:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def join_thread(self):
+        """No feeder thread, exists for compatibility with multiprocessing.Queue"""
+
+    def _read_index(self) -> (int, int):
+        with self._index_lock:
+            return self._INDEX.unpack_from(self._shm.buf, 0)
+
+    def _ring_empty(self) -> bool:
+        write, read = self._read_index()
+        return write == read
+
+    def _pop(self):
+        write, read = self._read_index()
+        length, kind, faceid = self._FRAME.unpack(self._copy_out(read, self._FRAME.size))
+        payload = self._copy_out(read + self._FRAME.size, length)
+        with self._index_lock: # release the space after the frame was copied out
+            struct.pack_into('<Q', self._shm.buf, 8, read + self._FRAME.size + length)
+        if kind == self._KIND_WIRE:
+            return [faceid, payload]
+        if kind == self._KIND_OVERFLOW:
+            return self._pop_segment(payload.decode(), faceid)
+        return pickle.loads(payload)
+
+    def _pop_segment(self, name: str, length: int):
+        """read and unlink the shared memory segment of an item too large for the ring"""
+        segment = shared_memory.SharedMemory(name=name)
+        try:
+            return pickle.loads(segment.buf[:length])
+        finally:
+            segment.close()
+            segment.unlink()
+
+    def _copy_in(self, index: int, data):
+        data = memoryview(data)
+        start = index % self._capacity
+        first = min(len(data), self._capacity - start)
+        offset = self._INDEX.size
+        self._shm.buf[offset + start:offset + start + first] = data[:first]
+        if first < len(data):
+            self._shm.buf[offset:offset + len(data) - first] = data[first:]
+
+    def _copy_out(self, index: int, length: int) -> bytes:
+        start = index % self._capacity
+        first = min(length, self._capacity - start)
+        offset = self._INDEX.size
+        data = bytes(self._shm.buf[offset + start:offset + start + first])
+        if first < length:
+            data += bytes(self._shm.buf[offset:offset + length - first])
+        return data
+
+    def _wait_for_space(self, write: int, size: int, block: bool, timeout: float):
+        end = None if timeout is None else time.time() + timeout
+        delay = 0.0001
+        while True:
+            read = self._read_index()[1]
+            if self._capacity - (write - read) >= size:
+                return
+            if not block or (end is not None and time.time() >= end):
+                raise queue.Full
+            time.sleep(delay)
+            delay = min(delay * 2, 0.01)
+
+    def _signal(self):
+        try:
+            if self._wakeup_w == self._wakeup_r:
+                os.eventfd_write(self._wakeup_w, 1)
+            else:
+                os.write(self._wakeup_w, b'\x01')
+        except BlockingIOError: # pipe is full, the consumer is woken up anyway
+            pass
+        except OSError as e:
+            if e.errno != errno.EBADF:
+                raise
+
+    def _reset_wakeup(self) -> bool:
+        """clear the wakeup file descriptor after the ring was found empty
+        :return: True if the ring is still empty, False if a frame arrived meanwhile (the wakeup is re-armed)
+        """
+        try:
+            while len(os.read(self._wakeup_r, 4096)) == 4096:
+                pass
+        except BlockingIOError:
+            pass
+        if self._ring_empty():
+            return True
+        self._signal() # frames published before the reset must keep the queue readable
+        return False
@@ -1,5 +1,9 @@
 """Abstract superclasses for PiCN"""
 
 from .PiCNProcess import PiCNProcess
+from .LocalQueue import LocalQueue
+from .SharedMemoryQueue import SharedMemoryQueue
+from .QueueBatch import QueueBatch, BatchingQueue
 from .LayerProcess import LayerProcess
 from .PiCNSyncDataStructFactory import PiCNSyncDataStructFactory
+from .DataStructChannel import DataStructChannel, DataStructProxy, ShardedDataStructChannel, ShardedDataStructProxy
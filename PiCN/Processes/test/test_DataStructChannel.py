@@ -0,0 +1,56 @@
+"""Test the DataStructChannel"""
+
+import threading
+import unittest
+
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact
+from PiCN.Packets import Content, Name
+from PiCN.Processes import DataStructChannel
+
+
+class test_DataStructChannel(unittest.TestCase):
+    """Test the DataStructChannel"""
+
+    def setUp(self):
+        self.cs = ContentStoreMemoryExact()
+        self.channel = DataStructChannel()
+        self.channel.register("cs", self.cs)
+        self.proxy = self.channel.get_proxy("cs", timeout=2.0)
+
+    def tearDown(self):
+        self.channel.close()
+
+    def handle_commands(self, num):
+        for i in range(num):
+            self.channel.handle_command(self.channel.command_queue.get(timeout=2.0))
+
+    def test_asynchronous_call(self):
+        """Test that mutating calls do not wait and are executed by the owner"""
+        content = Content("/test/data", "HelloWorld")
+        self.assertIsNone(self.proxy.add_content_object(content))
+        self.assertIsNone(self.cs.find_content_object(content.name))
+        self.handle_commands(1)
+        self.assertEqual(content, self.cs.find_content_object(content.name).content)
+
+    def test_synchronous_call(self):
+        """Test that reading calls return the result of the owner"""
+        content = Content("/test/data", "HelloWorld")
+        self.cs.add_content_object(content)
+        owner = threading.Thread(target=self.handle_commands, args=[2])
+        owner.start()
+        self.assertEqual(content, self.proxy.find_content_object(Name("/test/data")).content)
+        self.assertIsNone(self.proxy.find_content_object(Name("/test/other")))
+        owner.join()
+
+    def test_exception_is_raised_at_client(self):
+        """Test that exceptions of the owner are raised by the proxy"""
+        owner = threading.Thread(target=self.handle_commands, args=[1])
+        owner.start()
+        with self.assertRaises(AttributeError):
+            self.proxy.no_such_method()
+        owner.join()
+
+    def test_unknown_data_struct(self):
+        """Test that proxies can only be created for registered data structs"""
+        with self.assertRaises(ValueError):
+            self.channel.get_proxy("pit")
@@ -1,9 +1,10 @@
 """Test the Abstract Class LayerProcess"""
 
+import time
 import unittest
 
 from multiprocessing import Queue
-from PiCN.Processes import LayerProcess
+from PiCN.Processes import LayerProcess, QueueBatch
 
 class LayerMock(LayerProcess):
     """ Mock implementation of a LayerProcess """
@@ -47,3 +48,34 @@ class TestLayerProcess(unittest.TestCase):
         self.q2_fromLower.put("Testdata")
         output = self.q3_toHigher.get()
         self.assertEqual(output, "Testdata")
+
+    def test_unpack_batch(self):
+        """ Test that a QueueBatch is handled item by item """
+        self.layer.start_process()
+        self.q1_fromHiger.put(QueueBatch(["Testdata1", "Testdata2"]))
+        self.assertEqual(self.q4_toLower.get(timeout=2.0), "Testdata1")
+        self.assertEqual(self.q4_toLower.get(timeout=2.0), "Testdata2")
+
+    def test_batch_mode(self):
+        """ Test handling data in batch mode, without coalescing the output """
+        self.layer.batch_size = 8
+        self.layer.start_process()
+        for i in range(20):
+            self.q2_fromLower.put(i)
+        for i in range(20):
+            self.assertEqual(self.q3_toHigher.get(timeout=2.0), i)
+
+    def test_batch_mode_coalesce(self):
+        """ Test that a burst is drained at once and its output is put as a single QueueBatch """
+        self.layer.batch_size = 4
+        self.layer.coalesce_to_higher = True
+        for i in range(6):
+            self.q2_fromLower.put(i)
+        time.sleep(0.2)
+        self.assertTrue(self.layer._handle_from_lower(self.q2_fromLower, self.q4_toLower, self.q3_toHigher))
+        output = self.q3_toHigher.get(timeout=2.0)
+        self.assertIsInstance(output, QueueBatch)
+        self.assertEqual(output, [0, 1, 2, 3])
+        self.assertTrue(self.layer._handle_from_lower(self.q2_fromLower, self.q4_toLower, self.q3_toHigher))
+        self.assertEqual(self.q3_toHigher.get(timeout=2.0), QueueBatch([4, 5]))
+        self.assertFalse(self.layer._handle_from_lower(self.q2_fromLower, self.q4_toLower, self.q3_toHigher))
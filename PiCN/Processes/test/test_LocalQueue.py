@@ -0,0 +1,48 @@
+"""Test the LocalQueue"""
+
+import queue
+import threading
+import unittest
+
+from PiCN.Processes import LocalQueue
+
+
+class test_LocalQueue(unittest.TestCase):
+    """Test the LocalQueue"""
+
+    def setUp(self):
+        self.queue: LocalQueue = LocalQueue()
+
+    def test_put_get_fifo(self):
+        """Test that items are returned in insertion order and by reference"""
+        data = [1, object()]
+        self.queue.put(data)
+        self.queue.put("second")
+        self.assertFalse(self.queue.empty())
+        self.assertEqual(2, self.queue.qsize())
+        self.assertIs(data, self.queue.get())
+        self.assertEqual("second", self.queue.get())
+        self.assertTrue(self.queue.empty())
+
+    def test_get_timeout(self):
+        """Test that get raises queue.Empty after the timeout"""
+        with self.assertRaises(queue.Empty):
+            self.queue.get(timeout=0.1)
+        with self.assertRaises(queue.Empty):
+            self.queue.get_nowait()
+
+    def test_get_from_other_thread(self):
+        """Test that a blocking get returns an item put by another thread"""
+        t = threading.Timer(0.1, self.queue.put, args=["Testdata"])
+        t.start()
+        self.assertEqual("Testdata", self.queue.get(timeout=2.0))
+
+    def test_listener(self):
+        """Test that listeners are notified on put until they are unregistered"""
+        calls = []
+        listener = lambda: calls.append(True)
+        self.queue.register_listener(listener)
+        self.queue.put(1)
+        self.queue.unregister_listener(listener)
+        self.queue.put(2)
+        self.assertEqual(1, len(calls))
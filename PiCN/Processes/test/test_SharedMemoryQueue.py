@@ -0,0 +1,112 @@
+"""Test the SharedMemoryQueue"""
+
+import multiprocessing
+import queue
+import select
+import unittest
+
+from PiCN.Packets import Interest
+from PiCN.Processes import SharedMemoryQueue, QueueBatch
+
+
+def producer(q: SharedMemoryQueue, n: int):
+    for i in range(n):
+        q.put([i, bytes([i % 256]) * 100])
+
+
+def large_producer(q: SharedMemoryQueue, n: int):
+    for i in range(n):
+        q.put([i, bytes([i % 256]) * (100 if i % 2 else 2000)])
+
+
+class test_SharedMemoryQueue(unittest.TestCase):
+    """Test the SharedMemoryQueue"""
+
+    def setUp(self):
+        self.queue: SharedMemoryQueue = SharedMemoryQueue(capacity=1024)
+
+    def tearDown(self):
+        self.queue.close()
+
+    def test_put_get_wire_format(self):
+        """Test that [faceid, bytes] items are returned in insertion order"""
+        self.queue.put([1, b"wire"])
+        self.queue.put([-1, bytearray(b"format")])
+        self.assertFalse(self.queue.empty())
+        self.assertEqual([1, b"wire"], self.queue.get())
+        self.assertEqual([-1, b"format"], self.queue.get())
+        self.assertTrue(self.queue.empty())
+
+    def test_put_get_objects(self):
+        """Test that other items are pickled"""
+        interest = Interest("/test/data")
+        self.queue.put([2, interest])
+        self.queue.put(QueueBatch(["a", "b"]))
+        self.assertEqual([2, interest], self.queue.get())
+        batch = self.queue.get()
+        self.assertIsInstance(batch, QueueBatch)
+        self.assertEqual(["a", "b"], batch)
+
+    def test_get_timeout(self):
+        """Test that get raises queue.Empty after the timeout"""
+        with self.assertRaises(queue.Empty):
+            self.queue.get(timeout=0.1)
+        with self.assertRaises(queue.Empty):
+            self.queue.get_nowait()
+
+    def test_wrap_around(self):
+        """Test frames wrapping around the end of the ring"""
+        for i in range(50):
+            data = bytes([i]) * (i * 7 % 300)
+            self.queue.put([i, data])
+            self.assertEqual([i, data], self.queue.get_nowait())
+
+    def test_full(self):
+        """Test that put raises queue.Full if the ring is full"""
+        for i in range(3):
+            self.queue.put([i, b"x" * 300])
+        with self.assertRaises(queue.Full):
+            self.queue.put([3, b"x" * 300], block=False)
+
+    def test_too_large(self):
+        """Test that items larger than half of the ring are passed in order with the other items"""
+        self.queue.put([1, b"a" * 100])
+        self.queue.put([2, b"b" * 600])
+        self.queue.put(["big", b"c" * 5000])
+        self.queue.put([3, b"d" * 100])
+        self.assertEqual([1, b"a" * 100], self.queue.get_nowait())
+        self.assertEqual([2, b"b" * 600], self.queue.get_nowait())
+        self.assertEqual(["big", b"c" * 5000], self.queue.get_nowait())
+        self.assertEqual([3, b"d" * 100], self.queue.get_nowait())
+        self.assertTrue(self.queue.empty())
+
+    def test_wakeup_file_descriptor(self):
+        """Test that the reader is readable iff frames may be in the ring"""
+        readable, _, _ = select.select([self.queue._reader], [], [], 0)
+        self.assertEqual([], readable)
+        self.queue.put([1, b"a"])
+        self.queue.put([2, b"b"])
+        readable, _, _ = select.select([self.queue._reader], [], [], 0)
+        self.assertEqual([self.queue._reader], readable)
+        self.queue.get()
+        self.assertFalse(self.queue.empty())
+        self.queue.get()
+        self.assertTrue(self.queue.empty())
+        readable, _, _ = select.select([self.queue._reader], [], [], 0)
+        self.assertEqual([], readable)
+
+    def test_other_process(self):
+        """Test handing over items from another process, with a ring smaller than the data"""
+        p = multiprocessing.Process(target=producer, args=[self.queue, 200])
+        p.start()
+        for i in range(200):
+            self.assertEqual([i, bytes([i % 256]) * 100], self.queue.get(timeout=5.0))
+        p.join()
+
+    def test_other_process_too_large(self):
+        """Test handing over items larger than half of the ring from another process"""
+        p = multiprocessing.Process(target=large_producer, args=[self.queue, 50])
+        p.start()
+        for i in range(50):
+            self.assertEqual([i, bytes([i % 256]) * (100 if i % 2 else 2000)], self.queue.get(timeout=5.0))
+        p.join()
@@ -0,0 +1,237 @@
+"""Benchmark of the packet encoders"""
+
+import multiprocessing
+import platform
+import queue
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from PiCN.Layers.PacketEncodingLayer import BasicPacketEncodingLayer
+from PiCN.Layers.PacketEncodingLayer.Encoder import BasicEncoder, CompactEncoder, NdnTlvEncoder, SimpleStringEncoder
+from PiCN.Packets import Content, Interest, Nack, NackReason, Name, Packet
+from PiCN.Processes import LocalQueue
+
+
+def create_encoder(encoder_name: str, name_cache: bool=True) -> BasicEncoder:
+    """create an encoder by its name (ndntlv, simple, compact or extended)
+    :param name_cache: False to disable the cache of encoded names (NDN-TLV encoders)
+    """
+    name_cache_size = 4096 if name_cache else 0
+    if encoder_name == 'ndntlv':
+        return NdnTlvEncoder(name_cache_size=name_cache_size)
+    elif encoder_name == 'simple':
+        return SimpleStringEncoder()
+    elif encoder_name == 'compact':
+        return CompactEncoder()
+    elif encoder_name == 'extended':
+        from PiCN.Playground.Heartbeats.Layers.PacketEncoding import ExtendedNdnTlvEncoder
+        return ExtendedNdnTlvEncoder(name_cache_size=name_cache_size)
+    raise ValueError("Unknown encoder: " + encoder_name)
+
+
+class EncoderBenchmark(object):
+    """
+    Benchmark of the packet encoders. For a matrix of encoders, packet types (interest, data, nack), name depths and
+    payload sizes (data only) it measures:
+     - encode and decode operations per second, cold and warm
+     - bytes allocated by a single encode and decode (peak traced by tracemalloc), cold and warm
+     - round trips per second through a BasicPacketEncodingLayer, called in-process and running as process connected
+       by multiprocessing queues
+    Cold encodes encode a fresh packet (created outside of the measurement) with an encoder without name cache, warm
+    encodes repeat the encoding of the same packet, so they include the caches of the encoders (encoded names, the
+    wire format of the interest of a nack). Decodes access the payload of decoded data packets, so lazily decoding
+    encoders do the same work as the others. Cold decodes use an encoder without name cache.
+    Results are returned as dictionary that can be dumped as JSON.
+    :param encoders: names of the encoders, see create_encoder
+    :param depths: numbers of name components
+    :param payload_sizes: payload sizes of data packets in bytes
+    :param min_time: minimum time in seconds a throughput measurement runs
+    :param queue_packets: packets sent through the queues per case, 0 to skip the queue round trips
+    """
+
+    PACKET_TYPES = ['interest', 'data', 'nack']
+
+    def __init__(self, encoders: List[str]=None, depths: List[int]=None, payload_sizes: List[int]=None,
+                 min_time: float=0.2, queue_packets: int=200):
+        self.encoders = encoders if encoders is not None else ['ndntlv', 'simple', 'compact', 'extended']
+        self.depths = depths if depths is not None else [2, 5, 10, 20]
+        self.payload_sizes = payload_sizes if payload_sizes is not None else [0, 64, 1024, 8192, 65536]
+        self.min_time = min_time
+        self.queue_packets = queue_packets
+
+    def cases(self):
+        """packet type, name depth and payload size of all cases"""
+        for packet_type in self.PACKET_TYPES:
+            for depth in self.depths:
+                if packet_type == 'data':
+                    for payload_size in self.payload_sizes:
+                        yield packet_type, depth, payload_size
+                else:
+                    yield packet_type, depth, 0
+
+    @staticmethod
+    def create_packet(packet_type: str, depth: int, payload_size: int) -> Packet:
+        """packet of the given type, with a name of depth components and an ASCII payload (the SimpleStringEncoder
+        cannot transport binary payloads)"""
+        name = Name([b"bench"] + [("c" + str(i)).encode() for i in range(1, depth)])
+        if packet_type == 'interest':
+            return Interest(name)
+        elif packet_type == 'data':
+            return Content(name, b"x" * payload_size)
+        elif packet_type == 'nack':
+            return Nack(name, NackReason.NO_ROUTE, interest=Interest(name))
+        raise ValueError("Unknown packet type: " + packet_type)
+
+    def run(self) -> Dict:
+        """run all measurements
+        :return: environment, configuration and results
+        """
+        results = []
+        layer_results = []
+        for encoder_name in self.encoders:
+            encoder = create_encoder(encoder_name)
+            cold_encoder = create_encoder(encoder_name, name_cache=False)
+            for packet_type, depth, payload_size in self.cases():
+                packet = self.create_packet(packet_type, depth, payload_size)
+                result = {'encoder': encoder_name, 'packet': packet_type, 'depth': depth, 'payload': payload_size}
+                result.update(self.measure_encoder(encoder, cold_encoder, packet_type, depth, payload_size))
+                results.append(result)
+                layer_result = {'encoder': encoder_name, 'packet': packet_type, 'depth': depth,
+                                'payload': payload_size, 'mode': 'in-process'}
+                layer_result.update(self.measure_layer_in_process(encoder, packet))
+                layer_results.append(layer_result)
+            if self.queue_packets > 0:
+                layer_results.extend(self.measure_layer_queues(encoder_name))
+        return {
+            'environment': {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+                            'platform': platform.platform(), 'timestamp': time.time()},
+            'config': {'encoders': self.encoders, 'depths': self.depths, 'payload_sizes': self.payload_sizes,
+                       'min_time': self.min_time, 'queue_packets': self.queue_packets},
+            'encoder_results': results,
+            'layer_results': layer_results
+        }
+
+    def measure_encoder(self, encoder: BasicEncoder, cold_encoder: BasicEncoder, packet_type: str, depth: int,
+                        payload_size: int) -> Dict:
+        """encode and decode throughput and allocations of a packet, cold and warm
+        :param encoder: encoder for the warm measurements
+        :param cold_encoder: encoder without name cache for the cold measurements
+        """
+        packet = self.create_packet(packet_type, depth, payload_size)
+        wire_format = encoder.encode(packet)
+
+        def fresh_packet():
+            return self.create_packet(packet_type, depth, payload_size)
+
+        return {
+            'wire_size': len(wire_format),
+            'roundtrip_ok': self.decode(encoder, wire_format) == packet,
+            'encode_cold_ops_per_sec': self.ops_per_sec(cold_encoder.encode, setup=fresh_packet),
+            'encode_warm_ops_per_sec': self.ops_per_sec(lambda: encoder.encode(packet)),
+            'decode_cold_ops_per_sec': self.ops_per_sec(lambda: self.decode(cold_encoder, wire_format)),
+            'decode_warm_ops_per_sec': self.ops_per_sec(lambda: self.decode(encoder, wire_format)),
+            'encode_cold_alloc_bytes': self.allocated_bytes(cold_encoder.encode, setup=fresh_packet),
+            'encode_warm_alloc_bytes': self.allocated_bytes(lambda: encoder.encode(packet)),
+            'decode_cold_alloc_bytes': self.allocated_bytes(lambda: self.decode(cold_encoder, wire_format)),
+            'decode_warm_alloc_bytes': self.allocated_bytes(lambda: self.decode(encoder, wire_format))
+        }
+
+    @staticmethod
+    def decode(encoder: BasicEncoder, wire_format) -> Packet:
+        """decode a packet and access the payload of a data packet"""
+        packet = encoder.decode(wire_format)
+        if isinstance(packet, Content):
+            packet.get_bytes()
+        return packet
+
+    def measure_layer_in_process(self, encoder: BasicEncoder, packet: Packet) -> Dict:
+        """round trips (encode to lower, decode to higher) through a BasicPacketEncodingLayer called directly"""
+        layer = BasicPacketEncodingLayer(encoder)
+        to_lower = LocalQueue()
+        to_higher = LocalQueue()
+
+        def round_trip():
+            layer.data_from_higher(to_lower, to_higher, [1, packet])
+            layer.data_from_lower(to_lower, to_higher, to_lower.get_nowait())
+            to_higher.get_nowait()
+
+        return {'round_trips_per_sec': self.ops_per_sec(round_trip)}
+
+    def measure_layer_queues(self, encoder_name: str) -> List[Dict]:
+        """round trips through a BasicPacketEncodingLayer running as process, connected by multiprocessing queues.
+        queue_packets packets are put into the queue from higher at once, their wire formats are put into the queue from
+        lower once all arrived at the queue to lower."""
+        layer = BasicPacketEncodingLayer(create_encoder(encoder_name))
+        layer.queue_from_higher = multiprocessing.Queue()
+        layer.queue_from_lower = multiprocessing.Queue()
+        layer.queue_to_higher = multiprocessing.Queue()
+        layer.queue_to_lower = multiprocessing.Queue()
+        layer.start_process()
+        results = []
+        try:
+            for packet_type, depth, payload_size in self.cases():
+                packet = self.create_packet(packet_type, depth, payload_size)
+                start = time.perf_counter()
+                for i in range(self.queue_packets):
+                    layer.queue_from_higher.put([1, packet])
+                wire_formats = [layer.queue_to_lower.get(timeout=10.0) for i in range(self.queue_packets)]
+                for data in wire_formats:
+                    layer.queue_from_lower.put(data)
+                for i in range(self.queue_packets):
+                    layer.queue_to_higher.get(timeout=10.0)
+                elapsed = time.perf_counter() - start
+                results.append({'encoder': encoder_name, 'packet': packet_type, 'depth': depth,
+                                'payload': payload_size, 'mode': 'queues',
+                                'round_trips_per_sec': self.queue_packets / elapsed})
+        except queue.Empty:
+            results.append({'encoder': encoder_name, 'mode': 'queues', 'error': 'timeout'})
+        finally:
+            layer.stop_process()
+        return results
+
+    MAX_ROUND = 1024
+
+    def ops_per_sec(self, operation: Callable, setup: Callable=None) -> float:
+        """throughput of an operation, run in rounds of growing size for at least min_time seconds
+        :param setup: if set, creates the argument of each run of the operation before the round is timed
+        """
+        if setup is not None:
+            operation(setup())
+        else:
+            operation()
+        iterations = 0
+        rounds = 1
+        elapsed = 0.0
+        while elapsed < self.min_time:
+            if setup is not None:
+                args = [setup() for i in range(rounds)]
+                start = time.perf_counter()
+                for arg in args:
+                    operation(arg)
+            else:
+                start = time.perf_counter()
+                for i in range(rounds):
+                    operation()
+            elapsed += time.perf_counter() - start
+            iterations += rounds
+            rounds = min(rounds * 2, self.MAX_ROUND)
+        return iterations / elapsed
+
+    @staticmethod
+    def allocated_bytes(operation: Callable, setup: Callable=None) -> int:
+        """peak number of bytes allocated by a single run of an operation (including the returned object)
+        :param setup: if set, creates the argument of the operation before the allocations are traced
+        """
+        if setup is not None:
+            operation(setup())
+            arg = setup()
+            tracemalloc.start()
+        else:
+            operation()
+            tracemalloc.start()
+        try:
+            result = operation(arg) if setup is not None else operation() # keep the result alive until peak was read
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
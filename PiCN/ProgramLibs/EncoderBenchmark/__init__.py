@@ -0,0 +1,3 @@
+"""Benchmark of the packet encoders"""
+
+from .EncoderBenchmark import EncoderBenchmark, create_encoder
@@ -0,0 +1,28 @@
+"""Test the EncoderBenchmark"""
+
+import json
+import unittest
+
+from PiCN.ProgramLibs.EncoderBenchmark import EncoderBenchmark
+
+
+class test_EncoderBenchmark(unittest.TestCase):
+    """Test the EncoderBenchmark"""
+
+    def test_run(self):
+        """Test that a small benchmark covers the whole matrix and produces JSON serializable results"""
+        benchmark = EncoderBenchmark(encoders=['ndntlv', 'simple', 'compact', 'extended'], depths=[2, 3],
+                                     payload_sizes=[0, 1024], min_time=0.001, queue_packets=5)
+        results = json.loads(json.dumps(benchmark.run()))
+        self.assertEqual(4 * (2 + 2 * 2 + 2), len(results['encoder_results']))
+        self.assertEqual(2 * 4 * (2 + 2 * 2 + 2), len(results['layer_results']))
+        for result in results['encoder_results']:
+            self.assertTrue(result['roundtrip_ok'], result)
+            for measurement in ['encode_cold', 'encode_warm', 'decode_cold', 'decode_warm']:
+                self.assertGreater(result[measurement + '_ops_per_sec'], 0)
+                self.assertGreater(result[measurement + '_alloc_bytes'], 0)
+        for result in results['layer_results']:
+            self.assertIn(result['mode'], ['in-process', 'queues'])
+            self.assertGreater(result['round_trips_per_sec'], 0)
+        data = [r for r in results['encoder_results'] if r['packet'] == 'data' and r['encoder'] == 'ndntlv']
+        self.assertGreater(data[-1]['wire_size'], 1024)
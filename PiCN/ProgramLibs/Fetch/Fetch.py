@@ -1,10 +1,13 @@
 """Fetch Tool for PiCN"""
 
+from typing import Iterator
+
 from PiCN.LayerStack import LayerStack
 from PiCN.Layers.AutoconfigLayer import AutoconfigClientLayer
 from PiCN.Layers.ChunkLayer import BasicChunkLayer
 from PiCN.Layers.PacketEncodingLayer import BasicPacketEncodingLayer
 from PiCN.Layers.ChunkLayer.Chunkifyer import SimpleContentChunkifyer
+from PiCN.Layers.FragmentationLayer import NdnLpFragmentationLayer
 from PiCN.Layers.LinkLayer import BasicLinkLayer
 from PiCN.Layers.LinkLayer.FaceIDTable import FaceIDDict
 from PiCN.Layers.LinkLayer.Interfaces import UDP4Interface, AddressInfo
@@ -14,11 +17,24 @@ from PiCN.Layers.PacketEncodingLayer.Encoder import BasicEncoder
 from PiCN.Packets import Content, Name, Interest, Nack
 from PiCN.Layers.TimeoutPreventionLayer import BasicTimeoutPreventionLayer, TimeoutPreventionMessageDict
 
+class FetchNackError(Exception):
+    """A streamed fetch was answered by a Nack"""
+
+    def __init__(self, nack: Nack):
+        super().__init__("Received Nack: " + str(nack.reason.value))
+        self.nack = nack
+
 class Fetch(object):
     """Fetch Tool for PiCN"""
 
     def __init__(self, ip: str, port: int, log_level=255, encoder: BasicEncoder=None, autoconfig: bool = False,
-                 interfaces=None):
+                 interfaces=None, link_mtu: int=0, rcvbuf_size: int=None, sndbuf_size: int=None):
+        """
+        :param link_mtu: if larger than 0, packets exceeding this size are fragmented on the link (NDNLPv2). The default
+                         UDP interface receives packets up to this size
+        :param rcvbuf_size: size of the kernel receive buffer of the default UDP interface, system default if None
+        :param sndbuf_size: size of the kernel send buffer of the default UDP interface, system default if None
+        """
 
         # create encoder and chunkifyer
         if encoder is None:
@@ -37,7 +53,8 @@ class Fetch(object):
         timeoutprevention_dict = synced_data_struct_factory.manager.timeoutprevention_dict()
 
         if interfaces is None:
-            interfaces = [UDP4Interface(0)]
+            interfaces = [UDP4Interface(0, buffersize=max(8192, link_mtu), rcvbuf_size=rcvbuf_size,
+                                        sndbuf_size=sndbuf_size)]
         else:
             interfaces = interfaces
 
@@ -52,6 +69,9 @@ class Fetch(object):
             self.packetencodinglayer,
             self.linklayer
         ])
+        if link_mtu > 0:
+            self.fragmentationlayer = NdnLpFragmentationLayer(link_mtu, log_level=log_level, interfaces=interfaces)
+            self.lstack.insert(self.fragmentationlayer, below_of=self.packetencodinglayer)
         self.timeoutpreventionlayer.ageing()
         self.autoconfig = autoconfig
         if autoconfig:
@@ -89,6 +109,32 @@ class Fetch(object):
             return "Received Nack: " + str(packet.reason.value)
         return None
 
+    def fetch_stream(self, name: Name, timeout=4.0) -> Iterator[bytes]:
+        """Fetch data from the server and yield its payload in order, part by part as soon as the chunks are available,
+        without holding the whole data object in memory
+        :param name Name to be fetched
+        :param timeout Timeout to wait for the next part. Use 0 for infinity
+        :raises FetchNackError if the data object or one of its chunks could not be fetched
+        """
+        interest: Interest = Interest(name)
+        if self.autoconfig:
+            self.lstack.queue_from_higher.put([None, interest, True])
+        else:
+            self.lstack.queue_from_higher.put([self.fid, interest, True])
+
+        while True:
+            if timeout == 0:
+                data = self.lstack.queue_to_higher.get()
+            else:
+                data = self.lstack.queue_to_higher.get(timeout=timeout)
+            packet = data[1]
+            if isinstance(packet, Nack):
+                raise FetchNackError(packet)
+            if isinstance(packet, Content):
+                yield packet.get_bytes()
+                if len(data) < 3 or data[2]:
+                    return
+
     def stop_fetch(self):
         """Close everything"""
         self.lstack.stop_all()
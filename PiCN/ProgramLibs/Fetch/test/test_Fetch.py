@@ -6,12 +6,12 @@ import shutil
 import time
 import unittest
 
-from PiCN.ProgramLibs.Fetch import Fetch
+from PiCN.ProgramLibs.Fetch import Fetch, FetchNackError
 from PiCN.ProgramLibs.ICNForwarder import ICNForwarder
 
 from PiCN.Mgmt import MgmtClient
 from PiCN.Packets import Name, NackReason
-from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder, NdnTlvEncoder
+from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder, NdnTlvEncoder, CompactEncoder
 from PiCN.ProgramLibs.ICNDataRepository import ICNDataRepository
 
 class cases_Fetch(object):
@@ -20,6 +20,14 @@ class cases_Fetch(object):
     def get_encoder(self):
         """get the packet encoder to be used"""
 
+    def get_link_mtu(self):
+        """link MTU of all nodes, 0 for no fragmentation"""
+        return 0
+
+    def get_chunk_size(self):
+        """chunk size of the repository"""
+        return 4096
+
     def setUp(self):
         self.data1 = "data1"
         self.data2 = 'A' * 5000
@@ -38,12 +46,15 @@ class cases_Fetch(object):
             content_file.write('B' * 20000)
 
         self.ICNRepo: ICNDataRepository = ICNDataRepository("/tmp/repo_unit_test", Name("/test/data"), port=0,
-                                                            encoder=self.get_encoder(), log_level=255)
-        self.forwarder: ICNForwarder = ICNForwarder(port=0, encoder=self.get_encoder(), log_level=255)
+                                                            encoder=self.get_encoder(), log_level=255,
+                                                            link_mtu=self.get_link_mtu(),
+                                                            chunk_size=self.get_chunk_size())
+        self.forwarder: ICNForwarder = ICNForwarder(port=0, encoder=self.get_encoder(), log_level=255,
+                                                    link_mtu=self.get_link_mtu())
 
         self.repo_port = self.ICNRepo.linklayer.interfaces[0].get_port()
         self.forwarder_port = self.forwarder.linklayer.interfaces[0].get_port()
-        self.fetch = Fetch("127.0.0.1", self.forwarder_port, encoder=self.get_encoder())
+        self.fetch = Fetch("127.0.0.1", self.forwarder_port, encoder=self.get_encoder(), link_mtu=self.get_link_mtu())
 
     def add_face_and_forwadingrule(self):
         #create new face
@@ -93,6 +104,24 @@ class cases_Fetch(object):
         content = self.fetch.fetch_data(Name("/test/data/f3"))
         self.assertEqual(content, self.data3)
 
+    def test_fetch_stream_over_forwarder(self):
+        """Test streaming a large data object over a forwarder"""
+        self.ICNRepo.start_repo()
+        self.forwarder.start_forwarder()
+        time.sleep(0.1)
+        self.add_face_and_forwadingrule()
+
+        parts = list(self.fetch.fetch_stream(Name("/test/data/f3")))
+        self.assertGreater(len(parts), 0)
+        self.assertEqual(b"".join(parts), self.data3.encode())
+
+        parts = list(self.fetch.fetch_stream(Name("/test/data/f1")))
+        self.assertEqual(parts, [self.data1.encode()])
+
+        with self.assertRaises(FetchNackError) as context:
+            list(self.fetch.fetch_stream(Name("/test/data/f4")))
+        self.assertEqual(context.exception.nack.reason, NackReason.NO_CONTENT)
+
     def test_fetching_content_from_second_repo_after_nack(self):
         """Test sending an interest to forwarder with no matching content, choose second route to fetch content"""
         self.forwarder2: ICNForwarder = ICNForwarder(0,  encoder=self.get_encoder(), log_level=255)
@@ -149,3 +178,32 @@ class test_Fetch_NDNTLVPacketEncoder(cases_Fetch, unittest.TestCase):
     """Runs tests with the NDNTLVPacketEncoder"""
     def get_encoder(self):
         return NdnTlvEncoder()
+
+class test_Fetch_CompactEncoder(cases_Fetch, unittest.TestCase):
+    """Runs tests with the CompactEncoder"""
+    def get_encoder(self):
+        return CompactEncoder()
+
+class test_Fetch_NDNTLVPacketEncoder_Fragmentation(cases_Fetch, unittest.TestCase):
+    """Runs tests with the NDNTLVPacketEncoder, link fragmentation and chunks of 64 KB"""
+    def get_encoder(self):
+        return NdnTlvEncoder()
+
+    def get_link_mtu(self):
+        return 1400
+
+    def get_chunk_size(self):
+        return 65536
+
+    def test_fetch_64kb_data_over_forwarder(self):
+        """Test fetching a 64 KB data object in a single packet over a forwarder"""
+        data = "".join(chr(ord('a') + i % 26) for i in range(65536))
+        with open(self.path + "/f4", 'w') as content_file:
+            content_file.write(data)
+        self.ICNRepo.start_repo()
+        self.forwarder.start_forwarder()
+        time.sleep(0.1)
+        self.add_face_and_forwadingrule()
+
+        content = self.fetch.fetch_data(Name("/test/data/f4"))
+        self.assertEqual(content, data)
@@ -0,0 +1,153 @@
+"""Throughput benchmark of the ICN Forwarder"""
+
+import multiprocessing
+import os
+import platform
+import select
+import socket
+import time
+from typing import Dict, List
+
+from PiCN.Layers.LinkLayer.Interfaces import AddressInfo
+from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder
+from PiCN.Packets import Content, Interest, Name
+from PiCN.ProgramLibs.ICNForwarder import ICNForwarder
+
+
+def producer(sock: socket.socket, payload_size: int):
+    """answer every interest received on a socket with a data packet of the interest name"""
+    encoder = NdnTlvEncoder()
+    payload = b"x" * payload_size
+    while True:
+        wire_format, addr = sock.recvfrom(65536)
+        interest = encoder.decode(wire_format)
+        sock.sendto(encoder.encode(Content(interest.name, payload)), addr)
+
+
+class ForwarderBenchmark(object):
+    """
+    Throughput benchmark of the ICNForwarder for different numbers of ICN layer shards (1 means a single BasicICNLayer).
+    The forwarders use NDN TLV and tables owned by the ICN layer process. A client keeps a window of interests
+    outstanding and counts the data packets received per second in the modes:
+     - cs: interests for a set of names that were added to the content store before
+     - forward: interests for new names, forwarded to a producer process (FIB lookup, PIT entry, data added to the CS)
+    Interests that are not answered within a second are given up and replaced. Results are returned as dictionary that
+    can be dumped as JSON.
+    :param shards: numbers of ICN layer shards
+    :param modes: measurement modes, see above
+    :param names: number of names in the content store in cs mode
+    :param window: number of outstanding interests
+    :param min_time: duration of a throughput measurement in seconds
+    :param payload_size: payload size of the data packets in bytes
+    :param batch_size: number of queue items handled at once by the layers
+    :param indexed_tables: use the bounded CS, the trie FIB and the hashed PIT
+    """
+
+    MODES = ['cs', 'forward']
+
+    def __init__(self, shards: List[int]=None, modes: List[str]=None, names: int=1000, window: int=64,
+                 min_time: float=5.0, payload_size: int=64, batch_size: int=1, indexed_tables: bool=False):
+        self.shards = shards if shards is not None else [1, 2, 4]
+        self.modes = modes if modes is not None else self.MODES
+        self.names = names
+        self.window = window
+        self.min_time = min_time
+        self.payload_size = payload_size
+        self.batch_size = batch_size
+        self.indexed_tables = indexed_tables
+
+    def run(self) -> Dict:
+        """run all measurements
+        :return: environment, configuration and results
+        """
+        results = []
+        for mode in self.modes:
+            for shards in self.shards:
+                result = {'mode': mode, 'shards': shards}
+                result.update(self.measure(mode, shards))
+                results.append(result)
+        return {
+            'environment': {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+                            'platform': platform.platform(), 'cpus': os.cpu_count(), 'timestamp': time.time()},
+            'config': {'shards': self.shards, 'modes': self.modes, 'names': self.names, 'window': self.window,
+                       'min_time': self.min_time, 'payload_size': self.payload_size, 'batch_size': self.batch_size,
+                       'indexed_tables': self.indexed_tables},
+            'results': results
+        }
+
+    def measure(self, mode: str, shards: int) -> Dict:
+        """throughput of a forwarder with the given number of shards"""
+        if mode not in self.MODES:
+            raise ValueError("Unknown mode: " + mode)
+        forwarder = ICNForwarder(0, encoder=NdnTlvEncoder(), log_level=255, local_tables=True, shards=shards,
+                                 batch_size=self.batch_size, indexed_tables=self.indexed_tables)
+        port = forwarder.linklayer.interfaces[0].get_port()
+        producer_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        producer_sock.bind(("127.0.0.1", 0))
+        producer_process = None
+        cs = forwarder.data_struct_channel.get_proxy("cs") # proxies must be created before the forwarder is started
+        fib = forwarder.data_struct_channel.get_proxy("fib")
+        try:
+            forwarder.start_forwarder()
+            if mode == 'cs':
+                payload = b"x" * self.payload_size
+                for i in range(self.names):
+                    cs.add_content_object(Content(Name("/bench/cs/" + str(i)), payload), static=True)
+                cs.get_container_size() # wait until all contents were added
+            else:
+                producer_process = multiprocessing.Process(target=producer,
+                                                           args=[producer_sock, self.payload_size], daemon=True)
+                producer_process.start()
+                faceid = forwarder.linklayer.faceidtable.get_or_create_faceid(
+                    AddressInfo(producer_sock.getsockname(), 0))
+                fib.add_fib_entry(Name("/bench"), [faceid], static=True)
+                fib.get_container_size() # wait until the entry was added
+            return self.run_client(mode, port)
+        finally:
+            forwarder.stop_forwarder()
+            if producer_process is not None:
+                producer_process.terminate()
+                producer_process.join()
+            producer_sock.close()
+
+    def run_client(self, mode: str, port: int) -> Dict:
+        """keep window interests outstanding for min_time seconds, count the received data packets"""
+        encoder = NdnTlvEncoder()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(("127.0.0.1", 0))
+        sock.setblocking(False)
+        counter = 0
+        received = 0
+        lost = 0
+
+        def send_interest():
+            nonlocal counter
+            if mode == 'cs':
+                name = Name("/bench/cs/" + str(counter % self.names))
+            else:
+                name = Name("/bench/fwd/" + str(counter))
+            counter += 1
+            sock.sendto(encoder.encode(Interest(name)), ("127.0.0.1", port))
+
+        try:
+            start = time.perf_counter()
+            for i in range(self.window):
+                send_interest()
+            while time.perf_counter() - start < self.min_time:
+                readable, _, _ = select.select([sock], [], [], 1.0)
+                if not readable: # all outstanding interests are considered lost
+                    lost += self.window
+                    for i in range(self.window):
+                        send_interest()
+                    continue
+                while True:
+                    try:
+                        sock.recvfrom(65536)
+                    except BlockingIOError:
+                        break
+                    received += 1
+                    send_interest()
+            elapsed = time.perf_counter() - start
+        finally:
+            sock.close()
+        return {'received': received, 'lost': lost, 'elapsed': elapsed, 'packets_per_sec': received / elapsed}
@@ -0,0 +1,3 @@
+"""Throughput benchmark of the ICN Forwarder"""
+
+from .ForwarderBenchmark import ForwarderBenchmark
@@ -0,0 +1,20 @@
+"""Test the ForwarderBenchmark"""
+
+import json
+import unittest
+
+from PiCN.ProgramLibs.ForwarderBenchmark import ForwarderBenchmark
+
+
+class test_ForwarderBenchmark(unittest.TestCase):
+    """Test the ForwarderBenchmark"""
+
+    def test_run(self):
+        """Test that a short benchmark measures all modes and shard numbers and produces JSON serializable results"""
+        benchmark = ForwarderBenchmark(shards=[1, 2], names=20, window=8, min_time=0.5)
+        results = json.loads(json.dumps(benchmark.run()))
+        self.assertEqual([('cs', 1), ('cs', 2), ('forward', 1), ('forward', 2)],
+                         [(r['mode'], r['shards']) for r in results['results']])
+        for result in results['results']:
+            self.assertGreater(result['received'], 0, result)
+            self.assertGreater(result['packets_per_sec'], 0)
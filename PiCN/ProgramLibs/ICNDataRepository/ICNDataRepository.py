@@ -12,6 +12,7 @@ from PiCN.Layers.RepositoryLayer import BasicRepositoryLayer
 from PiCN.Layers.AutoconfigLayer import AutoconfigRepoLayer
 
 from PiCN.Layers.ChunkLayer.Chunkifyer import SimpleContentChunkifyer
+from PiCN.Layers.FragmentationLayer import NdnLpFragmentationLayer
 from PiCN.Layers.LinkLayer import BasicLinkLayer
 from PiCN.Layers.LinkLayer.FaceIDTable import FaceIDDict
 from PiCN.Layers.LinkLayer.Interfaces import UDP4Interface, BaseInterface
@@ -35,9 +36,16 @@ class ICNDataRepository(object):
     def __init__(self, foldername: Optional[str], prefix: Name,
                  port=9000, log_level=255, encoder: BasicEncoder = None,
                  autoconfig: bool = False, autoconfig_routed: bool = False, interfaces: List[BaseInterface]=None,
-                 use_thunks=False):
+                 use_thunks=False, presign: bool=False, link_mtu: int=0, chunk_size: int=4096):
         """
         :param foldername: If None, use an in-memory repository. Else, use a file system repository.
+        :param presign: encode and sign chunks once when they are created instead of each time they are sent. Signed
+                        chunks are served from the chunk table, an object is only chunked and signed again after its
+                        chunks expired there.
+        :param link_mtu: if larger than 0, packets exceeding this size are fragmented on the link (NDNLPv2). The default
+                         UDP interface receives packets up to this size
+        :param chunk_size: maximum payload of a chunk, larger chunks require link fragmentation if they do not fit into
+                           a datagram
         """
 
         logger = Logger("ICNRepo", log_level)
@@ -50,7 +58,7 @@ class ICNDataRepository(object):
             encoder.set_log_level(log_level)
             self.encoder = encoder
         #chunkifyer
-        self.chunkifyer = SimpleContentChunkifyer()
+        self.chunkifyer = SimpleContentChunkifyer(chunk_size)
 
         #repo
         manager = multiprocessing.Manager()
@@ -77,12 +85,13 @@ class ICNDataRepository(object):
             self.interfaces = interfaces
             mgmt_port = port
         else:
-            interfaces = [UDP4Interface(port)]
+            interfaces = [UDP4Interface(port, buffersize=max(8192, link_mtu))]
             mgmt_port = interfaces[0].get_port()
 
         self.linklayer = BasicLinkLayer(interfaces, faceidtable, log_level=log_level)
         self.packetencodinglayer = BasicPacketEncodingLayer(self.encoder, log_level=log_level)
-        self.chunklayer = BasicChunkLayer(self.chunkifyer, log_level=log_level)
+        self.chunklayer = BasicChunkLayer(self.chunkifyer, log_level=log_level,
+                                          encoder=self.encoder if presign else None)
         self.repolayer = BasicRepositoryLayer(self.repo, log_level=log_level)
 
         if use_thunks:
@@ -105,6 +114,10 @@ class ICNDataRepository(object):
                 self.linklayer
             ])
 
+        if link_mtu > 0:
+            self.fragmentationlayer = NdnLpFragmentationLayer(link_mtu, log_level=log_level, interfaces=interfaces)
+            self.lstack.insert(self.fragmentationlayer, below_of=self.packetencodinglayer)
+
         if autoconfig:
             self.autoconfiglayer = AutoconfigRepoLayer(name=prefix.string_components[-1],
                                                        addr='127.0.0.1',
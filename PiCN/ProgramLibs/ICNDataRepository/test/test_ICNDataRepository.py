@@ -18,6 +18,10 @@ class cases_ICNDataRepository(object):
     def get_encoder(self):
         """returns the encoder to be used """
 
+    def use_presign(self):
+        """returns if the repository should encode and sign chunks once when they are created"""
+        return False
+
     def setUp(self):
         self.data1 = "data1"
         self.data2 = 'A' * 5000
@@ -37,7 +41,8 @@ class cases_ICNDataRepository(object):
             content_file.write('B' * 5000 + 'C' * 5000 + 'DE' * 5000)
 
         self.ICNRepo: ICNDataRepository = ICNDataRepository("/tmp/repo_unit_test", Name("/test/data"), 0,
-                                                            encoder=self.get_encoder(), log_level=255)
+                                                            encoder=self.get_encoder(), log_level=255,
+                                                            presign=self.use_presign())
         self.repo_port = self.ICNRepo.linklayer.interfaces[0].get_port()
         self.fetch = Fetch("127.0.0.1", self.repo_port, encoder=self.get_encoder())
 
@@ -83,3 +88,11 @@ class test_ICNDataRepository_NDNTLVPacketEncoder(cases_ICNDataRepository, unitte
     """Runs tests with the NDNTLVPacketEncoder"""
     def get_encoder(self):
         return NdnTlvEncoder()
+
+class test_ICNDataRepository_NDNTLVPacketEncoder_Presigned(cases_ICNDataRepository, unittest.TestCase):
+    """Runs tests with the NDNTLVPacketEncoder, chunks are signed by multiple threads when they are created"""
+    def get_encoder(self):
+        return NdnTlvEncoder(signer_threads=4)
+
+    def use_presign(self):
+        return True
@@ -5,18 +5,20 @@ import multiprocessing
 from typing import List
 
 from PiCN.LayerStack.LayerStack import LayerStack
-from PiCN.Layers.ICNLayer import BasicICNLayer
-from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix
-from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterstTableMemoryExact
+from PiCN.Layers.ICNLayer import BasicICNLayer, ShardedICNLayer
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix, \
+    ForwardingInformationBaseMemoryTrie
+from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterstTableMemoryExact, PendingInterestTableMemoryHashed
 from PiCN.Layers.RoutingLayer import BasicRoutingLayer
 from PiCN.Layers.RoutingLayer.RoutingInformationBase import TreeRoutingInformationBase
 from PiCN.Layers.PacketEncodingLayer import BasicPacketEncodingLayer
+from PiCN.Layers.FragmentationLayer import NdnLpFragmentationLayer
 
 from PiCN.Layers.AutoconfigLayer import AutoconfigServerLayer
 
 from PiCN.Processes import PiCNSyncDataStructFactory
 
-from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact, ContentStoreMemoryBounded
 from PiCN.Layers.LinkLayer import BasicLinkLayer
 from PiCN.Layers.LinkLayer.Interfaces import UDP4Interface, AddressInfo, BaseInterface
 from PiCN.Layers.LinkLayer.FaceIDTable import FaceIDDict
@@ -28,13 +30,29 @@ from PiCN.Packets import Name
 
 
 class ICNForwarder(object):
-    """A ICN Forwarder using PiCN"""
+    """A ICN Forwarder using PiCN
+    :param indexed_tables: use the bounded content store (evicting at its entry and byte limits), the trie FIB (an
+                           entry for the empty name acts as default route) and the hashed PIT instead of the list based
+                           tables
+    :param link_mtu: if larger than 0, packets exceeding this size are fragmented on the link (NDNLPv2). The default UDP
+                     interface receives packets up to this size, given interfaces must be able to receive them
+    :param rcvbuf_size: size of the kernel receive buffer of the default UDP interface, system default if None
+    :param sndbuf_size: size of the kernel send buffer of the default UDP interface, system default if None
+    """
 
     def __init__(self, port=9000, log_level=255, encoder: BasicEncoder=None, routing: bool=False, peers=None,
-                 autoconfig: bool=False, interfaces: List[BaseInterface] = None, ageing_interval: int=3):
+                 autoconfig: bool=False, interfaces: List[BaseInterface] = None, ageing_interval: int=3,
+                 use_asyncio: bool=False, local_tables: bool=False, batch_size: int=1,
+                 shared_memory: bool=False, shards: int=1, link_mtu: int=0, indexed_tables: bool=False,
+                 rcvbuf_size: int=None, sndbuf_size: int=None):
         # debug level
         logger = Logger("ICNForwarder", log_level)
 
+        if shards > 1 and use_asyncio:
+            raise ValueError("Sharded ICN layer requires a process per layer, cannot be used with asyncio")
+        if shards > 1: # each ICN worker process owns its partition of CS and PIT and a replica of the FIB
+            local_tables = True
+
         # packet encoder
         if encoder is None:
             self.encoder = SimpleStringEncoder(log_level=log_level)
@@ -43,17 +61,30 @@ class ICNForwarder(object):
             self.encoder = encoder
 
         # setup data structures
+        if indexed_tables:
+            cs_type, fib_type, pit_type = ContentStoreMemoryBounded, ForwardingInformationBaseMemoryTrie, \
+                                          PendingInterestTableMemoryHashed
+            pit_args = {"retransmit_interval": ageing_interval}
+        else:
+            cs_type, fib_type, pit_type = ContentStoreMemoryExact, ForwardingInformationBaseMemoryPrefix, \
+                                          PendingInterstTableMemoryExact
+            pit_args = {}
         synced_data_struct_factory = PiCNSyncDataStructFactory()
-        synced_data_struct_factory.register("cs", ContentStoreMemoryExact)
-        synced_data_struct_factory.register("fib", ForwardingInformationBaseMemoryPrefix)
-        synced_data_struct_factory.register("pit", PendingInterstTableMemoryExact)
+        synced_data_struct_factory.register("cs", cs_type)
+        synced_data_struct_factory.register("fib", fib_type)
+        synced_data_struct_factory.register("pit", pit_type)
         synced_data_struct_factory.register("rib", TreeRoutingInformationBase)
         synced_data_struct_factory.register("faceidtable", FaceIDDict)
         synced_data_struct_factory.create_manager()
 
-        cs = synced_data_struct_factory.manager.cs()
-        fib = synced_data_struct_factory.manager.fib()
-        pit = synced_data_struct_factory.manager.pit()
+        if local_tables: # CS, FIB and PIT are owned by the ICN layer process, see below
+            cs = cs_type()
+            fib = fib_type()
+            pit = pit_type(**pit_args)
+        else:
+            cs = synced_data_struct_factory.manager.cs()
+            fib = synced_data_struct_factory.manager.fib()
+            pit = synced_data_struct_factory.manager.pit(**pit_args)
         if routing:
             rib = synced_data_struct_factory.manager.rib()
         faceidtable = synced_data_struct_factory.manager.faceidtable()
@@ -63,19 +94,28 @@ class ICNForwarder(object):
             self.interfaces = interfaces
             mgmt_port = port
         else:
-            interfaces = [UDP4Interface(port)]
+            interfaces = [UDP4Interface(port, buffersize=max(8192, link_mtu), rcvbuf_size=rcvbuf_size,
+                                        sndbuf_size=sndbuf_size)]
             mgmt_port = interfaces[0].get_port()
 
         # initialize layers
         self.linklayer = BasicLinkLayer(interfaces, faceidtable, log_level=log_level)
         self.packetencodinglayer = BasicPacketEncodingLayer(self.encoder, log_level=log_level)
-        self.icnlayer = BasicICNLayer(log_level=log_level, ageing_interval=ageing_interval)
+        if shards > 1:
+            self.icnlayer = ShardedICNLayer(shards, log_level=log_level, ageing_interval=ageing_interval,
+                                            encoder=self.encoder)
+        else:
+            self.icnlayer = BasicICNLayer(log_level=log_level, ageing_interval=ageing_interval, encoder=self.encoder)
 
         self.lstack: LayerStack = LayerStack([
             self.icnlayer,
             self.packetencodinglayer,
             self.linklayer
-        ])
+        ], use_asyncio=use_asyncio, batch_size=batch_size, shared_memory=shared_memory)
+
+        if link_mtu > 0: # fragment packets exceeding the link MTU (NDNLPv2)
+            self.fragmentationlayer = NdnLpFragmentationLayer(link_mtu, log_level=log_level, interfaces=interfaces)
+            self.lstack.insert(self.fragmentationlayer, below_of=self.packetencodinglayer)
 
         if autoconfig:
             self.autoconfiglayer: AutoconfigServerLayer = AutoconfigServerLayer(linklayer=self.linklayer,
@@ -89,16 +129,32 @@ class ICNForwarder(object):
             self.routinglayer = BasicRoutingLayer(self.linklayer, peers=peers, log_level=log_level)
             self.lstack.insert(self.routinglayer, below_of=self.icnlayer)
 
-        self.icnlayer.cs = cs
-        self.icnlayer.fib = fib
-        self.icnlayer.pit = pit
+        if shards > 1:
+            # the layer below puts packets from the network directly into the queue of the responsible worker
+            below = self.lstack.layers[self.lstack.layers.index(self.icnlayer) + 1]
+            below.queue_to_higher = self.icnlayer.dispatch_queue
+            for worker in self.icnlayer.workers:
+                worker.cs = cs_type()
+                worker.fib = fib_type()
+                worker.pit = pit_type(**pit_args)
+        else:
+            self.icnlayer.cs = cs
+            self.icnlayer.fib = fib
+            self.icnlayer.pit = pit
+        self.data_struct_channel = None
+        if local_tables:
+            self.data_struct_channel = self.icnlayer.create_data_struct_channel()
         if autoconfig:
-            self.autoconfiglayer.fib = fib
+            self.autoconfiglayer.fib = self.data_struct_channel.get_proxy("fib") if local_tables else fib
         if routing:
             self.routinglayer.rib = rib
-            self.routinglayer.fib = fib
+            self.routinglayer.fib = self.data_struct_channel.get_proxy("fib") if local_tables else fib
 
         # mgmt
+        if local_tables: # mgmt commands wait until they are applied
+            cs = self.data_struct_channel.get_proxy("cs", asynchronous_prefixes=())
+            fib = self.data_struct_channel.get_proxy("fib", asynchronous_prefixes=())
+            pit = self.data_struct_channel.get_proxy("pit", asynchronous_prefixes=())
         self.mgmt = Mgmt(cs, fib, pit, self.linklayer, mgmt_port, self.stop_forwarder,
                          log_level=log_level)
 
@@ -115,3 +171,5 @@ class ICNForwarder(object):
         if self.mgmt.process:
             self.mgmt.stop_process()
         self.lstack.close_all()
+        if self.data_struct_channel is not None:
+            self.data_struct_channel.close()
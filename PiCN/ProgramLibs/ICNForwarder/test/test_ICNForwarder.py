@@ -17,10 +17,49 @@ class cases_ICNForwarder(object):
     def get_encoder(self):
         """returns the encoder to be used """
 
+    def use_asyncio(self):
+        """returns if the forwarders should run in the asyncio execution mode"""
+        return False
+
+    def use_local_tables(self):
+        """returns if CS, FIB and PIT should be owned by the ICN layer process"""
+        return False
+
+    def get_batch_size(self):
+        """returns the number of queue items handled at once by the layers"""
+        return 1
+
+    def use_shared_memory(self):
+        """returns if the layers should be connected by shared memory queues"""
+        return False
+
+    def get_shards(self):
+        """returns the number of ICN worker processes"""
+        return 1
+
+    def use_indexed_tables(self):
+        """returns if the bounded CS, the trie FIB and the hashed PIT should be used"""
+        return False
+
+    def get_tables(self, forwarder):
+        """returns CS, FIB and PIT of a forwarder, as proxies if the tables are owned by the ICN layer process"""
+        channel = forwarder.data_struct_channel
+        if channel is None:
+            return forwarder.icnlayer.cs, forwarder.icnlayer.fib, forwarder.icnlayer.pit
+        return channel.get_proxy("cs"), channel.get_proxy("fib"), channel.get_proxy("pit")
+
     def setUp(self):
         self.encoder = self.get_encoder()
-        self.forwarder1 = ICNForwarder(0, encoder=self.get_encoder(), log_level=255)
-        self.forwarder2 = ICNForwarder(0, encoder=self.get_encoder(), log_level=255)
+        self.forwarder1 = ICNForwarder(0, encoder=self.get_encoder(), log_level=255, use_asyncio=self.use_asyncio(),
+                                       local_tables=self.use_local_tables(), batch_size=self.get_batch_size(),
+                                       shared_memory=self.use_shared_memory(), shards=self.get_shards(),
+                                       indexed_tables=self.use_indexed_tables())
+        self.forwarder2 = ICNForwarder(0, encoder=self.get_encoder(), log_level=255, use_asyncio=self.use_asyncio(),
+                                       local_tables=self.use_local_tables(), batch_size=self.get_batch_size(),
+                                       shared_memory=self.use_shared_memory(), shards=self.get_shards(),
+                                       indexed_tables=self.use_indexed_tables())
+        self.cs1, self.fib1, self.pit1 = self.get_tables(self.forwarder1)
+        self.cs2, self.fib2, self.pit2 = self.get_tables(self.forwarder2)
         self.forwarder1_port = self.forwarder1.linklayer.interfaces[0].get_port()
         self.forwarder2_port = self.forwarder2.linklayer.interfaces[0].get_port()
 
@@ -52,7 +91,7 @@ class cases_ICNForwarder(object):
         #create test content
         name = Name("/test/data/object")
         test_content = Content(name, content="HelloWorld")
-        cs_fwd1 = self.forwarder1.icnlayer.cs
+        cs_fwd1 = self.cs1
         self.assertEqual(cs_fwd1.find_content_object(name).content, test_content)
 
         #create interest
@@ -90,7 +129,7 @@ class cases_ICNForwarder(object):
         testMgmtSock2.close()
         self.assertEqual(data.decode(),
                          "HTTP/1.1 200 OK \r\n Content-Type: text/html \r\n\r\n newforwardingrule OK:0\r\n")
-        self.assertEqual(self.forwarder1.icnlayer.fib.find_fib_entry(Name("/test/data")).faceid, [0])
+        self.assertEqual(self.fib1.find_fib_entry(Name("/test/data")).faceid, [0])
 
         # new content
         testMgmtSock3 = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -104,7 +143,7 @@ class cases_ICNForwarder(object):
         #create test content
         name = Name("/test/data/object")
         test_content = Content(name, content="HelloWorld")
-        cs_fwd2 = self.forwarder2.icnlayer.cs
+        cs_fwd2 = self.cs2
         self.assertEqual(cs_fwd2.find_content_object(name).content, test_content)
 
         #create interest
@@ -118,7 +157,7 @@ class cases_ICNForwarder(object):
         content = self.encoder.decode(encoded_content)
         self.assertEqual(content, test_content)
         time.sleep(2)
-        self.assertEqual(self.forwarder1.icnlayer.pit.get_container_size(), 0)
+        self.assertEqual(self.pit1.get_container_size(), 0)
 
 
 
@@ -130,4 +169,63 @@ class test_ICNForwarder_SimplePacketEncoder(cases_ICNForwarder, unittest.TestCas
 class test_ICNForwarder_NDNTLVPacketEncoder(cases_ICNForwarder, unittest.TestCase):
     """Runs tests with the NDNTLVPacketEncoder"""
     def get_encoder(self):
-        return NdnTlvEncoder()
\ No newline at end of file
+        return NdnTlvEncoder()
+
+class test_ICNForwarder_NDNTLVPacketEncoder_Asyncio(cases_ICNForwarder, unittest.TestCase):
+    """Runs tests with the NDNTLVPacketEncoder and all layers in a single asyncio event loop"""
+    def get_encoder(self):
+        return NdnTlvEncoder()
+
+    def use_asyncio(self):
+        return True
+
+class test_ICNForwarder_NDNTLVPacketEncoder_LocalTables(cases_ICNForwarder, unittest.TestCase):
+    """Runs tests with the NDNTLVPacketEncoder and CS, FIB and PIT owned by the ICN layer process"""
+    def get_encoder(self):
+        return NdnTlvEncoder()
+
+    def use_local_tables(self):
+        return True
+
+class test_ICNForwarder_NDNTLVPacketEncoder_Batched(cases_ICNForwarder, unittest.TestCase):
+    """Runs tests with the NDNTLVPacketEncoder and batched queue draining"""
+    def get_encoder(self):
+        return NdnTlvEncoder()
+
+    def get_batch_size(self):
+        return 32
+
+class test_ICNForwarder_NDNTLVPacketEncoder_SharedMemory(cases_ICNForwarder, unittest.TestCase):
+    """Runs tests with the NDNTLVPacketEncoder and shared memory queues between the layers"""
+    def get_encoder(self):
+        return NdnTlvEncoder()
+
+    def use_shared_memory(self):
+        return True
+
+class test_ICNForwarder_NDNTLVPacketEncoder_Sharded(cases_ICNForwarder, unittest.TestCase):
+    """Runs tests with the NDNTLVPacketEncoder and CS and PIT partitioned over multiple ICN worker processes"""
+    def get_encoder(self):
+        return NdnTlvEncoder()
+
+    def get_shards(self):
+        return 3
+
+class test_ICNForwarder_NDNTLVPacketEncoder_IndexedTables(cases_ICNForwarder, unittest.TestCase):
+    """Runs tests with the NDNTLVPacketEncoder and the bounded CS, the trie FIB and the hashed PIT"""
+    def get_encoder(self):
+        return NdnTlvEncoder()
+
+    def use_indexed_tables(self):
+        return True
+
+class test_ICNForwarder_NDNTLVPacketEncoder_IndexedLocalTables(cases_ICNForwarder, unittest.TestCase):
+    """Runs tests with the NDNTLVPacketEncoder and indexed tables owned by the ICN layer process"""
+    def get_encoder(self):
+        return NdnTlvEncoder()
+
+    def use_local_tables(self):
+        return True
+
+    def use_indexed_tables(self):
+        return True
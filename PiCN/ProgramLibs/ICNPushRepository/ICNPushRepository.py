@@ -21,7 +21,8 @@ from PiCN.Mgmt import Mgmt
 class ICNPushRepository(object):
     """A Push Repository using PiCN"""
 
-    def __init__(self, database_path, port=9000, log_level=255, encoder: BasicEncoder = None, flush_database=False):
+    def __init__(self, database_path, port=9000, log_level=255, encoder: BasicEncoder = None, flush_database=False,
+                 presign: bool=False):
         # debug level
         logger = Logger("PushRepo", log_level)
 
@@ -38,7 +39,9 @@ class ICNPushRepository(object):
         synced_data_struct_factory.register("faceidtable", FaceIDDict)
         synced_data_struct_factory.create_manager()
 
-        cs = synced_data_struct_factory.manager.cs(db_path=database_path + "/pushrepo.db")
+        # with presign, content objects are stored encoded and signed and are sent as they are
+        cs = synced_data_struct_factory.manager.cs(db_path=database_path + "/pushrepo.db",
+                                                   encoder=self.encoder if presign else None)
         if flush_database:
             cs.delete_all()
         faceidtable = synced_data_struct_factory.manager.faceidtable()
@@ -87,7 +87,7 @@ class NFNForwarder(object):
         # initialize layers
         self.linklayer = BasicLinkLayer(interfaces, faceidtable, log_level=log_level)
         self.packetencodinglayer = BasicPacketEncodingLayer(self.encoder, log_level=log_level)
-        self.icnlayer = BasicICNLayer(log_level=log_level, ageing_interval=ageing_interval)
+        self.icnlayer = BasicICNLayer(log_level=log_level, ageing_interval=ageing_interval, encoder=self.encoder)
         self.chunklayer = BasicChunkLayer(self.chunkifier, log_level=log_level)
 
         # setup nfn
@@ -86,7 +86,7 @@ class NFNForwarderData(object):
         # initialize layers
         self.linklayer = BasicLinkLayer(interfaces, faceidtable, log_level=log_level)
         self.packetencodinglayer = BasicPacketEncodingLayer(self.encoder, log_level=log_level)
-        self.icnlayer = BasicICNLayer(log_level=log_level, ageing_interval=ageing_interval)
+        self.icnlayer = BasicICNLayer(log_level=log_level, ageing_interval=ageing_interval, encoder=self.encoder)
         self.chunklayer = DataOffloadingChunklayer(cs, pit, fib, num_of_forwards=num_of_forwards, chunk_size=chunk_size, log_level=log_level)
 
 